@@ -0,0 +1,4 @@
+"""
+Спільні розрахункові модулі для сторінок симуляцій.
+Сторінки в pages/ імпортують звідси чисельні рушії, щоб не дублювати код.
+"""
@@ -0,0 +1,74 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# Максимальний обсяг даних усіх кадрів, який відправляємо у браузер (байти)
+FRAME_BYTE_BUDGET = 16 * 1024**2
+
+
+def frame_indices(n_frames, frame_nbytes, byte_budget=FRAME_BYTE_BUDGET):
+    """
+    Повертає індекси кадрів, що вміщуються в бюджет байтів.
+    Якщо кадрів забагато - рівномірно проріджуємо їх (мінімум 2 кадри).
+    """
+    max_frames = max(2, int(byte_budget // max(int(frame_nbytes), 1)))
+    if n_frames <= max_frames:
+        return np.arange(n_frames)
+    return np.unique(np.linspace(0, n_frames - 1, max_frames).round().astype(int))
+
+
+def add_animation_controls(fig, frames, labels, frame_duration=50, label_prefix="t = "):
+    """
+    Додає до фігури кадри Plotly та кнопки ▶/⏸ зі слайдером.
+    frames: список go.Frame з унікальними іменами; labels[i] - лише підпис i-го кроку слайдера.
+    Кроки посилаються на кадри за іменем, а не за підписом: Plotly зливає кадри з однаковим
+    іменем, тож округлені мітки часу (напр. "0.01" для сусідніх кадрів) не можуть бути іменами.
+    Анімація відтворюється в браузері, без перезапуску скрипта Streamlit.
+    """
+    fig.frames = frames
+    play_args = dict(frame=dict(duration=frame_duration, redraw=True),
+                     transition=dict(duration=0), fromcurrent=True, mode="immediate")
+    pause_args = dict(frame=dict(duration=0, redraw=False),
+                      transition=dict(duration=0), mode="immediate")
+
+    fig.update_layout(
+        updatemenus=[dict(
+            type="buttons", direction="left", showactive=False,
+            x=0.0, y=0.0, xanchor="left", yanchor="top", pad=dict(t=45, r=10),
+            buttons=[
+                dict(label="▶", method="animate", args=[None, play_args]),
+                dict(label="⏸", method="animate", args=[[None], pause_args]),
+            ],
+        )],
+        sliders=[dict(
+            active=0, x=0.1, len=0.9, y=0.0, yanchor="top", pad=dict(t=30),
+            currentvalue=dict(prefix=label_prefix),
+            steps=[dict(method="animate", label=str(label),
+                        args=[[frame.name], dict(frame=dict(duration=0, redraw=True),
+                                                 transition=dict(duration=0), mode="immediate")])
+                   for frame, label in zip(frames, labels)],
+        )],
+    )
+    return fig
+
+
+def make_frames(arrays, labels, trace_type=go.Scatter, trace_key="y", trace_index=0):
+    """
+    Будує список go.Frame з масиву (кадри × ...), оновлюючи одне поле одного трейсу.
+    Наприклад trace_type=go.Heatmap, trace_key="z" або go.Scatter, "y".
+    Кадри називаються за номером; labels задає лише їх кількість (підписи - в add_animation_controls).
+    """
+    return [go.Frame(data=[trace_type(**{trace_key: arr})], traces=[trace_index], name=str(i))
+            for i, (arr, _) in enumerate(zip(arrays, labels))]
+
+
+def make_multi_frames(arrays, labels, trace_type=go.Scatter, trace_key="y", trace_indices=None):
+    """
+    Як make_frames, але кожен кадр оновлює кілька трейсів одразу.
+    arrays: список масивів (кадри × ...) - по одному на трейс з trace_indices
+    (за замовчуванням трейси 0, 1, 2, ... у порядку списку).
+    """
+    if trace_indices is None:
+        trace_indices = list(range(len(arrays)))
+    return [go.Frame(data=[trace_type(**{trace_key: arr[i]}) for arr in arrays], traces=list(trace_indices),
+                     name=str(i))
+            for i in range(len(labels))]
@@ -0,0 +1,88 @@
+import io
+import warnings
+
+import numpy as np
+import scipy.constants as const
+
+# Назви стовпців CSV для пакетних розрахунків
+DE_BROGLIE_COLUMNS = ("mass_kg", "energy_eV", "speed_m_s")
+PHOTO_COLUMNS = ("wavelength_nm", "work_function_eV")
+
+_HC_EV_NM = const.h * const.c / const.e * 1e9 # hc в еВ·нм
+
+
+def read_csv_columns(file, required):
+    """
+    Читає CSV з рядком заголовка у словник {стовпець: масив float} (BOM з Excel ігнорується).
+    required - кортеж назв, з яких хоча б одна має бути у файлі; порожні клітинки стають NaN.
+    Порожній файл або файл без рядків даних -> ValueError.
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning) # genfromtxt попереджає про порожній файл
+            data = np.genfromtxt(file, delimiter=",", names=True, dtype=float, encoding="utf-8-sig",
+                                 autostrip=True, missing_values="", filling_values=np.nan, ndmin=1)
+    except (IndexError, StopIteration) as err:
+        raise ValueError("Файл порожній: потрібен рядок заголовка і хоча б один рядок даних.") from err
+    if data.dtype.names is None:
+        raise ValueError("Не вдалося прочитати заголовок CSV.")
+    columns = {name: np.atleast_1d(data[name]) for name in data.dtype.names}
+    if not any(name in columns for name in required):
+        raise ValueError(f"У файлі немає жодного з потрібних стовпців: {', '.join(required)}.")
+    if next(iter(columns.values())).size == 0:
+        raise ValueError("У файлі є лише заголовок, рядків даних немає.")
+    return columns
+
+
+def de_broglie_batch(mass_kg, energy_eV=None, speed_m_s=None):
+    """
+    Довжини хвиль де Бройля λ = h/p (м) для масивів мас і кінетичних енергій або швидкостей.
+    Імпульс рахуємо релятивістськи: p = √(K² + 2K·mc²)/c або p = γmv - для v ≪ c це m·v,
+    а для електронів з K ~ 100 кеВ різниця вже ~10%. Для v ≥ c результат NaN.
+    Якщо задано обидва стовпці, у рядках з енергією використовується енергія.
+    """
+    mass_kg = np.asarray(mass_kg, dtype=float)
+    p = np.full(mass_kg.shape, np.nan)
+
+    if speed_m_s is not None:
+        beta = np.asarray(speed_m_s, dtype=float) / const.c
+        with np.errstate(invalid="ignore", divide="ignore"):
+            p = mass_kg * beta * const.c / np.sqrt(1.0 - beta**2)
+        p = np.where(np.abs(beta) < 1.0, np.abs(p), np.nan)
+
+    if energy_eV is not None:
+        K = np.asarray(energy_eV, dtype=float) * const.e
+        rest = mass_kg * const.c**2
+        with np.errstate(invalid="ignore"):
+            p_energy = np.sqrt(K**2 + 2.0 * K * rest) / const.c
+        p = np.where(np.isfinite(p_energy), p_energy, p)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lam = const.h / p
+    return np.where(p > 0, lam, np.nan), p
+
+
+def photoelectric_batch(wavelength_nm, work_function_eV):
+    """
+    Енергія фотона, K_max = hc/λ - Φ (0, якщо ефекту немає) та затримуюча напруга для масивів.
+    Для λ ≤ 0 результат NaN. Повертає (E_photon еВ, K_max еВ, V_stop В).
+    """
+    wavelength_nm = np.asarray(wavelength_nm, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        E_photon = np.where(wavelength_nm > 0, _HC_EV_NM / wavelength_nm, np.nan)
+    K_max = np.maximum(E_photon - np.asarray(work_function_eV, dtype=float), 0.0)
+    return E_photon, K_max, K_max # V_stop = K_max/e чисельно дорівнює K_max в еВ
+
+
+def to_csv_bytes(columns, chunk_rows=10000):
+    """
+    Словник {назва: масив} -> CSV (bytes). Рядки пишуться блоками по chunk_rows,
+    щоб не створювати проміжний рядок для кожної клітинки всієї таблиці одразу.
+    """
+    names = list(columns)
+    table = np.column_stack([np.asarray(columns[name], dtype=float) for name in names])
+    buffer = io.StringIO()
+    buffer.write(",".join(names) + "\n")
+    for start in range(0, table.shape[0], chunk_rows):
+        np.savetxt(buffer, table[start:start + chunk_rows], delimiter=",", fmt="%.6e")
+    return buffer.getvalue().encode("utf-8")
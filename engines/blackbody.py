@@ -0,0 +1,45 @@
+import numpy as np
+import scipy.constants as const
+
+# --- Фізичні константи ---
+h = const.h       # Стала Планка
+c = const.c       # Швидкість світла
+k_B = const.k     # Стала Больцмана
+
+
+# --- Функція Планка ---
+def planck_radiation(wavelength_nm, T_K):
+    """
+    Розраховує спектральну інтенсивність (випромінювальну здатність)
+    за законом Планка, нормовану на максимум у заданому діапазоні.
+    """
+    lambda_m = np.asarray(wavelength_nm, dtype=float) * 1e-9 # нм -> м
+
+    if T_K == 0:
+        return np.zeros_like(lambda_m)
+
+    numerator = 2.0 * h * c**2
+    exponent = (h * c) / (lambda_m * k_B * T_K)
+
+    # Запобігаємо 'overflow'
+    exponent = np.minimum(exponent, 700)
+
+    denominator = (lambda_m**5) * (np.exp(exponent) - 1.0)
+
+    intensity = numerator / denominator
+
+    if np.max(intensity) > 0:
+        return intensity / np.max(intensity)
+    else:
+        return intensity
+
+
+# --- Джерела білого світла (поліхроматичні режими оптичних сторінок) ---
+WHITE_SOURCES = ("Чорне тіло (Планк)", "Рівноенергетичний спектр")
+
+
+def source_spectrum(source, wavelength_nm, T_K):
+    """Спектральна густина джерела з WHITE_SOURCES на сітці довжин хвиль (нормована на максимум)."""
+    if source == WHITE_SOURCES[0]:
+        return planck_radiation(wavelength_nm, T_K)
+    return np.ones_like(np.asarray(wavelength_nm, dtype=float))
@@ -0,0 +1,120 @@
+import numpy as np
+
+# Видимий діапазон для розрахунків кольору, нм
+VISIBLE_NM = (380.0, 780.0)
+
+# Перехід від XYZ до лінійного sRGB (біла точка D65)
+XYZ_TO_SRGB = np.array([
+    [3.2406, -1.5372, -0.4986],
+    [-0.9689, 1.8758, 0.0415],
+    [0.0557, -0.2040, 1.0570],
+])
+
+
+# --- Функції узгодження кольорів CIE 1931 ---
+def _lobe(wavelength_nm, mu, sigma_left, sigma_right):
+    """Асиметрична гауссова пелюстка: різна ширина ліворуч і праворуч від mu."""
+    sigma = np.where(wavelength_nm < mu, sigma_left, sigma_right)
+    return np.exp(-0.5 * ((wavelength_nm - mu) / sigma)**2)
+
+
+def cie_xyz(wavelength_nm):
+    """
+    Функції x̄, ȳ, z̄ стандартного спостерігача CIE 1931 (2°) у багатопелюстковому
+    аналітичному наближенні Вимана-Слоуна-Ширлі (похибка ~1% від табличних).
+    Повертає масив (3, ...) тієї ж форми, що й wavelength_nm.
+    """
+    lam = np.asarray(wavelength_nm, dtype=float)
+    x = 1.056 * _lobe(lam, 599.8, 37.9, 31.0) + 0.362 * _lobe(lam, 442.0, 16.0, 26.7) \
+        - 0.065 * _lobe(lam, 501.1, 20.4, 26.2)
+    y = 0.821 * _lobe(lam, 568.8, 46.9, 40.5) + 0.286 * _lobe(lam, 530.9, 16.3, 31.1)
+    z = 1.217 * _lobe(lam, 437.0, 11.8, 36.0) + 0.681 * _lobe(lam, 459.0, 26.0, 13.8)
+    return np.stack([x, y, z])
+
+
+def srgb_gamma(linear):
+    """Гамма-корекція sRGB для лінійних значень у [0, 1]."""
+    linear = np.clip(linear, 0.0, 1.0)
+    return np.where(linear <= 0.0031308, 12.92 * linear, 1.055 * linear**(1 / 2.4) - 0.055)
+
+
+# --- Спектр -> колір ---
+def spectrum_to_srgb(intensity, wavelength_nm, weights=None):
+    """
+    Колір точок екрана за спектральною інтенсивністю intensity (λ × ...):
+    XYZ = Σ_λ S(λ)·I(λ, ·)·[x̄, ȳ, z̄](λ) - одна згортка по осі λ, далі матриця sRGB.
+    weights - спектр джерела S(λ) (за замовчуванням рівноенергетичний).
+    Яскравість нормується на найяскравішу точку; кольори поза гамутом sRGB обрізаються.
+    Повертає масив uint8 (..., 3).
+    """
+    cmf = cie_xyz(wavelength_nm)
+    if weights is not None:
+        cmf = cmf * weights
+    xyz = np.tensordot(cmf, intensity, axes=(1, 0))
+    rgb = np.tensordot(XYZ_TO_SRGB, xyz, axes=(1, 0))
+    rgb = np.moveaxis(rgb, 0, -1)
+    rgb /= max(rgb.max(), 1e-300)
+    return np.round(255 * srgb_gamma(rgb)).astype(np.uint8)
+
+
+def white_light_screen(intensity, wavelength_nm, weights):
+    """
+    Екран у білому світлі за інтенсивністю (λ × y) та спектром джерела weights (λ,):
+    колір точок (uint8, y × 3) і сумарна інтенсивність Σ_λ S·I / Σ_λ S.
+    """
+    return spectrum_to_srgb(intensity, wavelength_nm, weights), weights @ intensity / weights.sum()
+
+
+# --- Колір однієї довжини хвилі (таблиця з кроком 1 нм) ---
+def _piecewise_rgb(nm):
+    """
+    Наближення кольору спектральної лінії відрізками (R, G, B) з послабленням на краях
+    видимого діапазону та гаммою 0.8 - та сама формула, що раніше була в кожній оптичній сторінці.
+    Векторизовано для побудови таблиці; поза 380-780 нм - чорний.
+    """
+    nm = np.asarray(nm, dtype=float)
+    conditions = [
+        (380 <= nm) & (nm <= 439), (440 <= nm) & (nm <= 489), (490 <= nm) & (nm <= 509),
+        (510 <= nm) & (nm <= 579), (580 <= nm) & (nm <= 644), (645 <= nm) & (nm <= 780),
+    ]
+    R = np.select(conditions, [-(nm - 440) / (440 - 380), 0.0, 0.0, (nm - 510) / (580 - 510), 1.0, 1.0])
+    G = np.select(conditions, [0.0, (nm - 440) / (490 - 440), 1.0, 1.0, -(nm - 645) / (645 - 580), 0.0])
+    B = np.select(conditions, [1.0, 1.0, -(nm - 510) / (510 - 490), 0.0, 0.0, 0.0])
+    factor = np.select(
+        [(380 <= nm) & (nm <= 419), (420 <= nm) & (nm <= 644), (645 <= nm) & (nm <= 780)],
+        [0.3 + 0.7 * (nm - 380) / (420 - 380), 1.0, 0.3 + 0.7 * (780 - nm) / (780 - 645)],
+    )
+    rgb = np.stack([R, G, B], axis=-1) * factor[..., None]
+    return (255 * rgb**0.8).astype(np.uint8)
+
+
+# Таблиця для цілих λ від LUT_START_NM до LUT_END_NM; останній рядок - чорний для λ поза діапазоном
+LUT_START_NM, LUT_END_NM = 380, 780
+RGB_LUT = np.vstack([_piecewise_rgb(np.arange(LUT_START_NM, LUT_END_NM + 1)), np.zeros((1, 3), np.uint8)])
+HEX_LUT = np.array([f"#{r:02x}{g:02x}{b:02x}" for r, g, b in RGB_LUT])
+
+
+def _lut_index(wavelength_nm):
+    """Номери рядків таблиці для λ (округлення до 1 нм); λ поза діапазоном -> чорний рядок."""
+    index = np.rint(np.asarray(wavelength_nm, dtype=float)).astype(np.int64) - LUT_START_NM
+    return np.where((index >= 0) & (index <= LUT_END_NM - LUT_START_NM), index, len(RGB_LUT) - 1)
+
+
+def wavelength_to_rgb(wavelength_nm):
+    """Колір (uint8, ... × 3) для масиву довжин хвиль будь-якої форми - одна вибірка з таблиці."""
+    return RGB_LUT[_lut_index(wavelength_nm)]
+
+
+def wavelength_to_hex(wavelength_nm):
+    """Колір '#rrggbb' для λ у нм: рядок для числа, масив рядків для масиву."""
+    colours = HEX_LUT[_lut_index(wavelength_nm)]
+    return str(colours) if colours.ndim == 0 else colours
+
+
+def intensity_to_rgb(intensity, wavelength_nm):
+    """
+    Зображення uint8 (... × 3) з карти інтенсивності (0...1) у кольорі довжини хвилі:
+    λ - число або масив, що транслюється на форму intensity (напр. окрема λ для кожного відліку спектра).
+    """
+    colour = wavelength_to_rgb(wavelength_nm)
+    return (np.clip(intensity, 0.0, 1.0)[..., None] * colour).astype(np.uint8)
@@ -0,0 +1,66 @@
+import numpy as np
+from scipy.linalg import expm
+
+# Ряд урану U-238 -> Pb-206 (основні гілки), періоди напіврозпаду в роках
+_MINUTE = 1.0 / (365.25 * 24 * 60)
+_DAY = 1.0 / 365.25
+U238_SERIES = [
+    ("U-238", 4.468e9),
+    ("Th-234", 24.10 * _DAY),
+    ("Pa-234m", 1.17 * _MINUTE),
+    ("U-234", 2.455e5),
+    ("Th-230", 7.538e4),
+    ("Ra-226", 1600.0),
+    ("Rn-222", 3.8235 * _DAY),
+    ("Po-218", 3.098 * _MINUTE),
+    ("Pb-214", 26.8 * _MINUTE),
+    ("Bi-214", 19.9 * _MINUTE),
+    ("Po-214", 164.3e-6 / 60 * _MINUTE),
+    ("Pb-210", 22.2),
+    ("Bi-210", 5.012 * _DAY),
+    ("Po-210", 138.376 * _DAY),
+    ("Pb-206", np.inf),
+]
+
+
+def simulate_decay(n0, lambda_const, t_grid, n_runs, seed=None):
+    """
+    Монте-Карло розпаду: на кожному кроці кількість розпадів - біноміальна вибірка
+    Binomial(N, 1 - e^{-λΔt}) одразу для всіх n_runs незалежних реалізацій (без циклу по ядрах).
+    Повертає (N (n_runs, len(t_grid)), розпади на кожному інтервалі (n_runs, len(t_grid) - 1)).
+    """
+    rng = np.random.default_rng(seed)
+    p_decay = -np.expm1(-lambda_const * np.diff(t_grid))
+
+    N = np.empty((n_runs, len(t_grid)), dtype=np.int64)
+    decays = np.empty((n_runs, len(t_grid) - 1), dtype=np.int64)
+    N[:, 0] = int(n0)
+    for i, p in enumerate(p_decay):
+        decays[:, i] = rng.binomial(N[:, i], p)
+        N[:, i + 1] = N[:, i] - decays[:, i]
+    return N, decays
+
+
+def chain_matrix(half_lives):
+    """
+    Матриця A системи dN/dt = A·N для лінійного ланцюга розпадів:
+    на діагоналі -λ_i, під діагоналлю λ_i (дочірній отримує розпади материнського).
+    Стабільний кінцевий нуклід має T₁/₂ = inf (λ = 0).
+    """
+    lambdas = np.log(2) / np.asarray(half_lives, dtype=float)
+    A = np.diag(-lambdas)
+    A[np.arange(1, lambdas.size), np.arange(lambdas.size - 1)] = lambdas[:-1]
+    return A, lambdas
+
+
+def solve_chain(half_lives, n0, t_grid):
+    """
+    Розв'язок рівнянь Бейтмана N(t) = exp(A·t)·N₀ для кожного t (матрична експонента).
+    На відміну від явної формули Бейтмана, не страждає від віднімання близьких
+    великих доданків, коли періоди відрізняються на 20 порядків (U-238 та Po-214).
+    Повертає масив (len(t_grid), кількість нуклідів).
+    """
+    A, _ = chain_matrix(half_lives)
+    n0 = np.asarray(n0, dtype=float)
+    N = np.array([expm(A * t) @ n0 for t in t_grid])
+    return np.clip(N, 0.0, None)
@@ -0,0 +1,37 @@
+import numpy as np
+
+# Функції та константи, дозволені у виразах користувача
+ALLOWED_NAMES = {
+    name: getattr(np, name) for name in (
+        "sin", "cos", "tan", "arcsin", "arccos", "arctan",
+        "sinh", "cosh", "tanh", "exp", "log", "log10", "sqrt",
+        "abs", "sign", "heaviside", "where", "minimum", "maximum",
+        "pi", "e",
+    )
+}
+
+
+def evaluate_expression(expr, **variables):
+    """
+    Обчислює вираз користувача (напр. "0.5*x**2 + 0.1*x**4") на масивах numpy.
+    Дозволені лише імена з ALLOWED_NAMES та передані змінні.
+    Результат має форму першої змінної. Помилки виразу -> ValueError.
+    """
+    try:
+        code = compile(expr, "<вираз>", "eval")
+    except SyntaxError as err:
+        raise ValueError(f"Синтаксична помилка у виразі: {err.msg}") from err
+
+    for name in code.co_names:
+        if name not in ALLOWED_NAMES and name not in variables:
+            raise ValueError(f"Недозволене ім'я у виразі: {name}")
+
+    namespace = {**ALLOWED_NAMES, **variables}
+    try:
+        with np.errstate(all="ignore"):
+            result = eval(code, {"__builtins__": {}}, namespace)
+    except Exception as err:
+        raise ValueError(f"Не вдалося обчислити вираз: {err}") from err
+
+    shape = np.shape(next(iter(variables.values()))) if variables else ()
+    return np.broadcast_to(np.asarray(result), shape).copy()
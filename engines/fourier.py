@@ -0,0 +1,79 @@
+import numpy as np
+from scipy.fft import irfft
+
+# Хвилі з відомими рядами: f(x) = Σ b_n·sin(n·x), період 2π, амплітуда ±1
+WAVES = ("square", "sawtooth")
+
+
+def series_coefficients(wave, n_terms):
+    """
+    Номери гармонік n та коефіцієнти b_n для перших n_terms доданків ряду.
+    Меандр: непарні n, b_n = 4/(πn); пилка: усі n, b_n = 2·(-1)^{n+1}/(πn).
+    """
+    if wave == "square":
+        n = np.arange(1, 2 * n_terms, 2)
+        return n, 4 / (np.pi * n)
+    if wave == "sawtooth":
+        n = np.arange(1, n_terms + 1)
+        return n, 2 * (-1.0)**(n + 1) / (np.pi * n)
+    raise ValueError(f"Невідомий тип хвилі: {wave}")
+
+
+def ideal_wave(wave, x):
+    """Точна функція, до якої збігається ряд: меандр sign(sin x) або пилка x/π на (-π, π)."""
+    if wave == "square":
+        return np.sign(np.sin(x))
+    return (np.mod(x + np.pi, 2 * np.pi) - np.pi) / np.pi
+
+
+def partial_sums(x, n, b, dtype=np.float64):
+    """
+    Усі часткові суми S_1...S_N одразу: матриця доданків (гармоніки × точки)
+    і кумулятивна сума вздовж гармонік. Рядок i - сума перших i + 1 доданків.
+    """
+    terms = (b[:, None] * np.sin(np.outer(n, x))).astype(dtype)
+    return np.cumsum(terms, axis=0)
+
+
+def synthesize_ifft(n, b, n_points):
+    """
+    Сума Σ b_n·sin(n·x) на рівномірній сітці x_j = 2πj/n_points, j = 0...n_points-1,
+    через одне обернене rfft: коефіцієнт -i·b_n·n_points/2 у біні n.
+    Коштує O(M log M) замість O(N·M) - придатно для 10⁵ гармонік і більше.
+    Потрібно n_points > 2·max(n).
+    """
+    if n_points <= 2 * n.max():
+        raise ValueError("Кількість точок має перевищувати подвоєний номер найвищої гармоніки")
+    spectrum = np.zeros(n_points // 2 + 1, dtype=complex)
+    spectrum[n] = -0.5j * b * n_points
+    x = 2 * np.pi * np.arange(n_points) / n_points
+    return x, irfft(spectrum, n=n_points, workers=-1)
+
+
+def gibbs_overshoot(wave, n_terms_values, samples=400):
+    """
+    Перерегулювання Гіббса (max S_N - 1)/2 як частка стрибка для кожного N.
+    Максимум лежить на відстані ~π/n_max від розриву, тому для кожного N часткова сума
+    рахується лише на локальній сітці [0, 3π/n_max] біля стрибка (x = 0 для меандру,
+    x = π для пилки), а не на всьому періоді. Границя N → ∞: 0.0895 (≈ 9%).
+    """
+    overshoot = np.empty(len(n_terms_values))
+    t = np.linspace(0, 3, samples)
+    for i, n_terms in enumerate(n_terms_values):
+        n, b = series_coefficients(wave, n_terms)
+        x = np.pi * t / n[-1]
+        if wave == "sawtooth":
+            x = np.pi - x # підходимо до розриву при x = π зліва, де f → 1
+        peak = (b @ np.sin(np.outer(n, x))).max()
+        overshoot[i] = (peak - 1) / 2
+    return overshoot
+
+
+def interpolated_max(y):
+    """Максимум дискретного сигналу з параболічним уточненням за трьома сусідніми точками."""
+    i = int(np.argmax(y))
+    if i == 0 or i == len(y) - 1:
+        return float(y[i])
+    left, mid, right = y[i - 1], y[i], y[i + 1]
+    curvature = left - 2 * mid + right
+    return float(mid - (left - right)**2 / (8 * curvature)) if curvature < 0 else float(mid)
@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def simulate_franck_hertz(V, E_ex, mean_free_path, p_inelastic, U_retard, n_electrons,
+                          kT=0.1, seed=None, chunk=2000):
+    """
+    Монте-Карло модель трубки Франка-Герца (1D, відстань катод-сітка = 1).
+    Електрон набирає енергію e·V·x у однорідному полі; зіткнення з атомами - пуассонівський
+    процес із середньою довжиною вільного пробігу mean_free_path. Якщо в момент зіткнення
+    K ≥ E_ex, з імовірністю p_inelastic воно непружне і електрон втрачає E_ex.
+    За сіткою гальмівна напруга U_retard: до анода доходять електрони з K ≥ e·U_retard.
+
+    Пружні зіткнення енергії не змінюють, тому моделюємо лише "кандидати в непружні"
+    (пуассонівський потік з інтенсивністю p_inelastic / mean_free_path). Потік не має пам'яті:
+    наступне збудження - це перше зіткнення після точки s = max(місце попереднього збудження,
+    точка, де K знову сягає E_ex), тобто s + Exp(mean_free_path / p_inelastic).
+    Тому цикл іде за номером збудження (їх не більше e·V_max / E_ex), а не за номером зіткнення,
+    і час не залежить від довжини вільного пробігу. Масиви (електрони × напруги),
+    очікування Exp спільні для всіх напруг - криві гладкі, без окремого шуму для кожної V.
+    Повертає частку електронів, що дійшли до анода, для кожної напруги.
+    """
+    rng = np.random.default_rng(seed)
+    V = np.asarray(V, dtype=np.float32)
+    rate = p_inelastic / mean_free_path
+    collected = np.zeros(V.size, dtype=np.int64)
+    inv_V = 1.0 / np.maximum(V, np.float32(1e-6))
+
+    for start in range(0, n_electrons, chunk):
+        size = min(chunk, n_electrons - start)
+        K0 = rng.exponential(kT, size).astype(np.float32) # теплова енергія вильоту з катода
+
+        position = np.zeros((size, V.size), dtype=np.float32) # місце останнього збудження (inf - більше не буде)
+        losses = np.zeros((size, V.size), dtype=np.int32)
+        n = 0
+        while True:
+            # Точка, де після n втрат K = e·V·x + K0 - n·E_ex знову дорівнює E_ex
+            x_threshold = ((n + 1) * np.float32(E_ex) - K0)[:, None] * inv_V
+            wait = rng.exponential(1.0 / rate, size).astype(np.float32)
+            np.maximum(position, x_threshold, out=position)
+            position += wait[:, None]
+            excited = position < 1.0
+            if not excited.any():
+                break
+            losses += excited
+            position[~excited] = np.inf
+            n += 1
+
+        K_grid = V + K0[:, None] - losses * np.float32(E_ex)
+        collected += np.count_nonzero(K_grid >= U_retard, axis=0)
+
+    return collected / n_electrons
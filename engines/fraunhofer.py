@@ -0,0 +1,145 @@
+import numpy as np
+from scipy.fft import fft, rfft2, fftfreq, fftshift, next_fast_len
+
+from engines.expressions import evaluate_expression
+
+# Апертура задається растровою маскою пропускання на рівномірній сітці з кроком dx (м).
+# Дальнє поле - перетворення Фур'є маски: просторова частота f відповідає sinθ = λ·f,
+# а точка екрана на відстані L - y = L·tanθ. Доповнення нулями до розміру M робить крок
+# по екрану λL/(M·dx) дрібнішим, не змінюючи самої апертури.
+# Плани FFT для повторюваних розмірів scipy.fft кешує сам, тож повторні виклики дешевші.
+
+
+def aperture_coords(n, extent):
+    """Координати n вузлів сітки ширини extent (м) з нулем у вузлі n // 2."""
+    return (np.arange(n) - n // 2) * (extent / n)
+
+
+def aperture_grid(span, feature, size, oversample=6):
+    """
+    Сітка для апертури повного розміру span з найдрібнішою деталлю feature (м) під FFT розміру size.
+    Крок dx = feature / oversample (і не більше span / 64), щоб деталь займала кілька вузлів; якщо апертура тоді
+    не вміщується в половину size (доповнення нулями щонайменше вдвічі), крок збільшується.
+    Повертає (координати вузлів, dx).
+    """
+    dx = min(feature / oversample, span / 64)
+    n = int(np.ceil(1.2 * span / dx / 2)) * 2
+    if n > size // 2:
+        n = size // 2
+        dx = 1.2 * span / n
+    return aperture_coords(n, n * dx), dx
+
+
+# --- Маски апертур ---
+# Якщо передано крок сітки dx, краї згладжуються: вузол отримує частку пропускання, пропорційну
+# тому, наскільки він усередині отвору. Тоді ефективна ширина отвору не квантується кроком сітки.
+def _transmission(inside, dx):
+    """inside - відстань від вузла до краю отвору (> 0 всередині), м."""
+    if dx is None:
+        return inside >= 0
+    return np.clip(inside / dx + 0.5, 0.0, 1.0)
+
+
+def slits_mask(x, n_slits, width, period, dx=None):
+    """
+    N однакових щілин ширини width з періодом period, симетрично відносно 0.
+    Без циклу по щілинах: для кожної точки береться номер найближчої щілини.
+    """
+    offset = (n_slits - 1) / 2
+    nearest = np.clip(np.round(x / period + offset), 0, n_slits - 1)
+    return _transmission(width / 2 - np.abs(x - (nearest - offset) * period), dx)
+
+
+def rect_mask(X, Y, width, height, dx=None):
+    return _transmission(np.minimum(width / 2 - np.abs(X), height / 2 - np.abs(Y)), dx)
+
+
+def circle_mask(X, Y, radius, dx=None):
+    return _transmission(radius - np.sqrt(X**2 + Y**2), dx)
+
+
+def expression_mask(expr, X, Y, **params):
+    """
+    Довільна апертура з виразу користувача від x та y (м) і сталих params:
+    пропускає там, де вираз ≠ 0. Помилки виразу -> ValueError.
+    """
+    X, Y = np.broadcast_arrays(X, Y)
+    return np.real(evaluate_expression(expr, x=X, y=Y, **params)) != 0
+
+
+# --- Дальнє поле ---
+def far_field_1d(mask, dx, wavelength, distance, pad=16, paraxial=False):
+    """
+    Інтенсивність Фраунгофера для 1D апертури: |FFT маски|² з доповненням нулями в pad разів.
+    Повертає (y на екрані, м; I / I_max) лише для фізичних напрямків |sinθ| < 1.
+    paraxial=True дає y = λL·f, як у формулах малих кутів (і як у far_field_2d).
+    """
+    M = next_fast_len(pad * mask.size)
+    field = fftshift(fft(mask.astype(float), n=M, workers=-1))
+    sin_theta = wavelength * fftshift(fftfreq(M, d=dx))
+    valid = np.abs(sin_theta) < 1
+    intensity = np.abs(field[valid])**2
+    if paraxial:
+        y = distance * sin_theta[valid]
+    else:
+        y = distance * np.tan(np.arcsin(sin_theta[valid]))
+    return y, intensity / intensity.max()
+
+
+def far_field_2d(mask, dx, wavelength, distance, size=4096):
+    """
+    2D картина Фраунгофера size × size (float32) через rfft2 маски з доповненням нулями.
+    Маска дійсна, тож I(-f) = I(f): рахуємо лише половину спектра (rfft2) і відновлюємо
+    решту відображенням - удвічі менше обчислень і пам'яті, ніж у повного fft2.
+    Координати екрана - параксіальні (y = λL·f). Повертає (координати (size,), м; I / I_max).
+    """
+    half = np.abs(rfft2(mask.astype(np.float32), s=(size, size), workers=-1))**2
+    image = np.empty((size, size), dtype=np.float32)
+    n_half = half.shape[1]
+    image[:, :n_half] = half
+    # I[r, c] = I[-r, -c] для стовпців, яких немає у rfft2
+    rows = (-np.arange(size)) % size
+    cols = size - np.arange(n_half, size)
+    image[:, n_half:] = half[rows][:, cols]
+    image = fftshift(image)
+    image /= image.max()
+    coords = distance * wavelength * fftshift(fftfreq(size, d=dx))
+    return coords, image
+
+
+def crop_and_bin(coords, image, half_width, out_size=400):
+    """
+    Вирізає центральну область |y| ≤ half_width і зменшує її усередненням блоків
+    до ~out_size точок на сторону - для відображення 4096² картини в браузері.
+    """
+    keep = np.flatnonzero(np.abs(coords) <= half_width)
+    factor = max(1, int(np.ceil(keep.size / out_size)))
+    n = (keep.size // factor) * factor
+    keep = keep[:n]
+    block = image[np.ix_(keep, keep)]
+    binned = block.reshape(n // factor, factor, n // factor, factor).mean(axis=(1, 3))
+    return coords[keep].reshape(-1, factor).mean(axis=1), binned
+
+
+# --- Набір щілин (дослід Юнга, ґратка) ---
+def slits_far_field(n_slits, width, period, height, wavelength, distance, half_width, size=2048, out_size=400):
+    """
+    Картина від N щілин ширини width, висоти height з періодом period у вікні екрана |y| ≤ half_width.
+    1D профіль - через far_field_1d на дрібній сітці (параксіально, як у формулах сторінок),
+    2D зображення - через far_field_2d розміру size, зменшене crop_and_bin до ~out_size².
+    Крок сітки не більший за λL/half_width / 6, щоб вікно екрана вміщувалося в діапазон частот FFT.
+    Повертає (y, I) профілю та (координати, зображення) 2D картини.
+    """
+    row_span = (n_slits - 1) * period + width
+    screen_feature = wavelength * distance / half_width
+
+    x, dx = aperture_grid(row_span, min(width, screen_feature), 2**16)
+    y, profile = far_field_1d(slits_mask(x, n_slits, width, period, dx), dx, wavelength, distance,
+                              pad=64, paraxial=True)
+    keep = np.abs(y) <= half_width
+
+    x2, dx2 = aperture_grid(max(row_span, height), min(width, height, screen_feature), size)
+    mask = slits_mask(x2[None, :], n_slits, width, period, dx2) * _transmission(height / 2 - np.abs(x2[:, None]), dx2)
+    coords, image = far_field_2d(mask, dx2, wavelength, distance, size)
+    coords, image = crop_and_bin(coords, image, half_width, out_size)
+    return y[keep], profile[keep], coords, image
@@ -0,0 +1,151 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Усі ґратки задаються прямокутною (ортогональною) коміркою: розміри в одиницях a
+# та базис у частках комірки. Для ГЩУ це 4-атомна орторомбічна комірка a × √3a × c,
+# тож суперкомірка завжди - прямокутний ящик і періодичні умови задаються boxsize у cKDTree.
+_HCP_C = np.sqrt(8.0 / 3.0) # ідеальне c/a
+
+CELLS = {
+    "SC": {"name": "Проста кубічна (ПК)", "cell": (1.0, 1.0, 1.0), "apf": np.pi / 6,
+           "basis": [[0, 0, 0]]},
+    "BCC": {"name": "Об'ємно-центрована кубічна (ОЦК)", "cell": (1.0, 1.0, 1.0), "apf": np.pi * np.sqrt(3) / 8,
+            "basis": [[0, 0, 0], [0.5, 0.5, 0.5]]},
+    "FCC": {"name": "Гранецентрована кубічна (ГЦК)", "cell": (1.0, 1.0, 1.0), "apf": np.pi / (3 * np.sqrt(2)),
+            "basis": [[0, 0, 0], [0.5, 0.5, 0], [0.5, 0, 0.5], [0, 0.5, 0.5]]},
+    "HCP": {"name": "Гексагональна щільна (ГЩУ)", "cell": (1.0, np.sqrt(3.0), _HCP_C), "apf": np.pi / (3 * np.sqrt(2)),
+            "basis": [[0, 0, 0], [0.5, 0.5, 0], [0.5, 1 / 6, 0.5], [0, 2 / 3, 0.5]]},
+    "DIAMOND": {"name": "Алмаз", "cell": (1.0, 1.0, 1.0), "apf": np.pi * np.sqrt(3) / 16,
+                "basis": [[0, 0, 0], [0.5, 0.5, 0], [0.5, 0, 0.5], [0, 0.5, 0.5],
+                          [0.25, 0.25, 0.25], [0.75, 0.75, 0.25], [0.75, 0.25, 0.75], [0.25, 0.75, 0.75]]},
+}
+
+
+def supercell(kind, n, a=1.0, dtype=np.float64):
+    """
+    Суперкомірка n×n×n: координати всіх атомів (N, 3) та розміри ящика (3,).
+    Будується без циклів: зсуви комірок (n³, 1, 3) + базис (1, nb, 3).
+    """
+    spec = CELLS[kind]
+    cell = np.asarray(spec["cell"], dtype=dtype) * a
+    basis = np.asarray(spec["basis"], dtype=dtype) * cell
+    offsets = np.indices((n, n, n), dtype=dtype).reshape(3, -1).T * cell
+    positions = (offsets[:, None, :] + basis[None, :, :]).reshape(-1, 3)
+    return positions, cell * n
+
+
+def neighbour_shells(positions, box, n_shells=4, n_sample=2000, tol=1e-3, seed=None):
+    """
+    Координаційні сфери за періодичним KD-деревом: радіуси перших n_shells сфер
+    та середня кількість сусідів на кожній. Відстані рахуються лише для n_sample
+    випадкових атомів - у періодичній ідеальній ґратці всі позиції еквівалентні за сферами.
+    Періодичне дерево бачить кожен атом лише один раз (найближчий образ), тож сфери
+    з r ≥ min(box)/2 недораховуються - повертаються лише сфери з r < min(box)/2
+    (їх може бути менше за n_shells, а для одного атома - жодної).
+    Повертає (радіуси, кількості, дерево).
+    """
+    tree = cKDTree(positions, boxsize=box)
+    r_limit = 0.5 * np.min(box) * (1 - tol)
+    if len(positions) < 2:
+        return np.empty(0), np.empty(0), tree
+    rng = np.random.default_rng(seed)
+    sample = positions[rng.choice(len(positions), size=min(n_sample, len(positions)), replace=False)]
+
+    # Кількість сусідів до n_shells-ї сфери невідома заздалегідь: збільшуємо k, доки
+    # у вибірці не з'явиться n_shells різних відстаней або відстань не сягне межі r_limit.
+    k = 32
+    while True:
+        k_eff = min(k, len(positions))
+        dist, _ = tree.query(sample, k=k_eff)
+        d = dist[:, 1:].ravel() # перший сусід - сам атом
+        radii = _cluster_distances(d, tol)
+        if len(radii) > n_shells or radii[-1] >= r_limit or k_eff == len(positions):
+            break
+        k *= 2
+
+    radii = radii[radii < r_limit][:n_shells]
+    # Останню сферу з неповним k могло обрізати, тому кількості рахуємо окремим запитом
+    counts = np.array([np.mean(tree.query_ball_point(sample, r * (1 + tol), return_length=True)) - 1
+                       for r in radii])
+    return radii, np.diff(np.concatenate(([0.0], counts))), tree
+
+
+def _cluster_distances(d, tol):
+    """Різні відстані з відносною точністю tol (відсортовані)."""
+    d = np.sort(d)
+    breaks = np.flatnonzero(np.diff(d) > tol * d[1:]) + 1
+    return d[np.concatenate(([0], breaks))]
+
+
+def bond_pairs(positions, r_bond, tol=1e-3):
+    """Пари атомів на відстані ≤ r_bond (без періодичності - для малювання): масив (n_pairs, 2)."""
+    return cKDTree(positions).query_pairs(r_bond * (1 + tol), output_type="ndarray")
+
+
+def bond_segments(positions, pairs):
+    """
+    Усі зв'язки однією лінією: координати (x, y, z) у форматі p1, p2, NaN, p1, p2, NaN...
+    Одна траса Scatter3d замість окремої траси на кожен відрізок.
+    """
+    seg = np.full((len(pairs), 3, 3), np.nan, dtype=positions.dtype)
+    seg[:, 0] = positions[pairs[:, 0]]
+    seg[:, 1] = positions[pairs[:, 1]]
+    seg = seg.reshape(-1, 3)
+    return seg[:, 0], seg[:, 1], seg[:, 2]
+
+
+def perturb(positions, box, sigma=0.0, vacancy_fraction=0.0, seed=None):
+    """
+    Неідеальна ґратка: гауссові теплові зміщення зі стандартним відхиленням sigma
+    (по кожній осі, з поверненням у періодичний ящик) та випадкові вакансії.
+    """
+    rng = np.random.default_rng(seed)
+    if vacancy_fraction > 0:
+        positions = positions[rng.random(len(positions)) >= vacancy_fraction]
+    if sigma > 0:
+        positions = np.mod(positions + rng.normal(0.0, sigma, positions.shape), box)
+    return positions
+
+
+def radial_distribution(positions, box, r_max, n_bins=200, n_centres=5000, chunk=1000, seed=None):
+    """
+    Радіальна функція розподілу g(r) з періодичними умовами.
+    Центрами слугують n_centres випадкових атомів; відстані до сусідів у межах r_max
+    беруться з KD-дерева (sparse_distance_matrix) блоками по chunk центрів і одразу
+    додаються в гістограму - пам'ять обмежена одним блоком, а не всіма парами.
+    r_max не більше половини найменшого розміру ящика. Повертає (центри бінів, g(r)).
+    """
+    rng = np.random.default_rng(seed)
+    tree = cKDTree(positions, boxsize=box)
+    centres = positions[rng.choice(len(positions), size=min(n_centres, len(positions)), replace=False)]
+
+    r_max = min(r_max, 0.5 * np.min(box))
+    edges = np.linspace(0.0, r_max, n_bins + 1)
+    pairs = np.zeros(n_bins)
+    for start in range(0, len(centres), chunk):
+        block = cKDTree(centres[start:start + chunk], boxsize=box)
+        d = block.sparse_distance_matrix(tree, r_max, output_type="ndarray")["v"]
+        pairs += np.histogram(d[d > 0], bins=edges)[0] # d = 0 - сам центр
+
+    density = len(positions) / np.prod(box)
+    shell_volume = 4.0 / 3.0 * np.pi * (edges[1:]**3 - edges[:-1]**3)
+    return 0.5 * (edges[1:] + edges[:-1]), pairs / (len(centres) * density * shell_volume)
+
+
+def packing_fraction_mc(positions, box, radius, n_points=10**6, chunk=10**5, seed=None):
+    """
+    Частка об'єму ящика, зайнята кулями радіуса radius (Монте-Карло).
+    Точка всередині, якщо найближчий атом ближче за radius: один запит до KD-дерева
+    з distance_upper_bound на точку, точки обробляються блоками по chunk.
+    Повертає (частка, стандартна похибка).
+    """
+    rng = np.random.default_rng(seed)
+    tree = cKDTree(positions, boxsize=box)
+    inside = 0
+    for start in range(0, n_points, chunk):
+        size = min(chunk, n_points - start)
+        points = rng.random((size, 3)) * box
+        dist, _ = tree.query(points, k=1, distance_upper_bound=radius)
+        inside += np.count_nonzero(np.isfinite(dist))
+    fraction = inside / n_points
+    return fraction, np.sqrt(fraction * (1 - fraction) / n_points)
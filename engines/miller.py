@@ -0,0 +1,105 @@
+import math
+from fractions import Fraction
+
+import numpy as np
+
+# Десяткові перетини на кшталт 0.333 зводяться до 1/3. Межа 100 відповідає точності введення
+# ~3 знаки: при 1000 число 0.333 лишилося б дробом 333/1000 і дало б індекси (1000 333 0)
+MAX_DENOMINATOR = 100
+# Перетини, менші за 1/(2·MAX_DENOMINATOR), межа 100 звела б до 0 - для них береться точніше наближення
+FINE_DENOMINATOR = 10**6
+
+
+def parse_intercept(text, max_denominator=MAX_DENOMINATOR):
+    """
+    Перетин з осю з рядка: 'inf' -> None (площина паралельна осі), '1/2', '0.5', '2' -> Fraction.
+    Дроби a/b читаються точно, десяткові - з найближчим дробом зі знаменником ≤ max_denominator;
+    ненульовий перетин ніколи не стає нулем (0.004 лишається 1/250).
+
+    >>> miller_from_intercepts([parse_intercept(t) for t in ("0.333", "1", "inf")])
+    (3, 1, 0)
+    >>> parse_intercept("1/200"), parse_intercept("0.004")
+    (Fraction(1, 200), Fraction(1, 250))
+    """
+    text = text.strip().lower()
+    if text in ("inf", "infinity", "∞"):
+        return None
+    value = Fraction(text)
+    if "/" not in text and value.denominator > max_denominator:
+        approx = value.limit_denominator(max_denominator)
+        if approx == 0:
+            approx = value.limit_denominator(FINE_DENOMINATOR)
+        value = approx if approx != 0 else value
+    if value == 0:
+        raise ValueError("Перетин 0")
+    return value
+
+
+def miller_from_intercepts(intercepts):
+    """
+    Індекси Міллера (h, k, l) за перетинами (Fraction або None для ∞).
+    Точна раціональна арифметика: обернені величини множимо на НСК знаменників
+    і ділимо на НСД - без підбору множника та допусків float.
+    """
+    reciprocals = [Fraction(0) if x is None else 1 / Fraction(x) for x in intercepts]
+    if all(r == 0 for r in reciprocals):
+        raise ValueError("Усі перетини нескінченні")
+    common = math.lcm(*(r.denominator for r in reciprocals))
+    indices = [int(r * common) for r in reciprocals]
+    divisor = math.gcd(*indices)
+    return tuple(i // divisor for i in indices)
+
+
+def _rational_approx(x, max_denominator, tol=1e-9):
+    """
+    Найкращі раціональні наближення p/q (q ≤ max_denominator) для масиву x ≥ 0
+    ланцюговими дробами: усі елементи обробляються одночасно, цикл - лише за глибиною дробу.
+    """
+    p_prev, q_prev = np.ones_like(x, dtype=np.int64), np.zeros_like(x, dtype=np.int64)
+    p, q = np.floor(x).astype(np.int64), np.ones_like(x, dtype=np.int64)
+    remainder = x - np.floor(x)
+    active = np.abs(p / q - x) > tol * np.maximum(x, 1.0)
+    while active.any():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            y = np.where(active, 1.0 / remainder, 0.0)
+        a = np.floor(y).astype(np.int64)
+        p_new, q_new = a * p + p_prev, a * q + q_prev
+        active &= q_new <= max_denominator
+        p_prev, q_prev = np.where(active, p, p_prev), np.where(active, q, q_prev)
+        p, q = np.where(active, p_new, p), np.where(active, q_new, q)
+        remainder = np.where(active, y - a, remainder)
+        active &= np.abs(p / q - x) > tol * np.maximum(x, 1.0)
+    return p, q
+
+
+def miller_indices(intercepts, max_denominator=MAX_DENOMINATOR):
+    """
+    Пакетна версія: масив перетинів (n, 3) (np.inf - паралельно осі) -> індекси (n, 3) int64.
+    Як і в parse_intercept, дробом P/Q (Q ≤ max_denominator) наближається сам перетин - з точністю
+    введення, - тож обернена величина Q/P точна. Далі h = Q·НСК(P)/P та ділення на НСД -
+    все через np.lcm/np.gcd для всіх площин одразу.
+    Рядки з нульовим (чи меншим за 1/(2·FINE_DENOMINATOR)) перетином, NaN або з усіма
+    нескінченними перетинами дають (0, 0, 0).
+
+    >>> miller_indices([[0.333, 1, np.inf], [101, 1, 1], [0.005, 1, np.inf]]).tolist()
+    [[3, 1, 0], [1, 101, 101], [200, 1, 0]]
+    """
+    intercepts = np.atleast_2d(np.asarray(intercepts, dtype=float))
+    finite = np.isfinite(intercepts)
+    x = np.where(finite, np.abs(intercepts), 0.0)
+
+    P, Q = _rational_approx(x, max_denominator)
+    tiny = (P == 0) & (x > 0)
+    if tiny.any():
+        P[tiny], Q[tiny] = _rational_approx(x[tiny], FINE_DENOMINATOR)
+
+    valid = (~np.isnan(intercepts).any(axis=1) & np.all(~finite | (P != 0), axis=1)
+             & np.any(finite, axis=1))
+    used = finite & valid[:, None]
+    P = np.where(used, P, 1)
+    Q = np.where(used, Q * np.sign(np.where(used, intercepts, 0.0)).astype(np.int64), 0)
+    common = np.lcm.reduce(P, axis=1)
+    indices = Q * (common[:, None] // P)
+    divisor = np.gcd.reduce(indices, axis=1)
+    divisor[divisor == 0] = 1
+    return indices // divisor[:, None]
@@ -0,0 +1,61 @@
+import numpy as np
+
+_LOG_RESCALE = 150 * np.log(10.0)
+
+
+def qho_eigenfunctions(n_max, y, dtype=np.float64):
+    """
+    Нормовані власні функції ψ_0...ψ_{n_max} осцилятора в безрозмірній координаті
+    y = x·√(mω/ħ) (∫|ψ_n|² dy = 1). Повертає масив (n_max + 1, len(y)).
+
+    Замість поліномів Ерміта та n! використовуємо стійку трьохчленну рекурсію
+    ψ_{n+1} = √(2/(n+1))·y·ψ_n - √(n/(n+1))·ψ_{n-1}.
+    Множник e^{-y²/2} зберігаємо окремо як логарифм масштабу, щоб ні він, ні поліноми
+    не виходили за межі float64 навіть для n ~ 10³.
+    """
+    y = np.asarray(y, dtype=float)
+    psi = np.empty((n_max + 1, y.size), dtype=dtype)
+
+    log_scale = -0.5 * y**2
+    prev = np.zeros_like(y)
+    cur = np.full_like(y, np.pi**-0.25)
+    psi[0] = cur * np.exp(log_scale)
+
+    for n in range(n_max):
+        prev, cur = cur, np.sqrt(2.0 / (n + 1)) * y * cur - np.sqrt(n / (n + 1)) * prev
+        big = np.abs(cur) > 1e150
+        if big.any():
+            cur[big] *= 1e-150
+            prev[big] *= 1e-150
+            log_scale[big] += _LOG_RESCALE
+        psi[n + 1] = cur * np.exp(log_scale)
+    return psi
+
+
+def coherent_coefficients(alpha, n_max):
+    """
+    Коефіцієнти когерентного стану c_n = e^{-|α|²/2}·αⁿ/√(n!) для n = 0...n_max
+    (через рекурсію c_n = c_{n-1}·α/√n - без факторіалів).
+    """
+    c = np.empty(n_max + 1, dtype=complex)
+    c[0] = np.exp(-0.5 * abs(alpha)**2)
+    for n in range(1, n_max + 1):
+        c[n] = c[n - 1] * alpha / np.sqrt(n)
+    return c
+
+
+def project_onto_basis(psi, basis, dy):
+    """Коефіцієнти розкладу cₙ = ∫ψₙ(y)·ψ(y) dy для базису (n, точки)."""
+    return (basis @ psi) * dy
+
+
+def evolve_density(coeffs, basis, omega_t):
+    """
+    |ψ(y, t)|² для всіх моментів ωt одразу: фази e^{-i(n+1/2)ωt} множаться на cₙ,
+    а кадри дає одне матричне множення (кадри × n) @ (n × точки).
+    basis у float32 - тоді кадри обчислюються в одинарній точності.
+    """
+    n = np.arange(len(coeffs))
+    phases = np.exp(-1j * np.outer(omega_t, n + 0.5)) * coeffs
+    psi_t = phases.astype(np.complex64) @ basis
+    return np.abs(psi_t)**2
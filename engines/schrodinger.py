@@ -0,0 +1,45 @@
+import numpy as np
+import scipy.constants as const
+from scipy.linalg import eigh_tridiagonal
+
+# ħ²/(2mₑ) в одиницях еВ·нм² - з ним рівняння Шредінгера записується в нм та еВ
+HBAR2_2M_EV_NM2 = const.hbar**2 / (2 * const.m_e) / (const.e * 1e-18)
+
+
+# --- Потенціали V(x), x в нм, V в еВ ---
+def finite_well(x, V0, a):
+    """Скінченна прямокутна яма глибини V0 та ширини a з центром у x = 0."""
+    return np.where(np.abs(x) <= a / 2, 0.0, V0)
+
+
+def double_well(x, V0, a):
+    """Подвійна яма V0·((x/a)² - 1)²: мінімуми в x = ±a, бар'єр V0 у центрі."""
+    return V0 * ((x / a)**2 - 1.0)**2
+
+
+def anharmonic(x, k, lam):
+    """Ангармонічний осцилятор ½·k·x² + λ·x⁴."""
+    return 0.5 * k * x**2 + lam * x**4
+
+
+def solve_eigenstates(x, V, k, kinetic=HBAR2_2M_EV_NM2):
+    """
+    Знаходить k найнижчих власних станів -kinetic·ψ'' + V·ψ = E·ψ на рівномірній сітці x
+    (ψ = 0 на краях сітки). Гамільтоніан тридіагональний, тому використовуємо
+    eigh_tridiagonal і шукаємо лише потрібні k власних значень - O(N·k) пам'яті.
+    Повертає E (k,) та нормовані ψ (k, N): ∫|ψ|² dx = 1.
+    """
+    x = np.asarray(x, dtype=float)
+    dx = x[1] - x[0]
+    k = int(min(k, x.size))
+
+    diag = 2.0 * kinetic / dx**2 + np.asarray(V, dtype=float)
+    off = np.full(x.size - 1, -kinetic / dx**2)
+
+    E, vecs = eigh_tridiagonal(diag, off, select="i", select_range=(0, k - 1))
+    psi = vecs.T / np.sqrt(dx)
+
+    # Фіксуємо знак: перший помітний пелюсток додатний
+    first_lobe = np.argmax(np.abs(psi) > 0.1 * np.abs(psi).max(axis=1, keepdims=True), axis=1)
+    psi *= np.sign(psi[np.arange(k), first_lobe])[:, None]
+    return E, psi
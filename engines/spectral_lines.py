@@ -0,0 +1,46 @@
+import numpy as np
+import scipy.constants as const
+
+# Назви серій за нижнім рівнем n_f
+SERIES_NAMES = {1: "Лайман", 2: "Бальмер", 3: "Пашен", 4: "Брекет", 5: "Пфунд", 6: "Гемфрі"}
+
+LINE_DTYPE = np.dtype([("n_i", np.uint16), ("n_f", np.uint16), ("wavelength_nm", np.float64)])
+
+
+def hydrogen_line_table(n_max=1000, rydberg=const.Rydberg):
+    """
+    Усі переходи n_i → n_f (1 ≤ n_f < n_i ≤ n_max) атома водню одним векторизованим проходом.
+    Повертає структурований масив LINE_DTYPE, відсортований за довжиною хвилі (нм):
+    саме він слугує індексом для швидких запитів за діапазоном (searchsorted).
+    Для воднеподібного іона із зарядом Z усі λ діляться на Z², тож окрема таблиця не потрібна.
+    """
+    n_f, n_i = np.triu_indices(n_max, k=1)
+    n_f += 1
+    n_i += 1
+    inv_lambda = rydberg * (1.0 / n_f**2 - 1.0 / n_i**2) # м⁻¹
+
+    table = np.empty(n_f.size, dtype=LINE_DTYPE)
+    table["n_i"] = n_i
+    table["n_f"] = n_f
+    table["wavelength_nm"] = 1e9 / inv_lambda
+    table.sort(order="wavelength_nm", kind="stable")
+    return table
+
+
+def lines_in_range(table, lambda_min_nm, lambda_max_nm, Z=1):
+    """
+    Лінії з λ ∈ [lambda_min_nm, lambda_max_nm] для іона із зарядом Z.
+    λ_Z = λ_H / Z², тому межі переводимо в шкалу водню і беремо зріз двома searchsorted -
+    O(log N) замість перебору всієї таблиці. Повертає копію з перерахованими λ.
+    """
+    column = table["wavelength_nm"]
+    start = np.searchsorted(column, lambda_min_nm * Z**2, side="left")
+    stop = np.searchsorted(column, lambda_max_nm * Z**2, side="right")
+    lines = table[start:stop].copy()
+    lines["wavelength_nm"] /= Z**2
+    return lines
+
+
+def series_limit_nm(n_f, Z=1, rydberg=const.Rydberg):
+    """Межа серії (n_i → ∞) у нм."""
+    return 1e9 * n_f**2 / (rydberg * Z**2)
@@ -0,0 +1,104 @@
+import numpy as np
+from scipy.fft import rfft, irfft, rfftfreq
+from scipy.signal import get_window
+
+# Вікна для спектрального аналізу (назви scipy.signal.get_window)
+WINDOWS = {"Без вікна": "boxcar", "Ганна": "hann", "Геммінга": "hamming", "Блекмана": "blackman"}
+
+
+# --- Ряд Фур'є одного періоду ---
+def fourier_coefficients(y, window="boxcar"):
+    """
+    Коефіцієнти ряду f(x) = a₀/2 + Σ (aₙ cos nx + bₙ sin nx) за M відліками одного періоду
+    (x_j = -π + 2πj/M, кінцева точка не входить) через одне rfft.
+    Вікно множиться на сигнал з нормуванням на його середнє, щоб не змінювати амплітуди.
+    Повертає (a, b) довжини M/2 + 1; a[0] - це a₀.
+    """
+    M = y.size
+    w = get_window(window, M, fftbins=True)
+    c = rfft(y * w / w.mean()) / M
+    c *= (-1.0)**np.arange(c.size) # зсув початку відліку з x = 0 до x = -π
+    return 2 * c.real, -2 * c.imag
+
+
+def reconstruct(a, b, n_terms, M):
+    """Часткова сума з гармоніками n ≤ n_terms на тій самій сітці з M точок (обернене rfft)."""
+    c = np.zeros(M // 2 + 1, dtype=complex)
+    c[:n_terms + 1] = 0.5 * (a[:n_terms + 1] - 1j * b[:n_terms + 1]) * M
+    c *= (-1.0)**np.arange(c.size)
+    return irfft(c, n=M)
+
+
+def reconstruction_errors(y, y_rec):
+    """Середньоквадратична, максимальна та відносна (L2) похибки відновлення."""
+    diff = y - y_rec
+    return {
+        "rms": float(np.sqrt(np.mean(diff**2))),
+        "max": float(np.max(np.abs(diff))),
+        "relative": float(np.linalg.norm(diff) / max(np.linalg.norm(y), 1e-300)),
+    }
+
+
+def truncation_error_curve(a, b, M):
+    """
+    Відносна L2-похибка часткової суми для всіх N одразу - за рівністю Парсеваля,
+    без жодного відновлення сигналу: енергія відкинутих гармонік / повна енергія.
+    """
+    energy = 0.5 * (a**2 + b**2)
+    energy[0] = 0.25 * a[0]**2
+    if M % 2 == 0:
+        energy[-1] *= 0.5 # Найквістова гармоніка не має пари
+    tail = energy.sum() - np.cumsum(energy)
+    return np.sqrt(np.clip(tail, 0.0, None) / max(energy.sum(), 1e-300))
+
+
+# --- Записані сигнали довільної довжини ---
+def load_signal(path):
+    """
+    Відкриває сигнал без читання в пам'ять: .npy через np.load(mmap_mode='r'),
+    .bin/.raw/.f32 - як сирий float32 через np.memmap; .csv/.txt - один стовпець (читається повністю).
+    """
+    lower = path.lower()
+    if lower.endswith(".npy"):
+        data = np.load(path, mmap_mode="r")
+    elif lower.endswith((".bin", ".raw", ".f32")):
+        data = np.memmap(path, dtype=np.float32, mode="r")
+    else:
+        data = np.loadtxt(path, delimiter=",", ndmin=1, usecols=0)
+    if data.ndim != 1:
+        data = data.reshape(data.shape[0], -1)[:, 0]
+    return data
+
+
+def welch_spectrum(signal, fs, segment=4096, window="hann", overlap=0.5, block_segments=256):
+    """
+    Усереднена спектральна густина потужності (метод Велча) для сигналу будь-якої довжини.
+    Сигнал (зокрема memmap) читається блоками по block_segments сегментів: у пам'яті одночасно
+    лише один блок, а всі сегменти блоку обробляються одним rfft по осі.
+    Повертає (частоти, PSD, кількість сегментів).
+    """
+    segment = min(segment, signal.size)
+    step = max(1, int(segment * (1 - overlap)))
+    n_segments = 1 + (signal.size - segment) // step
+    w = get_window(window, segment, fftbins=True)
+    scale = 1.0 / (fs * (w**2).sum())
+
+    psd = np.zeros(segment // 2 + 1)
+    for first in range(0, n_segments, block_segments):
+        count = min(block_segments, n_segments - first)
+        start = first * step
+        block = np.asarray(signal[start:start + (count - 1) * step + segment], dtype=np.float64)
+        frames = np.lib.stride_tricks.sliding_window_view(block, segment)[::step][:count]
+        frames = frames - frames.mean(axis=1, keepdims=True)
+        psd += (np.abs(rfft(frames * w, axis=1))**2).sum(axis=0)
+
+    psd *= scale / n_segments
+    psd[1:-1 if segment % 2 == 0 else None] *= 2 # односторонній спектр
+    return rfftfreq(segment, d=1.0 / fs), psd, n_segments
+
+
+def dominant_peaks(freqs, psd, n_peaks=5):
+    """Частоти та потужності n_peaks найсильніших локальних максимумів спектра."""
+    inner = np.flatnonzero((psd[1:-1] > psd[:-2]) & (psd[1:-1] >= psd[2:])) + 1
+    top = inner[np.argsort(psd[inner])[::-1][:n_peaks]]
+    return freqs[top], psd[top]
@@ -0,0 +1,78 @@
+import numpy as np
+import scipy.constants as const
+from scipy.fft import fft, ifft, fftfreq
+
+from engines.schrodinger import HBAR2_2M_EV_NM2
+
+# ħ в еВ·фс: час у фемтосекундах, енергія в еВ, координата в нм
+HBAR_EV_FS = const.hbar / const.e * 1e15
+
+
+def gaussian_packet(x, x0, sigma, k0):
+    """Нормований гауссів пакет з центром x0, шириною σ та хвильовим числом k0 (1/нм)."""
+    psi = np.exp(-(x - x0)**2 / (4 * sigma**2) + 1j * k0 * x)
+    dx = x[1] - x[0]
+    return psi / np.sqrt(np.sum(np.abs(psi)**2) * dx)
+
+
+def absorbing_mask(x, width_fraction=0.1):
+    """
+    Маска cos^(1/8) на краях області: гасить хвилю біля меж,
+    щоб періодичність FFT не "загортала" пакет на інший бік.
+    """
+    mask = np.ones_like(x, dtype=float)
+    n_edge = int(width_fraction * x.size)
+    if n_edge > 0:
+        ramp = np.cos(np.linspace(np.pi / 2, 0.0, n_edge))**0.125
+        mask[:n_edge] = ramp
+        mask[-n_edge:] = ramp[::-1]
+    return mask
+
+
+def split_operator_evolve(x, V, psi0, dt, n_steps, stride=10, absorb=0.0,
+                          kinetic=HBAR2_2M_EV_NM2, hbar=HBAR_EV_FS):
+    """
+    Генератор еволюції iħ∂ψ/∂t = -kinetic·ψ'' + V·ψ методом розщеплення (split-step Fourier).
+    x в нм, V в еВ, dt в фс. Кожні stride кроків видає (t, ψ).
+    Фазові множники рахуються один раз, множення на них виконуються на місці, а FFT з overwrite_x
+    може повторно використати вхідний буфер (scipy.fft не пише в заданий out, тож ψ перев'язується
+    на результат кожного перетворення). Пам'ять не залежить від n_steps.
+    Видане ψ - поточний масив, який наступні кроки змінюють: копіюйте, якщо потрібно.
+    """
+    x = np.asarray(x, dtype=float)
+    dx = x[1] - x[0]
+    k = 2 * np.pi * fftfreq(x.size, d=dx)
+
+    half_v_phase = np.exp(-0.5j * np.asarray(V, dtype=float) * dt / hbar)
+    kinetic_phase = np.exp(-1j * kinetic * k**2 * dt / hbar)
+    if absorb > 0:
+        half_v_phase = half_v_phase * absorbing_mask(x, absorb)
+
+    psi = np.array(psi0, dtype=np.complex128)
+    yield 0.0, psi
+
+    # Схема Странга: e^{-iVdt/2ħ} · e^{-iTdt/ħ} · e^{-iVdt/2ħ}.
+    # План FFT для однакового розміру scipy.fft кешує між викликами.
+    for step in range(1, n_steps + 1):
+        psi *= half_v_phase
+        psi = fft(psi, overwrite_x=True)
+        psi *= kinetic_phase
+        psi = ifft(psi, overwrite_x=True)
+        psi *= half_v_phase
+        if step % stride == 0:
+            yield step * dt, psi
+
+
+def density_frames(x, V, psi0, dt, n_frames, stride, absorb=0.0, plot_stride=1):
+    """
+    Збирає n_frames кадрів |ψ|² (float32) через кожні stride кроків.
+    plot_stride проріджує точки сітки для відображення.
+    Повертає (t (n_frames,), густини (n_frames, N/plot_stride)).
+    """
+    n_steps = (n_frames - 1) * stride
+    times = np.empty(n_frames)
+    frames = np.empty((n_frames, len(x[::plot_stride])), dtype=np.float32)
+    for i, (t, psi) in enumerate(split_operator_evolve(x, V, psi0, dt, n_steps, stride, absorb)):
+        times[i] = t
+        frames[i] = np.abs(psi[::plot_stride])**2
+    return times, frames
@@ -0,0 +1,128 @@
+import numpy as np
+
+from engines.schrodinger import HBAR2_2M_EV_NM2
+
+# Кусково-сталий потенціал задається межами edges (M штук, нм, за зростанням)
+# та значеннями V (M + 1 штук, еВ): V[0] - ліворуч від edges[0], V[-1] - праворуч від edges[-1].
+# У кожній області j: ψ = A_j·e^{ik_j(x - o_j)} + B_j·e^{-ik_j(x - o_j)}, де o_j - ліва межа області
+# (для крайньої лівої o_0 = edges[0]). Локальні координати не дають експонентам переповнитись.
+
+
+def _wavenumbers(E, V, kinetic):
+    """Комплексні k_j = √((E - V_j)/kinetic) для всіх енергій та областей: (nE, M+1)."""
+    k = np.sqrt((np.asarray(E, dtype=float)[:, None] - np.asarray(V, dtype=float)[None, :] + 0j) / kinetic)
+    return np.where(k == 0, 1e-12, k) # E = V_j: уникаємо ділення на нуль
+
+
+def _region_origins(edges):
+    return np.concatenate(([edges[0]], edges))
+
+
+def _step_matrix(k_left, k_right, width):
+    """
+    Елементи матриці S_j для переходу c_{j+1} = S_j · c_j, де c_j = (A_j, B_j):
+    S_j = D(k_{j+1})⁻¹ · D(k_j) · P_j, P_j = diag(e^{ik_j d_j}, e^{-ik_j d_j}).
+    Повертає чотири масиви (s00, s01, s10, s11) - по одному значенню на кожну енергію.
+    """
+    phase = np.exp(1j * k_left * width)
+    r = k_left / k_right
+    return 0.5 * (1 + r) * phase, 0.5 * (1 - r) / phase, 0.5 * (1 - r) * phase, 0.5 * (1 + r) / phase
+
+
+def _layer_widths(edges):
+    return np.concatenate(([0.0], np.diff(edges))) # d_0 = 0 для лівої області
+
+
+def transmission(E, edges, V, kinetic=HBAR2_2M_EV_NM2):
+    """
+    Коефіцієнти проходження T(E) та відбиття R(E) для довільного кусково-сталого потенціалу.
+    Векторизовано за енергією: цикл лише за шарами, а матриці 2×2 перемножуються
+    поелементно для всіх E одразу - пам'ять O(nE), а не O(nE·M).
+    """
+    E = np.atleast_1d(np.asarray(E, dtype=float))
+    edges = np.asarray(edges, dtype=float)
+    k = _wavenumbers(E, V, kinetic)
+    widths = _layer_widths(edges)
+
+    with np.errstate(all="ignore"):
+        m00 = np.ones(E.size, dtype=complex)
+        m11 = np.ones(E.size, dtype=complex)
+        m01 = np.zeros(E.size, dtype=complex)
+        m10 = np.zeros(E.size, dtype=complex)
+        for j in range(edges.size):
+            s00, s01, s10, s11 = _step_matrix(k[:, j], k[:, j + 1], widths[j])
+            m00, m01, m10, m11 = (s00 * m00 + s01 * m10, s00 * m01 + s01 * m11,
+                                  s10 * m00 + s11 * m10, s10 * m01 + s11 * m11)
+
+        # Праворуч лише прохідна хвиля: (A_M, 0) = M·(1, B_0).
+        # A_M = det(M)/m11, а det(S_j) = k_j/k_{j+1}, тож det(M) = k_0/k_M -
+        # без віднімання великих чисел m00·m11 - m01·m10 для товстих бар'єрів.
+        B0 = -m10 / m11
+        AM = (k[:, 0] / k[:, -1]) / m11
+        T = np.abs(AM)**2 * k[:, -1].real / k[:, 0].real
+        R = np.abs(B0)**2
+
+    T = np.nan_to_num(T, nan=0.0, posinf=0.0)
+    R = np.nan_to_num(R, nan=1.0, posinf=1.0)
+    return np.clip(T, 0.0, 1.0), np.clip(R, 0.0, 1.0)
+
+
+def wavefunction(E, edges, V, x, kinetic=HBAR2_2M_EV_NM2):
+    """
+    Точна ψ(x) при енергії E для хвилі одиничної амплітуди, що налітає зліва.
+    Амплітуди (A_j, B_j) кожної області отримуються оберненими матрицями
+    S_j⁻¹ = P_j⁻¹ · D_j⁻¹ · D(k_{j+1}) - без чисельного обертання 2×2.
+    """
+    edges = np.asarray(edges, dtype=float)
+    x = np.asarray(x, dtype=float)
+    k = _wavenumbers([E], V, kinetic)[0]
+    widths = _layer_widths(edges)
+
+    # Ідемо справа наліво від чисто прохідної хвилі (1, 0): так загасаючі розв'язки
+    # всередині бар'єрів зростають у фізичному напрямку і похибка не накопичується.
+    # Амплітуди ростуть як e^{κd} на кожен бар'єр, тому показник множника P_j⁻¹ зсувається на
+    # його максимум, а вже пройдені області перемасштабовуються разом із поточною: справа вони
+    # спадають до 0 (там ψ справді ~√T), а не переповнюються зліва для товстих чи численних бар'єрів.
+    coeffs = np.zeros((len(k), 2), dtype=complex)
+    coeffs[-1] = (1.0, 0.0)
+    with np.errstate(under="ignore"):
+        for j in range(edges.size - 1, -1, -1):
+            r = k[j + 1] / k[j]
+            a, b = coeffs[j + 1]
+            mixed = 0.5 * np.array([(1 + r) * a + (1 - r) * b, (1 - r) * a + (1 + r) * b])
+            growth = np.array([-1j, 1j]) * k[j] * widths[j]
+            shift = growth.real.max()
+            coeffs[j] = mixed * np.exp(growth - shift)
+            scale = np.abs(coeffs[j]).max()
+            coeffs[j] /= scale
+            coeffs[j + 1:] *= np.exp(-shift) / scale
+        coeffs /= coeffs[0, 0] # Амплітуда падаючої хвилі = 1
+
+    region = np.searchsorted(edges, x, side="right")
+    local_x = x - _region_origins(edges)[region]
+    kx = k[region] * local_x
+    # A·e^{ikx} як exp(ln A + ikx): у товстому бар'єрі A ≈ 0 при e^{κx} = inf дає 0, а не NaN
+    with np.errstate(divide="ignore", under="ignore"):
+        log_coeffs = np.log(coeffs)
+        return np.exp(log_coeffs[region, 0] + 1j * kx) + np.exp(log_coeffs[region, 1] - 1j * kx)
+
+
+# --- Типові структури ---
+def barrier_stack(n_barriers, width, gap, V0):
+    """N однакових прямокутних бар'єрів ширини width, розділених ямами ширини gap (надґратка)."""
+    starts = np.arange(n_barriers) * (width + gap)
+    edges = np.column_stack((starts, starts + width)).ravel()
+    V = np.zeros(edges.size + 1)
+    V[1:-1:2] = V0
+    return edges, V
+
+
+def discretize_potential(V_func, a, b, n_slices):
+    """
+    Наближає гладкий потенціал V_func(x) на [a, b] сходинками з n_slices шарів
+    (значення в центрі кожного шару). Поза [a, b] - значення V_func(a) та V_func(b).
+    """
+    edges = np.linspace(a, b, n_slices + 1)
+    mids = 0.5 * (edges[:-1] + edges[1:])
+    V = np.concatenate((V_func(np.array([a])), V_func(mids), V_func(np.array([b]))))
+    return edges, V
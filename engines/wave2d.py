@@ -0,0 +1,122 @@
+import numpy as np
+
+# Поле u зберігається як масив (рядки = y, стовпці = x) - у тому ж порядку, що й z у go.Heatmap.
+
+
+def stable_dt_2d(h, c, courant=0.7):
+    """Крок за часом для 5-точкової схеми: c·dt/h ≤ 1/√2 (courant - частка цієї межі)."""
+    return courant * h / (c * np.sqrt(2.0))
+
+
+def sponge_profile(shape, width, strength):
+    """
+    Коефіцієнт затухання γ(x, y) поглинального шару ширини width вузлів біля всіх країв
+    (квадратичне наростання до strength). Усередині області γ = 0.
+    """
+    ny, nx = shape
+    def ramp(n):
+        d = np.minimum(np.arange(n), np.arange(n)[::-1])
+        return np.clip((width - d) / width, 0.0, None)**2
+    return strength * np.maximum(ramp(ny)[:, None], ramp(nx)[None, :])
+
+
+def slit_mask(shape, wall_col, y, slit_centres, slit_width, thickness=2):
+    """
+    Маска відкритих вузлів (1 - середовище, 0 - стінка): вертикальна перешкода товщиною thickness
+    у стовпцях від wall_col з отворами ширини slit_width з центрами slit_centres (координати y).
+    """
+    mask = np.ones(shape, dtype=np.float32)
+    wall = np.ones(shape[0], dtype=bool)
+    for centre in slit_centres:
+        wall &= np.abs(y - centre) > slit_width / 2
+    mask[wall, wall_col:wall_col + thickness] = 0.0
+    return mask
+
+
+def point_source(iy, ix, amplitude=1.0, omega=1.0):
+    """Точкове гармонічне джерело у вузлі (iy, ix)."""
+    return (np.array([iy]), np.array([ix])), amplitude, omega
+
+
+def line_source(ix, ny, amplitude=1.0, omega=1.0):
+    """
+    Лінійне джерело вздовж стовпця ix - дає плоску хвилю, що біжить уздовж x.
+    Лише внутрішні рядки 1...ny-2: крайові рядки лишаються закріпленими (u = 0).
+    """
+    return (np.arange(1, ny - 1), np.full(ny - 2, ix)), amplitude, omega
+
+
+def leapfrog_2d(u0, u_prev, c, h, dt, n_steps, stride=1, sources=(), damping=None, open_mask=None,
+                ramp_time=0.0):
+    """
+    Генератор розв'язку u_tt + γ·u_t = c²·∇²u з 5-точковим лапласіаном:
+    (1 + γdt/2)·u⁺ = r²·(u_E + u_W + u_N + u_S) + (2 - 4r²)·u - (1 - γdt/2)·u⁻, r = c·dt/h.
+    Краї області закріплені (u = 0); γ > 0 утворює поглинальний шар (sponge_profile).
+    sources - список (індекси, амплітуда, ω): у цих вузлах u = A·sin(ωt), амплітуда плавно
+    наростає за ramp_time. open_mask обнуляє поле в перешкодах після кожного кроку.
+    Три буфери float32 міняються ролями, кожен крок - in-place операції над зрізами.
+    Кожні stride кроків видає (крок, u) - живий буфер.
+    """
+    r2 = np.float32((c * dt / h)**2)
+    prev = np.array(u_prev, dtype=np.float32)
+    cur = np.array(u0, dtype=np.float32)
+    nxt = np.zeros_like(cur)
+    work = np.empty_like(cur[1:-1, 1:-1])
+    centre = np.float32(2.0 - 4.0 * r2)
+    if damping is not None:
+        g = (0.5 * dt * np.asarray(damping, dtype=np.float32))[1:-1, 1:-1]
+        inv_plus = 1.0 / (1.0 + g)
+        minus = 1.0 - g
+    yield 0, cur
+
+    for step in range(1, n_steps + 1):
+        inner = nxt[1:-1, 1:-1]
+        np.add(cur[2:, 1:-1], cur[:-2, 1:-1], out=inner)
+        inner += cur[1:-1, 2:]
+        inner += cur[1:-1, :-2]
+        inner *= r2
+        np.multiply(cur[1:-1, 1:-1], centre, out=work)
+        inner += work
+        if damping is not None:
+            np.multiply(prev[1:-1, 1:-1], minus, out=work)
+            inner -= work
+            inner *= inv_plus
+        else:
+            inner -= prev[1:-1, 1:-1]
+        if open_mask is not None:
+            nxt *= open_mask
+
+        t = step * dt
+        envelope = min(1.0, t / ramp_time) if ramp_time > 0 else 1.0
+        for index, amplitude, omega in sources:
+            nxt[index] = envelope * amplitude * np.sin(omega * t)
+
+        prev, cur, nxt = cur, nxt, prev
+        if step % stride == 0:
+            yield step, cur
+
+
+def wave_frames_2d(u0, u_prev, c, h, dt, n_frames, stride, plot_stride=1, average_from=None, **kwargs):
+    """
+    Кадри поля (n_frames, ny/plot_stride, nx/plot_stride) у float32 через кожні stride кроків
+    (проріджування і в часі, і в просторі) та середня за часом інтенсивність <u²> повного поля,
+    накопичена на кожному кроці, починаючи з кроку average_from (стаціонарна інтерференційна картина;
+    усереднення лише по кадрах могло б збігтися з періодом хвилі).
+    Решта параметрів передається в leapfrog_2d.
+    Повертає (t, кадри, інтенсивність або None).
+    """
+    n_steps = (n_frames - 1) * stride
+    times = np.empty(n_frames)
+    frames = np.empty((n_frames,) + u0[::plot_stride, ::plot_stride].shape, dtype=np.float32)
+    intensity = np.zeros(u0.shape, dtype=np.float32) if average_from is not None else None
+    n_avg = 0
+    for step, u in leapfrog_2d(u0, u_prev, c, h, dt, n_steps, 1, **kwargs):
+        if step % stride == 0:
+            times[step // stride] = step * dt
+            frames[step // stride] = u[::plot_stride, ::plot_stride]
+        if intensity is not None and step >= average_from:
+            intensity += u * u
+            n_avg += 1
+    if intensity is not None:
+        intensity /= max(n_avg, 1)
+    return times, frames, intensity
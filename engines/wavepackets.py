@@ -0,0 +1,60 @@
+import numpy as np
+from scipy.fft import fft, rfft, fftfreq, rfftfreq, fftshift
+
+
+# --- Форми хвильових пакетів (x та параметри в одних одиницях довжини) ---
+def square_packet(x, width):
+    """Прямокутний пакет ширини width з центром у x = 0 (дійсний)."""
+    return (np.abs(x) <= width / 2).astype(x.dtype)
+
+
+def double_gaussian(x, sigma, separation):
+    """Суперпозиція двох гауссів ширини σ з центрами в ±separation/2 (дійсна)."""
+    return (np.exp(-(x - separation / 2)**2 / (4 * sigma**2))
+            + np.exp(-(x + separation / 2)**2 / (4 * sigma**2)))
+
+
+def chirped_gaussian(x, sigma, chirp):
+    """
+    Гаусс з лінійним чирпом: ψ = exp(-x²(1 - i·chirp)/(4σ²)).
+    Δx = σ, але Δk = √(1 + chirp²)/(2σ) - стан не мінімальної невизначеності.
+    """
+    return np.exp(-x**2 * (1 - 1j * chirp) / (4 * sigma**2))
+
+
+def uncertainty_moments(x, psi):
+    """
+    Чисельні Δx та Δk з моментів |ψ(x)|² та |φ(k)|².
+    Для дійсного ψ використовуємо rfft: |φ(-k)| = |φ(k)|, тож достатньо k ≥ 0
+    (вдвічі менше пам'яті та обчислень); інакше - повне комплексне fft.
+    Точність (float32/float64) визначається типом x та psi.
+    Повертає (Δx, Δk, k, |φ(k)|²) з k у зростаючому порядку (для rfft - лише k ≥ 0).
+    """
+    N = x.size
+    dx = x[1] - x[0]
+
+    prob_x = np.abs(psi)**2
+    norm_x = prob_x.sum()
+    mean_x = (x * prob_x).sum() / norm_x
+    delta_x = np.sqrt(((x - mean_x)**2 * prob_x).sum() / norm_x)
+
+    if np.isrealobj(psi):
+        phi = rfft(psi, workers=-1)
+        k = 2 * np.pi * rfftfreq(N, d=dx).astype(x.dtype)
+        prob_k = np.abs(phi)**2
+        # Кожен внутрішній бін відповідає парі ±k; DC (та Найквіст для парного N) - одному
+        weights = np.full(k.size, 2.0, dtype=x.dtype)
+        weights[0] = 1.0
+        if N % 2 == 0:
+            weights[-1] = 1.0
+        norm_k = (weights * prob_k).sum()
+        delta_k = np.sqrt((weights * k**2 * prob_k).sum() / norm_k)
+    else:
+        phi = fftshift(fft(psi, workers=-1))
+        k = 2 * np.pi * fftshift(fftfreq(N, d=dx)).astype(x.dtype)
+        prob_k = np.abs(phi)**2
+        norm_k = prob_k.sum()
+        mean_k = (k * prob_k).sum() / norm_k
+        delta_k = np.sqrt(((k - mean_k)**2 * prob_k).sum() / norm_k)
+
+    return float(delta_x), float(delta_k), k, prob_k
@@ -0,0 +1,103 @@
+import numpy as np
+from scipy.signal import fftconvolve
+
+from engines.lattice import CELLS
+
+CUBIC_KINDS = ("SC", "BCC", "FCC", "DIAMOND")
+
+
+def reflections(h_max):
+    """Усі (h, k, l) з |h|, |k|, |l| ≤ h_max, крім (0, 0, 0): цілочисельний масив (n, 3)."""
+    r = np.arange(-h_max, h_max + 1)
+    hkl = np.stack(np.meshgrid(r, r, r, indexing="ij"), axis=-1).reshape(-1, 3)
+    return hkl[np.any(hkl != 0, axis=1)]
+
+
+def d_spacings(hkl, cell):
+    """d_hkl = 1/√(h²/a² + k²/b² + l²/c²) - для кубічної комірки це a/√(h² + k² + l²)."""
+    return 1.0 / np.sqrt(((hkl / np.asarray(cell, dtype=float))**2).sum(axis=1))
+
+
+def structure_factor(hkl, basis):
+    """F(hkl) = Σ_j exp(2πi·(h·x_j + k·y_j + l·z_j)) для однакових атомів базису (частки комірки)."""
+    return np.exp(2j * np.pi * (hkl @ np.asarray(basis, dtype=float).T)).sum(axis=1)
+
+
+def lorentz_polarization(two_theta_deg):
+    """Множник Лоренца-поляризації для порошку: (1 + cos²2θ) / (sin²θ·cosθ)."""
+    tt = np.deg2rad(two_theta_deg)
+    return (1 + np.cos(tt)**2) / (np.sin(tt / 2)**2 * np.cos(tt / 2))
+
+
+def powder_peaks(kind, a, wavelength, h_max=10, b_factor=0.0):
+    """
+    Лінії порошкової дифрактограми ґратки kind з параметром a (в тих самих одиницях, що й λ).
+    Перебираємо всі (hkl) одним масивом: відбиття з однаковим d у порошку зливаються,
+    тож кратність - просто кількість (hkl) у групі, а інтенсивність - сума |F|² по групі
+    (так коректно враховуються і різні родини з однаковим h² + k² + l², напр. (221) та (300)).
+    I = Σ|F|² · LP(2θ) · exp(-2B·(sinθ/λ)²). Атоми вважаються однаковими, тож ефективний
+    B-фактор описує разом тепловий множник Дебая-Валлера і спад атомного форм-фактора.
+    Повертає словник масивів: two_theta, d, intensity (максимум = 100), multiplicity, hkl.
+    """
+    spec = CELLS[kind]
+    cell = np.asarray(spec["cell"]) * a
+    hkl = reflections(h_max)
+    d = d_spacings(hkl, cell)
+
+    sin_theta = wavelength / (2 * d)
+    allowed = sin_theta < 1.0
+    hkl, d = hkl[allowed], d[allowed]
+    F2 = np.abs(structure_factor(hkl, spec["basis"]))**2
+
+    # Групування за d: 1/d² у відносних одиницях, округлене, щоб прибрати шум float
+    key = np.round((a / d)**2, 8)
+    groups, index, inverse, multiplicity = np.unique(key, return_index=True, return_inverse=True,
+                                                     return_counts=True)
+    F2_sum = np.bincount(inverse, weights=F2)
+
+    # Представник групи - (hkl) з невід'ємними індексами, впорядкованими за спаданням
+    canonical = -np.sort(-np.abs(hkl), axis=1)
+    order = np.lexsort((canonical[:, 2], canonical[:, 1], canonical[:, 0], inverse))
+    last = np.flatnonzero(np.diff(np.concatenate((inverse[order], [groups.size])))) # найбільший у групі
+    hkl_repr = canonical[order][last]
+
+    d_group = d[index]
+    two_theta = 2 * np.rad2deg(np.arcsin(wavelength / (2 * d_group)))
+    intensity = F2_sum * lorentz_polarization(two_theta) * np.exp(-2 * b_factor * (1 / (2 * d_group))**2)
+
+    present = F2_sum > 1e-6 * F2_sum.max(initial=0.0) # систематичні згасання
+    order = np.argsort(two_theta[present])
+    intensity = intensity[present][order]
+    return {
+        "two_theta": two_theta[present][order],
+        "d": d_group[present][order],
+        "intensity": 100 * intensity / intensity.max(initial=1e-300),
+        "multiplicity": multiplicity[present][order],
+        "hkl": hkl_repr[present][order],
+    }
+
+
+def broadened_pattern(two_theta, intensity, grid, fwhm, normalize=False):
+    """
+    Профіль I(2θ) на рівномірній сітці grid: лінії розкладаються у найближчі вузли
+    (лінійна інтерполяція між двома вузлами) і згортаються з гауссом ширини fwhm.
+    normalize=True - максимум профілю 100 (нульовий профіль, коли жодна лінія не потрапила в сітку, лишається нулем).
+    """
+    step = grid[1] - grid[0]
+    pos = (two_theta - grid[0]) / step
+    inside = (pos >= 0) & (pos < grid.size - 1)
+    pos, weight = pos[inside], intensity[inside]
+    left = np.floor(pos).astype(int)
+    frac = pos - left
+    sticks = (np.bincount(left, weights=weight * (1 - frac), minlength=grid.size)
+              + np.bincount(left + 1, weights=weight * frac, minlength=grid.size))
+
+    sigma = fwhm / (2 * np.sqrt(2 * np.log(2))) / step
+    half = int(np.ceil(5 * sigma))
+    kernel = np.exp(-0.5 * (np.arange(-half, half + 1) / sigma)**2)
+    kernel /= kernel.sum()
+    profile = fftconvolve(sticks, kernel, mode="same")
+    if normalize:
+        peak = profile.max()
+        profile = profile / peak * 100 if peak > 0 else np.zeros_like(profile)
+    return profile
@@ -1,7 +1,60 @@
+import os
+import shutil
+import tempfile
+
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
-from scipy.signal import square, sawtooth
+from scipy.special import sici
+
+from engines.expressions import evaluate_expression
+from engines.spectrum import (WINDOWS, fourier_coefficients, reconstruct, reconstruction_errors,
+                              truncation_error_curve, load_signal, welch_spectrum, dominant_peaks)
+from engines.animation import add_animation_controls, make_frames
+from engines.fourier import (series_coefficients, ideal_wave, partial_sums, synthesize_ifft, gibbs_overshoot,
+                            interpolated_max)
+
+WAVE_KEYS = {"Квадратна (меандр)": "square", "Пилкоподібна": "sawtooth"}
+
+
+@st.cache_data(ttl=3600)
+def get_partial_sums(wave, n_terms, n_points):
+    x = np.linspace(-2 * np.pi, 2 * np.pi, n_points)
+    n, b = series_coefficients(wave, n_terms)
+    return x, partial_sums(x, n, b, dtype=np.float32)
+
+
+@st.cache_data(ttl=3600)
+def get_gibbs_curve(wave, n_max):
+    n_values = np.unique(np.geomspace(1, n_max, 60).round().astype(int))
+    return n_values, gibbs_overshoot(wave, n_values)
+
+
+@st.cache_data(ttl=3600, max_entries=5)
+def analyse_signal_file(_uploaded, file_id, fs, segment, window):
+    """
+    Кешується за file_id завантаження (сам файл - аргумент з '_', його байти не хешуються).
+    Файл копіюється на диск частинами і відкривається як memmap: спектр рахується блоками.
+    """
+    extension = os.path.splitext(_uploaded.name)[1].lower()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "signal" + extension)
+        _uploaded.seek(0)
+        with open(path, "wb") as f:
+            shutil.copyfileobj(_uploaded, f)
+        signal = load_signal(path)
+        freqs, psd, n_segments = welch_spectrum(signal, fs, segment, window)
+        preview = np.array(signal[:min(signal.size, 5000)], dtype=float)
+        n_samples = signal.size
+        del signal # закриваємо memmap до видалення файлу
+    return freqs, psd, n_segments, preview, n_samples
+
+
+@st.cache_data(ttl=3600)
+def get_ifft_synthesis(wave, n_terms):
+    n, b = series_coefficients(wave, n_terms)
+    n_points = 1 << int(np.ceil(np.log2(16 * n[-1]))) # степінь двійки; ~16 точок на період найвищої гармоніки
+    return synthesize_ifft(n, b, n_points)
 
 with st.container(border=True):
     st.title("🧮 Синтез Фур'є (Побудова Хвилі)")
@@ -45,25 +98,14 @@ with st.container(border=True):
     
     # Створюємо сітку
     x = np.linspace(-2 * np.pi, 2 * np.pi, 2000)
-    y_sum = np.zeros_like(x)
-    
-    if wave_type == "Квадратна (меандр)":
-        # Ідеальна хвиля для порівняння
-        y_ideal = (4/np.pi) * square(x)
-        
-        # Рахуємо суму N гармонік
-        for n_odd in range(1, N_harmonics * 2, 2): # 1, 3, 5...
-            term = (4 / np.pi) * (np.sin(n_odd * x) / n_odd)
-            y_sum += term
-            
-    elif wave_type == "Пилкоподібна":
-        # Ідеальна хвиля для порівняння
-        y_ideal = (2/np.pi) * sawtooth(x + np.pi) # +pi, щоб зсунути
-        
-        # Рахуємо суму N гармонік
-        for n in range(1, N_harmonics + 1):
-            term = (2 / np.pi) * ((-1)**(n+1)) * (np.sin(n * x) / n)
-            y_sum += term
+    wave_key = WAVE_KEYS[wave_type]
+
+    # Ідеальна хвиля для порівняння (саме до неї збігається ряд: амплітуда ±1)
+    y_ideal = ideal_wave(wave_key, x)
+
+    # Сума N гармонік: одна матриця (гармоніки × точки) замість циклу
+    n_terms, b_terms = series_coefficients(wave_key, N_harmonics)
+    y_sum = b_terms @ np.sin(np.outer(n_terms, x))
 
     # --- Графік ---
     st.header(f"Побудова хвилі з N = {N_harmonics} гармонік")
@@ -96,4 +138,159 @@ with st.container(border=True):
                    ticktext=['-2π', '-π', '0', 'π', '2π']),
         height=500
     )
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.divider()
+
+    # --- АНІМАЦІЯ ЗБІЖНОСТІ ---
+    st.header("🎞️ Збіжність ряду: анімація за N")
+    st.write("Усі часткові суми $S_1 ... S_N$ обчислюються одразу як кумулятивна сума матриці "
+             "(гармоніки × точки), а кадри відтворюються в браузері.")
+    N_anim = st.slider("Максимальна кількість гармонік в анімації", 10, 300, 100, 10, key="fourier_anim_n")
+
+    x_anim, sums_anim = get_partial_sums(wave_key, N_anim, 1000)
+    labels_anim = [str(n) for n in range(1, N_anim + 1)]
+
+    fig_anim = go.Figure()
+    fig_anim.add_trace(go.Scatter(x=x_anim, y=sums_anim[0], mode='lines', name='Сума Фур\'є',
+                                  line=dict(color='red', width=3)))
+    fig_anim.add_trace(go.Scatter(x=x_anim, y=ideal_wave(wave_key, x_anim), mode='lines', name='Ідеальна хвиля',
+                                  line=dict(color='gray', width=2, dash='dot')))
+    fig_anim.update_layout(xaxis_title="x (радіани)", yaxis_title="Амплітуда f(x)", yaxis_range=[-1.5, 1.5],
+                           height=500)
+    add_animation_controls(fig_anim, make_frames(sums_anim, labels_anim), labels_anim,
+                           frame_duration=80, label_prefix="N = ")
+    st.plotly_chart(fig_anim, use_container_width=True)
+
+    # --- ЯВИЩЕ ГІББСА ---
+    st.header("📐 Перерегулювання Гіббса")
+    st.write("Максимум часткової суми біля розриву не прямує до значення функції: перерегулювання "
+             "наближається до ≈ 8.95% від величини стрибка, лише зсуваючись ближче до розриву.")
+    n_gibbs, overshoot = get_gibbs_curve(wave_key, 2000)
+    gibbs_limit = 0.5 * (2 / np.pi * sici(np.pi)[0] - 1) # (2/π)·Si(π) - 1, поділене на стрибок 2
+
+    fig_gibbs = go.Figure()
+    fig_gibbs.add_trace(go.Scatter(x=n_gibbs, y=overshoot * 100, mode='lines+markers', name='Перерегулювання'))
+    fig_gibbs.add_hline(y=gibbs_limit * 100, line_dash="dash", line_color="red",
+                        annotation_text=f"Границя {gibbs_limit * 100:.2f}%")
+    fig_gibbs.update_layout(xaxis_type="log", xaxis_title="Кількість гармонік N",
+                            yaxis_title="Перерегулювання, % стрибка", height=400)
+    st.plotly_chart(fig_gibbs, use_container_width=True)
+
+    # --- СИНТЕЗ ЧЕРЕЗ ОБЕРНЕНЕ FFT ---
+    st.header("⚡ Синтез великої кількості гармонік (обернене FFT)")
+    st.write("Пряма сума коштує $O(N \\cdot M)$ операцій. Якщо покласти коефіцієнти $b_n$ у спектр і виконати одне "
+             "обернене `rfft`, сигнал на $M$ точках отримується за $O(M \\log M)$ - навіть для $N = 10^5$.")
+    N_fft = st.select_slider("Кількість гармонік (N)", options=[10**p for p in range(2, 6)], value=10**4,
+                             format_func=lambda v: f"{v:.0e}", key="fourier_fft_n")
+    x_fft, y_fft = get_ifft_synthesis(wave_key, N_fft)
+
+    # Показуємо околицю розриву: на весь період точок забагато для браузера
+    jump = 0.0 if wave_key == "square" else np.pi
+    window = np.abs(x_fft - jump) < 40 * np.pi / (2 * N_fft)
+    fig_fft = go.Figure()
+    fig_fft.add_trace(go.Scatter(x=x_fft[window], y=y_fft[window], mode='lines', name=f'N = {N_fft}',
+                                 line=dict(color='red')))
+    fig_fft.add_trace(go.Scatter(x=x_fft[window], y=ideal_wave(wave_key, x_fft[window]), mode='lines',
+                                 name='Ідеальна хвиля', line=dict(color='gray', dash='dot')))
+    fig_fft.update_layout(xaxis_title="x (радіани), околиця розриву", yaxis_title="Амплітуда f(x)", height=400)
+    st.plotly_chart(fig_fft, use_container_width=True)
+    col_f1, col_f2 = st.columns(2)
+    col_f1.metric("Точок сітки M", f"{x_fft.size:,}".replace(",", " "))
+    col_f2.metric("Перерегулювання", f"{(interpolated_max(y_fft) - 1) / 2 * 100:.3f} %")
+
+    st.divider()
+
+    # --- АНАЛІЗ ДОВІЛЬНОГО СИГНАЛУ ---
+    st.header("🔬 Аналіз довільного сигналу")
+    tab_expr, tab_file = st.tabs(["Вираз f(x) на періоді", "Файл із записом сигналу"])
+
+    with tab_expr:
+        st.write("Коефіцієнти $a_n, b_n$ будь-якої функції на періоді $[-\\pi, \\pi)$ обчислюються одним `rfft` "
+                 "за відліками. Дозволені функції: sin, cos, exp, abs, sign, where, ... та змінна x.")
+        col_e1, col_e2 = st.columns([2, 1])
+        expr = col_e1.text_input("f(x) =", value="where(abs(x) < pi/2, 1 - abs(x), 0)", key="fourier_expr")
+        window_expr = col_e2.selectbox("Вікно", list(WINDOWS), key="fourier_expr_window",
+                                       help="Для періодичної функції вікно не потрібне; воно лише демонструє його вплив на коефіцієнти.")
+        N_expr = st.slider("Гармонік у відновленні (N)", 1, 200, 10, key="fourier_expr_n")
+
+        M_expr = 4096
+        x_expr = -np.pi + 2 * np.pi * np.arange(M_expr) / M_expr
+        try:
+            y_expr = np.real(evaluate_expression(expr, x=x_expr)).astype(float)
+            if not np.all(np.isfinite(y_expr)):
+                raise ValueError("Функція має нескінченні або невизначені значення на періоді")
+        except ValueError as err:
+            st.error(str(err))
+        else:
+            a_expr, b_expr = fourier_coefficients(y_expr, WINDOWS[window_expr])
+            y_rec = reconstruct(a_expr, b_expr, N_expr, M_expr)
+            errors = reconstruction_errors(y_expr, y_rec)
+
+            col_m1, col_m2, col_m3 = st.columns(3)
+            col_m1.metric("Похибка RMS", f"{errors['rms']:.3e}")
+            col_m2.metric("Максимальна похибка", f"{errors['max']:.3e}")
+            col_m3.metric("Відносна похибка (L2)", f"{errors['relative'] * 100:.3f} %")
+
+            fig_expr = go.Figure()
+            fig_expr.add_trace(go.Scatter(x=x_expr, y=y_expr, mode='lines', name='f(x)',
+                                          line=dict(color='gray', width=2, dash='dot')))
+            fig_expr.add_trace(go.Scatter(x=x_expr, y=y_rec, mode='lines', name=f'Сума N={N_expr} гармонік',
+                                          line=dict(color='red', width=3)))
+            fig_expr.update_layout(xaxis_title="x (радіани)", yaxis_title="f(x)", height=400)
+            st.plotly_chart(fig_expr, use_container_width=True)
+
+            col_s1, col_s2 = st.columns(2)
+            with col_s1:
+                n_show = np.arange(0, 41)
+                fig_coef = go.Figure()
+                fig_coef.add_trace(go.Bar(x=n_show, y=a_expr[n_show], name='aₙ'))
+                fig_coef.add_trace(go.Bar(x=n_show, y=b_expr[n_show], name='bₙ'))
+                fig_coef.update_layout(title="Коефіцієнти ряду", xaxis_title="n", barmode='group', height=350)
+                st.plotly_chart(fig_coef, use_container_width=True)
+            with col_s2:
+                err_curve = truncation_error_curve(a_expr, b_expr, M_expr)
+                fig_err = go.Figure()
+                fig_err.add_trace(go.Scatter(x=np.arange(1, 201), y=err_curve[1:201], mode='lines',
+                                             name='Відносна похибка'))
+                fig_err.update_layout(title="Похибка часткової суми (Парсеваль)", xaxis_title="N",
+                                      xaxis_type="log", yaxis_type="log", height=350)
+                st.plotly_chart(fig_err, use_container_width=True)
+
+    with tab_file:
+        st.write("Підтримуються `.npy` та сирі `.bin`/`.raw`/`.f32` (float32) - файл копіюється на диск частинами "
+                 "і відкривається як memory-map, а спектр рахується блоками сегментів, без перетворення всього сигналу; "
+                 "а також `.csv`/`.txt` з одним стовпцем. Спектр - усереднена за сегментами густина потужності (метод Велча).")
+        uploaded_signal = st.file_uploader("Файл сигналу", type=["npy", "bin", "raw", "f32", "csv", "txt"],
+                                           key="fourier_file")
+        col_w1, col_w2, col_w3 = st.columns(3)
+        fs_file = col_w1.number_input("Частота дискретизації, Гц", min_value=1.0, value=44100.0, key="fourier_fs")
+        segment_file = col_w2.select_slider("Довжина сегмента", options=[2**p for p in range(8, 17)], value=4096,
+                                            key="fourier_segment")
+        window_file = col_w3.selectbox("Вікно", list(WINDOWS), index=1, key="fourier_file_window")
+
+        if uploaded_signal is not None:
+            try:
+                freqs, psd, n_seg, preview, n_samples = analyse_signal_file(
+                    uploaded_signal, uploaded_signal.file_id, fs_file, segment_file, WINDOWS[window_file])
+            except ValueError as err:
+                st.error(f"Не вдалося прочитати сигнал: {err}")
+            else:
+                col_i1, col_i2, col_i3 = st.columns(3)
+                col_i1.metric("Відліків", f"{n_samples:,}".replace(",", " "))
+                col_i2.metric("Тривалість", f"{n_samples / fs_file:.3f} с")
+                col_i3.metric("Сегментів усереднено", n_seg)
+
+                fig_psd = go.Figure()
+                fig_psd.add_trace(go.Scatter(x=freqs, y=psd, mode='lines', name='PSD'))
+                fig_psd.update_layout(xaxis_title="Частота, Гц", yaxis_title="Густина потужності, од.²/Гц",
+                                      yaxis_type="log", height=400)
+                st.plotly_chart(fig_psd, use_container_width=True)
+
+                peak_f, peak_p = dominant_peaks(freqs, psd)
+                st.dataframe({"Частота, Гц": np.round(peak_f, 3), "PSD": peak_p}, use_container_width=True)
+
+                fig_prev = go.Figure()
+                fig_prev.add_trace(go.Scatter(x=np.arange(preview.size) / fs_file, y=preview, mode='lines'))
+                fig_prev.update_layout(title=f"Перші {preview.size} відліків", xaxis_title="t, с", height=300)
+                st.plotly_chart(fig_prev, use_container_width=True)
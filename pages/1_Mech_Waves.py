@@ -2,6 +2,67 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 
+from engines.animation import frame_indices, add_animation_controls, make_multi_frames, make_frames
+from engines.wave_equation import stable_dt, gaussian_pulse, wave_frames_1d
+from engines.wave2d import stable_dt_2d, sponge_profile, slit_mask, point_source, line_source, wave_frames_2d
+
+TANK_MODES = ["Два точкові джерела", "Плоска хвиля і дві щілини", "Плоска хвиля і одна щілина",
+              "Мембрана із закріпленими краями"]
+
+BOUNDARY_NAMES = {"Закріплений": "fixed", "Вільний": "free", "Поглинальний": "absorbing"}
+
+
+@st.cache_data(ttl=3600, max_entries=10)
+def simulate_string(n_points, c1, c2, interface, width, direction, left, right, t_max, n_frames):
+    L = 10.0
+    x = np.linspace(0, L, n_points)
+    dx = x[1] - x[0]
+    c = np.where(x < interface, c1, c2)
+    dt = stable_dt(dx, max(c1, c2))
+    stride = max(1, int(np.ceil(t_max / dt / (n_frames - 1))))
+    u0, u_prev = gaussian_pulse(x, 0.25 * L, width, c1, dt, direction)
+    plot_stride = max(1, n_points // 1000)
+    times, frames, u_end = wave_frames_1d(u0, u_prev, c, dx, dt, n_frames, stride, left, right, plot_stride)
+    return x, x[::plot_stride], times, frames, u_end
+
+
+@st.cache_data(ttl=3600, max_entries=10)
+def simulate_tank(mode, size, ppw, d, slit_width, duration, n_frames):
+    # Одиниці: довжина хвилі λ = 1, швидкість c = 1 (період теж 1); size - розмір області в λ
+    h = 1.0 / ppw
+    dt = stable_dt_2d(h, 1.0)
+    n = int(round(size / h)) + 1
+    x = np.arange(n) * h
+    y = x - size / 2
+    omega = 2 * np.pi
+    zeros = np.zeros((n, n))
+    kwargs = dict(damping=sponge_profile((n, n), 3 * ppw, 4.0), ramp_time=2.0)
+    u0, wall_col = zeros, None
+
+    if mode == "Два точкові джерела":
+        half = int(round(d / 2 / h))
+        kwargs["sources"] = [point_source(n // 2 - half, n // 4, 1.0, omega),
+                             point_source(n // 2 + half, n // 4, 1.0, omega)]
+    elif mode == "Мембрана із закріпленими краями":
+        # Защипнута мембрана: гауссів горбик поза центром, краї u = 0, без затухання і джерел
+        X, Y = np.meshgrid(x, y)
+        u0 = np.exp(-((X - 0.3 * size)**2 + (Y - 0.1 * size)**2) / (2 * (0.05 * size)**2))
+        kwargs = {}
+    else:
+        wall_col = int(round(0.25 * size / h))
+        centres = [-d / 2, d / 2] if mode == "Плоска хвиля і дві щілини" else [0.0]
+        kwargs["open_mask"] = slit_mask((n, n), wall_col, y, centres, slit_width)
+        kwargs["sources"] = [line_source(3 * ppw + 2, n, 1.0, omega)]
+
+    n_steps = int(duration / dt)
+    stride = max(1, n_steps // (n_frames - 1))
+    plot_stride = max(1, n // 150)
+    average_from = int(0.5 * n_steps) if wall_col is not None else None
+    times, frames, intensity = wave_frames_2d(u0, u0, 1.0, h, dt, n_frames, stride, plot_stride,
+                                              average_from, **kwargs)
+    wall = None if wall_col is None else kwargs["open_mask"][::plot_stride, ::plot_stride] == 0
+    return x, y, x[::plot_stride], y[::plot_stride], times, frames, intensity, wall, wall_col, h
+
 with st.container(border=True):
     st.title("🌊 Суперпозиція хвиль")
     st.write("Демонструє, як дві біжучі хвилі додаються, створюючи інтерференційну картину.")
@@ -41,14 +102,22 @@ with st.container(border=True):
     L = 10.0
     x = np.linspace(0, L, 500)
     
-    # Слайдер часу (вже був на головній сторінці, просто додано key=)
-    t = st.slider("Час (t)", 0.0, 10.0, 0.0, 0.1, key="wave_t")
+    mode = st.radio("Режим відображення", ["Слайдер часу", "▶ Анімація в браузері"], horizontal=True, key="wave_mode",
+                    help="В анімації всі кадри обчислюються одразу і відтворюються без перезапуску сторінки.")
 
     def wave_function(x, t, A, lambda_val, v):
         k = 2 * np.pi / lambda_val
         omega = k * v
         return A * np.sin(k * x - omega * t)
 
+    if mode == "Слайдер часу":
+        # Слайдер часу (вже був на головній сторінці, просто додано key=)
+        t = st.slider("Час (t)", 0.0, 10.0, 0.0, 0.1, key="wave_t")
+    else:
+        t_max = st.slider("Тривалість анімації (t макс)", 1.0, 20.0, 10.0, 0.5, key="wave_anim_tmax")
+        n_frames = st.slider("Кількість кадрів", 20, 400, 200, 10, key="wave_anim_frames")
+        t = 0.0
+
     y1 = wave_function(x, t, A1, lambda1, v1)
     y2 = wave_function(x, t, A2, lambda2, v2)
     y_sum = y1 + y2
@@ -81,5 +150,142 @@ with st.container(border=True):
         yaxis=dict(range=[-max(1, (A1+A2)*1.2), max(1, (A1+A2)*1.2)]),
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
     )
+
+    if mode != "Слайдер часу":
+        # Усі кадри одним broadcast: (кадри, 1) × (1, 500) -> (кадри × 500), у float32 для браузера
+        t_frames = np.linspace(0, t_max, n_frames)
+        y1_frames = wave_function(x[None, :], t_frames[:, None], A1, lambda1, v1).astype(np.float32)
+        y2_frames = wave_function(x[None, :], t_frames[:, None], A2, lambda2, v2).astype(np.float32)
+        idx = frame_indices(n_frames, 3 * y1_frames[0].nbytes)
+        digits = max(2, int(np.ceil(-np.log10(np.diff(t_frames[idx]).min())))) if len(idx) > 1 else 2
+        labels = [f"{tt:.{digits}f}" for tt in t_frames[idx]]
+        frames = make_multi_frames([y1_frames[idx] + y2_frames[idx], y1_frames[idx], y2_frames[idx]], labels)
+        add_animation_controls(fig, frames, labels, frame_duration=40)
+        fig.update_layout(title="Інтерференція хвиль (анімація)")
+
     st.plotly_chart(fig, use_container_width=True)
-    st.info("Спробуйте погратися зі слайдером 'Час (t)', щоб побачити рух хвиль, або змініть параметри, щоб побачити стоячі хвилі (v₁ = -v₂ та λ₁ = λ₂).")
\ No newline at end of file
+    st.info("Спробуйте погратися зі слайдером 'Час (t)' або увімкніть анімацію, щоб побачити рух хвиль, або змініть параметри, щоб побачити стоячі хвилі (v₁ = -v₂ та λ₁ = λ₂).")
+
+    st.divider()
+
+    # --- ЧИСЕЛЬНЕ ХВИЛЬОВЕ РІВНЯННЯ ---
+    st.header("🎻 Чисельний розв'язок хвильового рівняння")
+    st.write("Імпульс на струні з двох частин із різними швидкостями хвилі $c_1$ та $c_2$. "
+             "Рівняння $u_{tt} = c(x)^2 u_{xx}$ розв'язується скінченними різницями (схема «чехарда»). "
+             "На межі середовищ імпульс частково відбивається і частково проходить, а кінці струни можуть бути "
+             "закріпленими, вільними або поглинальними.")
+    with st.expander("📖 Теорія: відбиття та проходження", expanded=False):
+        st.latex(r"u_i^{n+1} = 2u_i^n - u_i^{n-1} + \left(\frac{c\,\Delta t}{\Delta x}\right)^2 \left(u_{i+1}^n - 2u_i^n + u_{i-1}^n\right), \quad \frac{c\,\Delta t}{\Delta x} \le 1")
+        st.latex(r"r = \frac{c_2 - c_1}{c_1 + c_2}, \qquad \tau = \frac{2 c_2}{c_1 + c_2}")
+        st.write("Закріплений кінець перевертає імпульс, вільний - відбиває без зміни знака, "
+                 "поглинальний (умова Мура) випускає хвилю назовні.")
+
+    col_n1, col_n2, col_n3 = st.columns(3)
+    c1_fd = col_n1.slider("Швидкість c₁ (ліва частина)", 0.1, 3.0, 1.0, 0.1, key="wave_fd_c1")
+    c2_fd = col_n2.slider("Швидкість c₂ (права частина)", 0.1, 3.0, 0.5, 0.1, key="wave_fd_c2")
+    interface_fd = col_n3.slider("Межа середовищ x", 3.0, 10.0, 5.0, 0.5, key="wave_fd_interface",
+                                 help="x = 10 - однорідна струна")
+    col_n4, col_n5, col_n6 = st.columns(3)
+    left_fd = col_n4.selectbox("Лівий кінець", list(BOUNDARY_NAMES), key="wave_fd_left")
+    right_fd = col_n5.selectbox("Правий кінець", list(BOUNDARY_NAMES), index=2, key="wave_fd_right")
+    direction_fd = col_n6.selectbox("Початковий імпульс", ["Біжить вправо", "Нерухомий (розпадається надвоє)"],
+                                    key="wave_fd_dir")
+    col_n7, col_n8, col_n9 = st.columns(3)
+    points_fd = col_n7.select_slider("Вузлів сітки", options=[1000, 2000, 5000, 10000, 20000],
+                                     value=2000, key="wave_fd_points",
+                                     help="Кількість кроків за часом зростає разом із кількістю вузлів (умова Куранта).")
+    t_max_fd = col_n8.slider("Час моделювання", 1.0, 40.0, 6.0, 0.5, key="wave_fd_tmax")
+    frames_fd = col_n9.slider("Кадрів анімації", 20, 300, 120, 10, key="wave_fd_frames")
+
+    x_fd, x_plot_fd, t_fd, frames_u, u_end = simulate_string(
+        points_fd, c1_fd, c2_fd, interface_fd, 0.2, 1 if direction_fd == "Біжить вправо" else 0,
+        BOUNDARY_NAMES[left_fd], BOUNDARY_NAMES[right_fd], t_max_fd, frames_fd)
+
+    idx_fd = frame_indices(len(t_fd), frames_u[0].nbytes)
+    # Знаків після коми вистачає, щоб підписи сусідніх кадрів різнилися
+    digits_fd = max(2, int(np.ceil(-np.log10(np.diff(t_fd[idx_fd]).min())))) if len(idx_fd) > 1 else 2
+    labels_fd = [f"{tt:.{digits_fd}f}" for tt in t_fd[idx_fd]]
+    fig_fd = go.Figure()
+    fig_fd.add_trace(go.Scatter(x=x_plot_fd, y=frames_u[0], mode='lines', name='u(x, t)',
+                                line=dict(color='black', width=3)))
+    fig_fd.add_vrect(x0=min(interface_fd, 10.0), x1=10.0, fillcolor="orange", opacity=0.15, line_width=0,
+                     annotation_text=f"c₂ = {c2_fd}")
+    fig_fd.update_layout(xaxis_title="Позиція (x), м", yaxis_title="Зміщення u", yaxis_range=[-1.2, 1.2],
+                         xaxis_range=[0, 10], height=450)
+    add_animation_controls(fig_fd, make_frames(frames_u[idx_fd], labels_fd), labels_fd, frame_duration=40)
+    st.plotly_chart(fig_fd, use_container_width=True)
+
+    # Порівняння з теорією: у момент t_max відбитий імпульс ліворуч від межі, прохідний - праворуч
+    if interface_fd < 10.0 and direction_fd == "Біжить вправо":
+        left_part = u_end[x_fd < interface_fd]
+        right_part = u_end[x_fd >= interface_fd]
+        r_num = left_part[np.argmax(np.abs(left_part))]
+        tau_num = right_part[np.argmax(np.abs(right_part))]
+        col_t1, col_t2 = st.columns(2)
+        col_t1.metric("Відбиття r (чисельно)", f"{r_num:.3f}", help="Амплітуда в кінці моделювання ліворуч від межі")
+        col_t1.metric("Відбиття r (теорія)", f"{(c2_fd - c1_fd) / (c1_fd + c2_fd):.3f}")
+        col_t2.metric("Проходження τ (чисельно)", f"{tau_num:.3f}", help="Амплітуда в кінці моделювання праворуч від межі")
+        col_t2.metric("Проходження τ (теорія)", f"{2 * c2_fd / (c1_fd + c2_fd):.3f}")
+        st.caption("Чисельні значення збігаються з теорією, поки обидва імпульси вже відокремились від межі, "
+                   "але ще не дійшли до кінців струни.")
+
+    st.divider()
+
+    # --- 2D ХВИЛЬОВЕ РІВНЯННЯ: МЕМБРАНА ТА ХВИЛЬОВА ВАННА ---
+    st.header("🌀 Хвильова ванна та коливання мембрани (2D)")
+    st.write("Двовимірне хвильове рівняння $u_{tt} = c^2 (u_{xx} + u_{yy})$ розв'язується на сітці з 5-точковим "
+             "лапласіаном. Біля країв ванни - поглинальний шар, тож хвилі не відбиваються. "
+             "Інтерференція двох щілин тут не підставляється формулою, а виникає з самої симуляції. "
+             "Усі довжини - в одиницях довжини хвилі λ.")
+
+    col_w1, col_w2 = st.columns(2)
+    tank_mode = col_w1.selectbox("Сценарій", TANK_MODES, index=1, key="tank_mode")
+    tank_size = col_w2.slider("Розмір області, λ", 10, 40, 24, 2, key="tank_size")
+    col_w3, col_w4, col_w5 = st.columns(3)
+    tank_d = col_w3.slider("Відстань між джерелами / щілинами d, λ", 1.0, 8.0, 3.0, 0.5, key="tank_d")
+    tank_w = col_w4.slider("Ширина щілини, λ", 0.25, 3.0, 0.5, 0.25, key="tank_w")
+    tank_ppw = col_w5.select_slider("Вузлів на довжину хвилі", options=[6, 8, 10, 12], value=8, key="tank_ppw",
+                                    help="Більше вузлів - менша чисельна дисперсія, але довший розрахунок.")
+    tank_frames = st.slider("Кадрів анімації", 20, 200, 80, 10, key="tank_frames")
+
+    tank_duration = 2.0 * tank_size # час, за який хвиля двічі перетинає область (c = 1)
+    (x_t, y_t, x_tp, y_tp, t_tank, frames_tank, intensity_tank,
+     wall_tank, wall_col, h_tank) = simulate_tank(tank_mode, tank_size, tank_ppw, tank_d, tank_w,
+                                                  tank_duration, tank_frames)
+
+    idx_tank = frame_indices(len(t_tank), frames_tank[0].nbytes)
+    labels_tank = [f"{tt:.1f}" for tt in t_tank[idx_tank]]
+    z_lim = float(np.percentile(np.abs(frames_tank[idx_tank[-1]]), 99.5)) or 1.0
+    fig_tank = go.Figure(data=go.Heatmap(x=x_tp, y=y_tp, z=frames_tank[0], zmin=-z_lim, zmax=z_lim,
+                                         colorscale='RdBu', colorbar=dict(title="u")))
+    if wall_tank is not None:
+        wy, wx = np.nonzero(wall_tank)
+        fig_tank.add_trace(go.Scatter(x=x_tp[wx], y=y_tp[wy], mode='markers', marker=dict(color='black', size=3),
+                                      name='Перешкода', showlegend=False))
+    add_animation_controls(fig_tank, make_frames(frames_tank[idx_tank], labels_tank, trace_type=go.Heatmap,
+                                                 trace_key="z"), labels_tank, frame_duration=60,
+                           label_prefix="t (періоди) = ")
+    fig_tank.update_layout(xaxis_title="x, λ", yaxis_title="y, λ", yaxis=dict(scaleanchor="x"), height=650)
+    st.plotly_chart(fig_tank, use_container_width=True)
+
+    if intensity_tank is not None:
+        # Екран біля правого краю (перед поглинальним шаром): порівняння з формулою Фраунгофера
+        screen_col = len(x_t) - 1 - 4 * tank_ppw
+        L_screen = (screen_col - wall_col) * h_tank
+        profile = intensity_tank[:, screen_col]
+        inside = np.abs(y_t) < 0.5 * tank_size - 3
+        sin_theta = y_t / np.hypot(y_t, L_screen)
+        theory = np.sinc(tank_w * sin_theta)**2 # np.sinc(z) = sin(πz)/(πz)
+        if tank_mode == "Плоска хвиля і дві щілини":
+            theory = theory * np.cos(np.pi * tank_d * sin_theta)**2
+
+        fig_screen = go.Figure()
+        fig_screen.add_trace(go.Scatter(x=y_t[inside], y=profile[inside] / profile[inside].max(), mode='lines',
+                                        name='Симуляція ⟨u²⟩', line=dict(color='royalblue', width=3)))
+        fig_screen.add_trace(go.Scatter(x=y_t[inside], y=theory[inside], mode='lines', name='Формула Фраунгофера',
+                                        line=dict(color='red', dash='dot')))
+        fig_screen.update_layout(title=f"Середня інтенсивність на «екрані» (L = {L_screen:.1f} λ від щілин)",
+                                 xaxis_title="y, λ", yaxis_title="I / I_max", height=400)
+        st.plotly_chart(fig_screen, use_container_width=True)
+        st.caption("Формула справедлива в дальній зоні (L ≫ d²/λ); на малій відстані та за малої кількості вузлів "
+                   "на довжину хвилі смуги трохи зміщуються.")
@@ -1,6 +1,17 @@
 import streamlit as st
 import numpy as np
 import scipy.constants as const
+import plotly.graph_objects as go
+
+from engines.batch_calc import read_csv_columns, de_broglie_batch, to_csv_bytes, DE_BROGLIE_COLUMNS
+from engines.spectral_lines import hydrogen_line_table, lines_in_range, series_limit_nm, SERIES_NAMES
+
+MAX_PLOT_LINES = 5000 # більше ліній на графіку браузер малює повільно
+
+
+@st.cache_data(ttl=3600)
+def get_line_table(n_max):
+    return hydrogen_line_table(n_max)
 
 with st.container(border=True):
     st.title("⚛️ Атомні калькулятори")
@@ -48,6 +59,65 @@ with st.container(border=True):
             else:
                 st.info("Ця хвиля знаходиться поза видимим діапазоном (УФ або ІЧ).")
 
+        st.divider()
+
+        # --- БАЗА СПЕКТРАЛЬНИХ ЛІНІЙ ---
+        st.subheader("📚 База спектральних ліній (n ≤ 1000)")
+        st.write("Усі переходи $n_i \\to n_f$ до $n = 1000$ (≈500 тис. ліній) обчислюються один раз і зберігаються "
+                 "як таблиця, відсортована за довжиною хвилі. Для воднеподібного іона $\\lambda_Z = \\lambda_H / Z^2$.")
+
+        col_db1, col_db2, col_db3 = st.columns(3)
+        Z_ion = col_db1.number_input("Заряд ядра (Z)", min_value=1, max_value=100, value=1, step=1, key="ryd_db_z",
+                                     help="1 - H, 2 - He⁺, 3 - Li²⁺ ...")
+        lam_min = col_db2.number_input("λ мін, нм", min_value=0.001, value=380.0, key="ryd_db_lmin")
+        lam_max = col_db3.number_input("λ макс, нм", min_value=0.001, value=750.0, key="ryd_db_lmax")
+        db_mode = st.radio("Режим", ["Таблиця ліній", "Спектр"], horizontal=True, key="ryd_db_mode")
+
+        table = get_line_table(1000)
+        if lam_max <= lam_min:
+            st.error("Верхня межа діапазону має бути більшою за нижню.")
+        else:
+            lines = lines_in_range(table, lam_min, lam_max, Z=Z_ion)
+            st.metric("Ліній у діапазоні", f"{lines.size}")
+
+            if lines.size == 0:
+                st.info("У цьому діапазоні немає ліній.")
+            elif db_mode == "Таблиця ліній":
+                shown = lines[:2000]
+                st.dataframe({
+                    "n_i": shown["n_i"],
+                    "n_f": shown["n_f"],
+                    "Серія": [SERIES_NAMES.get(int(nf), f"n_f = {nf}") for nf in shown["n_f"]],
+                    "λ, нм": shown["wavelength_nm"],
+                }, use_container_width=True, height=350)
+                if lines.size > shown.size:
+                    st.caption(f"Показано перші {shown.size} ліній з {lines.size}.")
+            else:
+                # Найяскравіші лінії - з найменшими n_i; решту відкидаємо, якщо їх забагато
+                if lines.size > MAX_PLOT_LINES:
+                    lines = lines[np.argpartition(lines["n_i"], MAX_PLOT_LINES)[:MAX_PLOT_LINES]]
+                    st.caption(f"Показано {MAX_PLOT_LINES} ліній з найменшими n_i.")
+
+                fig_spec = go.Figure()
+                groups = [(nf, SERIES_NAMES[nf]) for nf in SERIES_NAMES] + [(None, "Інші (n_f ≥ 7)")]
+                for nf, name in groups:
+                    sel = lines[lines["n_f"] == nf] if nf is not None else lines[lines["n_f"] > 6]
+                    if sel.size == 0:
+                        continue
+                    # Усі лінії серії - одна траса: вертикальні відрізки, розділені NaN
+                    x_seg = np.repeat(sel["wavelength_nm"], 3)
+                    x_seg[2::3] = np.nan
+                    y_seg = np.tile([0.0, 1.0, np.nan], sel.size)
+                    fig_spec.add_trace(go.Scatter(x=x_seg, y=y_seg, mode='lines', name=name, line=dict(width=1)))
+                for nf in SERIES_NAMES:
+                    limit = series_limit_nm(nf, Z_ion)
+                    if lam_min <= limit <= lam_max:
+                        fig_spec.add_vline(x=limit, line_dash="dot", line_color="gray",
+                                           annotation_text=f"межа: {SERIES_NAMES[nf]}")
+                fig_spec.update_layout(xaxis_title="Довжина хвилі λ, нм", yaxis_visible=False,
+                                       xaxis_range=[lam_min, lam_max], height=400)
+                st.plotly_chart(fig_spec, use_container_width=True)
+
     # --- Вкладка 2: Хвиля де Бройля ---
     with tab2:
         st.header("Довжина хвилі де Бройля")
@@ -89,4 +159,35 @@ with st.container(border=True):
         lambda_pm = lambda_de_broglie * 1e12 # Переводимо в пікометри
         
         st.metric("Імпульс (p)", f"{p:.3e} кг·м/с")
-        st.metric("Довжина хвилі де Бройля (λ)", f"{lambda_pm:.3f} пм (пікометрів)")
\ No newline at end of file
+        st.metric("Довжина хвилі де Бройля (λ)", f"{lambda_pm:.3f} пм (пікометрів)")
+
+        st.divider()
+
+        # --- ПАКЕТНИЙ РОЗРАХУНОК ---
+        st.subheader("📄 Пакетний розрахунок (CSV)")
+        st.write("Завантажте таблицю зі стовпцями `mass_kg` та `energy_eV` (кінетична енергія) або `speed_m_s`. "
+                 "Усі рядки обчислюються одразу; імпульс - релятивістський, тож результат коректний і для швидких електронів.")
+        st.download_button("⬇️ Шаблон CSV", data="mass_kg,energy_eV,speed_m_s\n9.109e-31,100,\n1.673e-27,,1e6\n",
+                           file_name="de_broglie_template.csv", mime="text/csv", key="debr_batch_template")
+        uploaded = st.file_uploader("CSV-файл", type=["csv"], key="debr_batch_file")
+
+        if uploaded is not None:
+            try:
+                columns = read_csv_columns(uploaded, DE_BROGLIE_COLUMNS)
+                if "mass_kg" not in columns:
+                    raise ValueError("Потрібен стовпець mass_kg.")
+                lam_batch, p_batch = de_broglie_batch(columns["mass_kg"], columns.get("energy_eV"),
+                                                      columns.get("speed_m_s"))
+            except ValueError as err:
+                st.error(f"Помилка у файлі: {err}")
+            else:
+                result = dict(columns)
+                result["momentum_kg_m_s"] = p_batch
+                result["wavelength_m"] = lam_batch
+                n_bad = int(np.count_nonzero(np.isnan(lam_batch)))
+                st.metric("Оброблено рядків", f"{lam_batch.size}")
+                if n_bad:
+                    st.warning(f"{n_bad} рядків без коректних даних (немає енергії/швидкості або v ≥ c) - у них NaN.")
+                st.dataframe({name: values[:1000] for name, values in result.items()}, use_container_width=True, height=300)
+                st.download_button("⬇️ Завантажити результат", data=to_csv_bytes(result),
+                                   file_name="de_broglie_results.csv", mime="text/csv", key="debr_batch_download")
\ No newline at end of file
@@ -2,6 +2,8 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 
+from engines.decay import simulate_decay, solve_chain, chain_matrix, U238_SERIES
+
 with st.container(border=True):
     st.title("☢️ Калькулятор радіоактивного розпаду")
     st.write("Розраховує кількість речовини та активність, що залишились.")
@@ -71,4 +73,129 @@ with st.container(border=True):
         st.plotly_chart(fig, use_container_width=True)
 
     else:
-        st.error("Період напіврозпаду має бути > 0")
\ No newline at end of file
+        st.error("Період напіврозпаду має бути > 0")
+
+    st.divider()
+
+    # --- МОНТЕ-КАРЛО: СТАТИСТИЧНА ПРИРОДА РОЗПАДУ ---
+    st.header("🎲 Стохастичний розпад (Монте-Карло)")
+    st.write("Кожне ядро розпадається випадково з імовірністю $p = 1 - e^{-\\lambda \\Delta t}$ за крок. "
+             "Кількість розпадів за крок - біноміальна величина, тож для $N_0 \\sim 10^8$ моделюються не окремі атоми, "
+             "а одна вибірка на крок для кожної реалізації. Флуктуації мають пуассонівський масштаб $\\sqrt{N}$.")
+
+    col_mc1, col_mc2, col_mc3 = st.columns(3)
+    n0_mc = col_mc1.select_slider("Початкова кількість ядер (N₀)", options=[10**p for p in range(1, 9)],
+                                  value=1000, format_func=lambda v: f"{v:.0e}", key="decay_mc_n0")
+    n_runs_mc = col_mc2.slider("Кількість реалізацій", 1, 2000, 200, key="decay_mc_runs")
+    n_steps_mc = col_mc3.slider("Кроків за часом", 20, 1000, 200, 10, key="decay_mc_steps")
+    seed_mc = st.number_input("Зерно генератора (seed)", min_value=0, value=42, step=1, key="decay_mc_seed")
+
+    t_max_mc = max(t_half * 5, t * 1.5)
+    t_mc = np.linspace(0, t_max_mc, n_steps_mc + 1)
+    lambda_mc = np.log(2) / t_half
+    N_mc, decays_mc = simulate_decay(n0_mc, lambda_mc, t_mc, n_runs_mc, seed=int(seed_mc))
+    N_det = n0_mc * np.exp(-lambda_mc * t_mc)
+
+    tab_traj, tab_counts = st.tabs(["Траєкторії N(t)", "Розподіл розпадів за інтервал"])
+    with tab_traj:
+        fig_mc = go.Figure()
+        for run in N_mc[:min(n_runs_mc, 20)]: # показуємо не більше 20 реалізацій
+            fig_mc.add_trace(go.Scatter(x=t_mc, y=run, mode='lines', line=dict(width=1), opacity=0.5,
+                                        showlegend=False))
+        sigma_band = np.sqrt(N_det * (1 - np.exp(-lambda_mc * t_mc)))
+        fig_mc.add_trace(go.Scatter(x=t_mc, y=N_det + sigma_band, mode='lines', line=dict(color='black', dash='dot'),
+                                    name='±σ біноміальне'))
+        fig_mc.add_trace(go.Scatter(x=t_mc, y=np.maximum(N_det - sigma_band, 0), mode='lines',
+                                    line=dict(color='black', dash='dot'), showlegend=False))
+        fig_mc.add_trace(go.Scatter(x=t_mc, y=N_det, mode='lines', line=dict(color='red', width=3),
+                                    name='N₀·e^{-λt}'))
+        fig_mc.update_layout(xaxis_title="Час", yaxis_title="Кількість ядер, N", height=500)
+        st.plotly_chart(fig_mc, use_container_width=True)
+        st.metric("Відносне відхилення в кінці", f"{np.std(N_mc[:, -1]) / max(N_det[-1], 1):.3e}",
+                  help="Спадає як 1/√N: для макроскопічних N₀ закон стає детермінованим.")
+
+    with tab_counts:
+        counts_first = decays_mc[:, 0]
+        mean_first = n0_mc * (1 - np.exp(-lambda_mc * (t_mc[1] - t_mc[0])))
+        values, freq = np.unique(counts_first, return_counts=True)
+        fig_cnt = go.Figure()
+        fig_cnt.add_trace(go.Bar(x=values, y=freq / n_runs_mc, name='Монте-Карло', marker_color='royalblue'))
+        # Гауссове наближення пуассонівського розподілу з середнім і дисперсією μ
+        k_axis = np.linspace(values.min() - 1, values.max() + 1, 300)
+        fig_cnt.add_trace(go.Scatter(x=k_axis, y=np.exp(-(k_axis - mean_first)**2 / (2 * mean_first))
+                                     / np.sqrt(2 * np.pi * mean_first), mode='lines', name='Пуассон (μ = σ²)',
+                                     line=dict(color='red', width=3)))
+        fig_cnt.update_layout(xaxis_title="Розпадів за перший інтервал Δt", yaxis_title="Частка реалізацій",
+                              height=450)
+        st.plotly_chart(fig_cnt, use_container_width=True)
+        st.write(f"Середнє: {counts_first.mean():.2f} (очікується {mean_first:.2f}); "
+                 f"дисперсія: {counts_first.var():.2f} - для пуассонівського процесу вона дорівнює середньому.")
+
+    st.divider()
+
+    # --- ЛАНЦЮЖКИ РОЗПАДІВ (РІВНЯННЯ БЕЙТМАНА) ---
+    st.header("⛓️ Ланцюжки розпадів (рівняння Бейтмана)")
+    st.latex(r"\frac{dN_i}{dt} = \lambda_{i-1} N_{i-1} - \lambda_i N_i \quad \Rightarrow \quad \vec N(t) = e^{A t}\, \vec N_0")
+
+    chain_kind = st.radio("Ланцюжок", ["Ряд урану U-238 → Pb-206", "Власний ланцюжок"], horizontal=True,
+                          key="decay_chain_kind")
+    if chain_kind == "Власний ланцюжок":
+        chain_text = st.text_input("Періоди напіврозпаду в роках через кому (останній нуклід вважається стабільним)",
+                                   "10, 1, 0.1", key="decay_chain_custom")
+        try:
+            custom_hl = [float(v) for v in chain_text.split(",") if v.strip()]
+        except ValueError:
+            st.error("Введіть числа через кому.")
+            st.stop()
+        if not custom_hl or min(custom_hl) <= 0:
+            st.error("Періоди напіврозпаду мають бути додатними.")
+            st.stop()
+        chain = [(f"X{i + 1}", h) for i, h in enumerate(custom_hl)] + [(f"X{len(custom_hl) + 1} (стаб.)", np.inf)]
+    else:
+        chain = U238_SERIES
+    chain_names = tuple(name for name, _ in chain)
+    chain_half_lives = tuple(h for _, h in chain)
+
+    finite_hl = [h for h in chain_half_lives if np.isfinite(h)]
+    t_chain_max = st.select_slider("Максимальний час, роки",
+                                   options=[10.0**p for p in range(-3, 12)],
+                                   value=10.0**np.clip(np.round(np.log10(3 * max(finite_hl))), -3, 11),
+                                   format_func=lambda v: f"{v:.0e}", key="decay_chain_tmax")
+
+    @st.cache_data(ttl=3600, max_entries=20)
+    def chain_evolution(half_lives, t_max, n_points=300):
+        # Логарифмічна шкала часу: від найкоротшого періоду до геологічних часів
+        t_min = max(min(h for h in half_lives if np.isfinite(h)) * 1e-2, t_max * 1e-16)
+        t_grid = np.concatenate(([0.0], np.logspace(np.log10(t_min), np.log10(t_max), n_points)))
+        n0_chain = np.zeros(len(half_lives))
+        n0_chain[0] = 1.0
+        return t_grid, solve_chain(half_lives, n0_chain, t_grid)
+
+    t_chain, N_chain = chain_evolution(chain_half_lives, t_chain_max)
+    _, lambdas_chain = chain_matrix(chain_half_lives)
+
+    tab_n, tab_act = st.tabs(["Частки нуклідів N_i(t)/N₀", "Активності відносно материнського"])
+    with tab_n:
+        fig_ch = go.Figure()
+        for i, name in enumerate(chain_names):
+            fig_ch.add_trace(go.Scatter(x=t_chain[1:], y=N_chain[1:, i], mode='lines', name=name))
+        fig_ch.update_layout(xaxis_type="log", yaxis_type="log", yaxis_range=[-20, 0.1],
+                             xaxis_title="Час, роки", yaxis_title="N_i / N₀", height=550)
+        st.plotly_chart(fig_ch, use_container_width=True)
+    with tab_act:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            activity_ratio = (N_chain[1:] * lambdas_chain) / (N_chain[1:, :1] * lambdas_chain[0])
+        fig_act = go.Figure()
+        for i, name in enumerate(chain_names[1:-1], start=1):
+            fig_act.add_trace(go.Scatter(x=t_chain[1:], y=activity_ratio[:, i], mode='lines', name=name))
+        fig_act.update_layout(xaxis_type="log", yaxis_type="log", yaxis_range=[-6, 0.5],
+                              xaxis_title="Час, роки", yaxis_title="A_i / A₁", height=550)
+        st.plotly_chart(fig_act, use_container_width=True)
+        st.info("Коли всі відношення активностей прямують до 1, встановлюється вікова (секулярна) рівновага.")
+
+    col_ch1, col_ch2 = st.columns(2)
+    col_ch1.metric(f"{chain_names[0]}, що залишився при t_max", f"{N_chain[-1, 0]:.4e} N₀")
+    with np.errstate(divide='ignore'):
+        daughter_ratio = N_chain[-1, -1] / N_chain[-1, 0]
+    col_ch2.metric(f"{chain_names[-1]} / {chain_names[0]} при t_max", f"{daughter_ratio:.4e}",
+                   help="Для ряду урану це відношення Pb-206/U-238 - основа уран-свинцевого датування.")
@@ -2,6 +2,8 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 
+from engines.franck_hertz import simulate_franck_hertz
+
 with st.container(border=True):
     st.title("💡 Симулятор досліду Франка-Герца")
     st.write("Демонструє залежність струму (I) від прискорюючої напруги (V) у трубці з парами ртуті.")
@@ -22,6 +24,21 @@ with st.container(border=True):
             min_value=10.0, max_value=50.0, value=30.0, step=1.0,
             key="fh_vmax"
         )
+    model_kind = st.radio("Модель", ["Спрощена формула", "Монте-Карло (фізична модель)"], horizontal=True,
+                          key="fh_model")
+    if model_kind.startswith("Монте-Карло"):
+        col_mc1, col_mc2, col_mc3 = st.columns(3)
+        with col_mc1:
+            mfp = st.slider("Довжина вільного пробігу (λ / d)", 0.005, 0.2, 0.05, 0.005, key="fh_mfp",
+                            help="У частках відстані катод-сітка d. Менше λ - більше зіткнень, гостріші провали.")
+            p_inel = st.slider("Імовірність непружного зіткнення (K ≥ E_ex)", 0.05, 1.0, 0.5, 0.05, key="fh_pinel")
+        with col_mc2:
+            U_retard = st.slider("Гальмівна напруга (U_r), В", 0.0, 3.0, 1.5, 0.1, key="fh_ur")
+            kT_eV = st.slider("Теплова енергія електронів (kT), еВ", 0.01, 1.0, 0.2, 0.01, key="fh_kt")
+        with col_mc3:
+            n_electrons = st.select_slider("Кількість електронів", options=[1000, 5000, 20000, 50000, 100000],
+                                           value=20000, key="fh_ne")
+            seed_fh = st.number_input("Зерно генератора (seed)", min_value=0, value=1, step=1, key="fh_seed")
     st.divider() # Горизонтальна лінія
 
     # --- БЛОК ТЕОРІЇ ---
@@ -37,10 +54,24 @@ with st.container(border=True):
 
     # --- Розрахункова модель ---
     V = np.linspace(0.01, V_max, 500)
-    # Спрощена модель, що демонструє ефект
-    I_base = V**0.1
-    I_oscillation = (V % V_ex_eV)**1.5
-    I = I_base + I_oscillation / (V_ex_eV)
+    if model_kind.startswith("Монте-Карло"):
+        @st.cache_data(ttl=3600, max_entries=20)
+        def franck_hertz_mc(V_max, V_ex, mfp, p_inel, U_retard, kT, n_electrons, seed):
+            V_grid = np.linspace(0.01, V_max, 500)
+            return simulate_franck_hertz(V_grid, V_ex, mfp, p_inel, U_retard, n_electrons, kT=kT, seed=seed)
+
+        with st.spinner(f"Моделювання {n_electrons} електронів для 500 напруг..."):
+            fraction = franck_hertz_mc(V_max, V_ex_eV, mfp, p_inel, U_retard, kT_eV, n_electrons, int(seed_fh))
+        # Емісія з катода обмежена просторовим зарядом (закон Чайлда-Ленгмюра): I₀ ∝ V^(3/2)
+        I = fraction * V**1.5
+        I = I / I.max()
+        st.caption("Струм = (частка електронів, що подолали гальмівне поле) × V^(3/2). "
+                   "Провали виникають самі: після кожного непружного зіткнення електрону бракує енергії на U_r.")
+    else:
+        # Спрощена модель, що демонструє ефект
+        I_base = V**0.1
+        I_oscillation = (V % V_ex_eV)**1.5
+        I = I_base + I_oscillation / (V_ex_eV)
 
     # --- Графік ---
     st.header("Графік залежності струму від напруги I(V)")
@@ -1,11 +1,28 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
-from scipy.special import sph_harm, genlaguerre
+import scipy.constants as const
+from scipy.special import sph_harm, genlaguerre, factorial
+
+from engines.animation import frame_indices, add_animation_controls, make_frames
 
 # Використовуємо широкий режим для цієї сторінки
 st.set_page_config(layout="wide")
 
+# Атомна одиниця часу (с) - в атомних одиницях ħ = 1, E_n = -1/(2n²)
+AU_TIME = const.physical_constants["atomic unit of time"][0]
+
+# --- Нормована хвильова функція атома водню (в атомних одиницях) ---
+def hydrogen_psi(n, l, m, R, Theta, Phi):
+    """
+    Повертає нормовану комплексну Ψ_nlm у точках (R, Theta, Phi).
+    Нормування потрібне, щоб у суперпозиції стани мали правильну вагу.
+    """
+    rho = 2.0 * R / n
+    norm = np.sqrt((2.0 / n)**3 * factorial(n - l - 1) / (2 * n * factorial(n + l)))
+    R_nl = norm * np.exp(-rho / 2.0) * rho**l * genlaguerre(n - l - 1, 2 * l + 1)(rho)
+    return R_nl * sph_harm(m, l, Phi, Theta)
+
 with st.container(border=True):
     st.title("⚛️ 3D-Візуалізатор орбіталей атома Водню")
     st.write("Показує поверхню постійної густини ймовірності ($|\Psi_{n,l,m}|^2$)")
@@ -135,4 +152,95 @@ with st.container(border=True):
     * **p-орбіталі ($l=1$)**: $m=0$ дає "гантелю" вздовж осі $z$. $m=\pm 1$ дають "тороїд" (бублик). 
     * *Примітка: звичні $p_x$ та $p_y$ орбіталі є **суперпозицією** $m=1$ та $m=-1$.*
     * **d-орбіталі ($l=2$)** дають ще складніші "пелюсткові" та "кільцеві" форми.
-    """)
\ No newline at end of file
+    """)
+
+    st.divider()
+
+    # --- ЧАСОВА ЕВОЛЮЦІЯ СУПЕРПОЗИЦІЇ ---
+    st.header("🎞️ Часова еволюція суперпозиції станів")
+    st.write("Суперпозиція власних станів з різними $n$ не є стаціонарною: густина заряду осцилює з частотами переходів.")
+    st.latex(r"\Psi(\vec r, t) = \sum_j c_j \Psi_{n_j l_j m_j}(\vec r)\, e^{-i E_{n_j} t/\hbar}, \qquad E_n = -\frac{13.6\ \text{еВ}}{n^2}")
+
+    state_options = [(sn, sl, sm) for sn in range(1, 5) for sl in range(sn) for sm in range(-sl, sl + 1)]
+    orbital_letters = "spdf"
+    col_states, col_frames, col_res = st.columns([2, 1, 1])
+    with col_states:
+        states = st.multiselect(
+            "Стани суперпозиції (n, l, m), рівні амплітуди",
+            options=state_options, default=[(1, 0, 0), (2, 1, 0)],
+            format_func=lambda s: f"{s[0]}{orbital_letters[s[1]]} (n={s[0]}, l={s[1]}, m={s[2]})",
+            key="orb_sup_states")
+    with col_frames:
+        n_frames_req = st.slider("Кількість кадрів", 20, 200, 60, 10, key="orb_sup_frames")
+    with col_res:
+        N_slice = st.slider("Роздільна здатність зрізу", 60, 300, 150, 10, key="orb_sup_N",
+                            help="Густина показується в площині xz (y = 0).")
+
+    @st.cache_data(ttl=3600)
+    def calculate_superposition_components(states, N):
+        """
+        Спецфункції рахуються один раз: кожен стан - рядок матриці (стани × точки) у площині xz.
+        """
+        n_top = max(s[0] for s in states)
+        plot_range = 6.0 * n_top**2 + 4.0
+        x = np.linspace(-plot_range, plot_range, N)
+        z = np.linspace(-plot_range, plot_range, N)
+        X, Z = np.meshgrid(x, z)
+
+        R = np.sqrt(X**2 + Z**2)
+        R[R == 0] = 1e-10
+        Theta = np.arccos(Z / R)
+        Phi = np.where(X >= 0, 0.0, np.pi)
+
+        fields = np.stack([hydrogen_psi(sn, sl, sm, R, Theta, Phi).ravel() for sn, sl, sm in states])
+        energies = np.array([-0.5 / sn**2 for sn, _, _ in states]) # Хартрі
+        return x, z, fields.astype(np.complex64), energies
+
+    if len(states) < 2:
+        st.info("Оберіть щонайменше два стани для суперпозиції.")
+    else:
+        states = tuple(sorted(states))
+        x_s, z_s, fields, energies = calculate_superposition_components(states, N_slice)
+
+        dE = np.abs(energies[:, None] - energies[None, :])
+        dE = dE[dE > 1e-12]
+        if dE.size == 0:
+            st.warning("Усі обрані стани мають однакове n (вироджені за енергією) - густина не змінюється з часом.")
+            period_au = 1.0
+        else:
+            period_au = 2 * np.pi / dE.min() # Найповільніше биття
+
+        # Проріджуємо кадри під бюджет байтів ще до розрахунку густини
+        t_all = np.linspace(0.0, period_au, n_frames_req, endpoint=False)
+        idx = frame_indices(n_frames_req, fields.shape[1] * np.dtype(np.float32).itemsize)
+        t_au = t_all[idx]
+
+        # Усі кадри одним множенням: (кадри × стани) фази @ (стани × точки) поля
+        coeffs = np.full(len(states), 1.0 / np.sqrt(len(states)), dtype=np.complex64)
+        phases = np.exp(-1j * np.outer(t_au, energies)).astype(np.complex64) * coeffs
+        densities = np.abs(phases @ fields)**2
+        densities = densities.reshape(len(t_au), N_slice, N_slice).astype(np.float32)
+
+        t_fs = t_au * AU_TIME * 1e15
+        labels = [f"{t:.3f} фс" for t in t_fs]
+
+        col_m1, col_m2 = st.columns(2)
+        col_m1.metric("Період биття", f"{period_au * AU_TIME * 1e15:.3f} фс")
+        col_m2.metric("Кадрів у анімації", f"{len(t_au)} з {n_frames_req}",
+                      help="Кадри проріджуються, щоб обсяг даних не перевищував ліміт.")
+
+        fig_anim = go.Figure(data=go.Heatmap(
+            x=x_s, y=z_s, z=densities[0],
+            zmin=0.0, zmax=float(densities.max()),
+            colorscale='viridis', colorbar=dict(title="|Ψ|²")
+        ))
+        frames = make_frames(densities, labels, trace_type=go.Heatmap, trace_key="z")
+        add_animation_controls(fig_anim, frames, labels, frame_duration=60)
+        fig_anim.update_layout(
+            title="Густина ймовірності |Ψ(x, 0, z, t)|² у площині xz",
+            xaxis_title="x (a₀)", yaxis_title="z (a₀)",
+            yaxis=dict(scaleanchor="x"),
+            height=650
+        )
+        st.plotly_chart(fig_anim, use_container_width=True)
+        st.info("Наприклад, суперпозиція 1s + 2p (m=0) дає осцилюючий дипольний момент уздовж осі z - саме так атом випромінює лінію Лайман-α.")
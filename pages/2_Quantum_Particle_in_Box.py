@@ -3,6 +3,11 @@ import numpy as np
 import plotly.graph_objects as go
 import scipy.constants as const
 
+from engines.schrodinger import finite_well, double_well, anharmonic, solve_eigenstates, HBAR2_2M_EV_NM2
+from engines.expressions import evaluate_expression
+from engines.tdse import gaussian_packet, density_frames, HBAR_EV_FS
+from engines.animation import add_animation_controls, make_frames
+
 # Використовуємо широкий режим для цієї сторінки (залишаємо для максимального розміру)
 st.set_page_config(layout="wide")
 
@@ -92,4 +97,149 @@ with st.container(border=True):
                                       line=dict(color='red', width=3), fill='tozeroy', name=f"|Ψ|² (n={n})"))
         
         fig_prob.update_layout(xaxis_title="Позиція (x), пм", yaxis_title="Ймовірність (|Ψ|²)", showlegend=False)
-        st.plotly_chart(fig_prob, use_container_width=True)
\ No newline at end of file
+        st.plotly_chart(fig_prob, use_container_width=True)
+
+    st.divider()
+
+    # --- ЧИСЕЛЬНИЙ РОЗВ'ЯЗОК ДЛЯ ДОВІЛЬНОГО ПОТЕНЦІАЛУ ---
+    st.header("🧮 Довільний потенціал (чисельний розв'язок)")
+    st.write("Рівняння Шредінгера дискретизується скінченними різницями: гамільтоніан стає тридіагональною матрицею, "
+             "і шукаються лише k найнижчих власних станів.")
+    st.latex(r"-\frac{\hbar^2}{2m}\frac{\psi_{i+1} - 2\psi_i + \psi_{i-1}}{\Delta x^2} + V_i \psi_i = E \psi_i")
+
+    potential_kind = st.radio(
+        "Потенціал", ["Скінченна яма", "Подвійна яма", "Ангармонічний", "Власний вираз"],
+        horizontal=True, key="box_fd_kind")
+
+    col_fd1, col_fd2, col_fd3 = st.columns(3)
+    with col_fd1:
+        x_max_nm = st.slider("Півширина області (нм)", 0.5, 10.0, 2.0, 0.5, key="box_fd_xmax",
+                             help="На краях області ψ = 0 (нескінченні стінки).")
+    with col_fd2:
+        N_fd = st.select_slider("Точок сітки (N)", options=[1000, 5000, 20000, 50000, 100000],
+                                value=5000, key="box_fd_N")
+    with col_fd3:
+        k_states = st.slider("Кількість станів (k)", 1, 10, 4, key="box_fd_k")
+
+    col_p1, col_p2 = st.columns(2)
+    if potential_kind == "Скінченна яма":
+        V0_fd = col_p1.slider("Глибина ями (V₀), еВ", 0.1, 20.0, 5.0, 0.1, key="box_fd_V0")
+        a_fd = col_p2.slider("Ширина ями (a), нм", 0.1, 2 * x_max_nm, min(1.0, 2 * x_max_nm), 0.05, key="box_fd_a")
+        potential_params = (V0_fd, a_fd)
+    elif potential_kind == "Подвійна яма":
+        V0_fd = col_p1.slider("Висота центрального бар'єру (V₀), еВ", 0.1, 20.0, 2.0, 0.1, key="box_fd_V0_dw")
+        a_fd = col_p2.slider("Положення мінімумів (±a), нм", 0.1, x_max_nm, min(0.6, x_max_nm), 0.05, key="box_fd_a_dw")
+        potential_params = (V0_fd, a_fd)
+    elif potential_kind == "Ангармонічний":
+        k_fd = col_p1.slider("Жорсткість (k), еВ/нм²", 0.0, 50.0, 10.0, 0.5, key="box_fd_kh")
+        lam_fd = col_p2.slider("Ангармонізм (λ), еВ/нм⁴", 0.0, 50.0, 5.0, 0.5, key="box_fd_lam")
+        potential_params = (k_fd, lam_fd)
+    else:
+        expr_fd = st.text_input("V(x) в еВ, x в нм (функції numpy: sin, exp, abs, where, ...)",
+                                "2*abs(x) + 0.5*cos(6*x)", key="box_fd_expr")
+        potential_params = (expr_fd,)
+
+    @st.cache_data(ttl=3600, max_entries=20)
+    def solve_potential(kind, params, x_max, N, k):
+        """Кешується окремо для кожного потенціалу та сітки."""
+        x = np.linspace(-x_max, x_max, N)
+        if kind == "Скінченна яма":
+            V = finite_well(x, *params)
+        elif kind == "Подвійна яма":
+            V = double_well(x, *params)
+        elif kind == "Ангармонічний":
+            V = anharmonic(x, *params)
+        else:
+            V = np.real(evaluate_expression(params[0], x=x)).astype(float)
+        if not np.all(np.isfinite(V)):
+            raise ValueError("Потенціал містить нескінченні або невизначені значення (NaN/inf).")
+        E, psi = solve_eigenstates(x, V, k)
+        return x, V, E, psi
+
+    try:
+        x_fd, V_fd, E_fd, psi_fd = solve_potential(potential_kind, potential_params, x_max_nm, N_fd, k_states)
+    except ValueError as err:
+        st.error(str(err))
+        st.stop()
+
+    # Для графіка достатньо ~2000 точок
+    stride = max(1, N_fd // 2000)
+    x_plot_fd = x_fd[::stride]
+    V_plot_fd = V_fd[::stride]
+
+    # Середній, а не мінімальний інтервал: у подвійній ямі рівні йдуть майже виродженими парами,
+    # і мінімальний інтервал (тунельне розщеплення) ≈ 0 сплющив би всі хвильові функції
+    E_floor = max(abs(E_fd[0]), 1.0) * 0.05
+    E_spacing = max((E_fd[-1] - E_fd[0]) / (k_states - 1), E_floor) if k_states > 1 else max(abs(E_fd[0]), 1.0)
+    psi_scale = 0.4 * E_spacing / np.abs(psi_fd).max()
+
+    fig_fd = go.Figure()
+    fig_fd.add_trace(go.Scatter(x=x_plot_fd, y=V_plot_fd, mode='lines', name='V(x)',
+                                line=dict(color='gray', width=3)))
+    for i, E_i in enumerate(E_fd):
+        fig_fd.add_trace(go.Scatter(x=x_plot_fd, y=np.full_like(x_plot_fd, E_i), mode='lines',
+                                    line=dict(color='red', width=1, dash='dot'), showlegend=False,
+                                    hoverinfo='skip'))
+        fig_fd.add_trace(go.Scatter(x=x_plot_fd, y=E_i + psi_scale * psi_fd[i, ::stride], mode='lines',
+                                    name=f"ψ{i} (E = {E_i:.3f} еВ)"))
+
+    y_top = E_fd[-1] + E_spacing
+    fig_fd.update_layout(
+        title=f"Власні стани: {potential_kind.lower()}",
+        xaxis_title="Позиція (x), нм",
+        yaxis_title="Енергія (E), еВ",
+        yaxis_range=[min(V_fd.min(), E_fd[0] - E_spacing), y_top],
+        height=600
+    )
+    st.plotly_chart(fig_fd, use_container_width=True)
+
+    st.dataframe(
+        {"n": np.arange(k_states), "Eₙ, еВ": np.round(E_fd, 5)},
+        hide_index=True
+    )
+    st.info("Для подвійної ями з високим бар'єром рівні утворюють майже вироджені пари - це тунельне розщеплення.")
+
+    st.divider()
+
+    # --- ХВИЛЬОВИЙ ПАКЕТ У ЯЩИКУ ---
+    st.header("🎞️ Хвильовий пакет у ящику та квантове відродження")
+    st.write("Гауссів пакет відбивається від стінок, розпливається, а через час відродження "
+             "$T_{rev} = 4 m L^2 / (\\pi \\hbar)$ знову збирається в початкову форму.")
+
+    col_bx1, col_bx2 = st.columns(2)
+    with col_bx1:
+        n_center = st.slider("Середнє квантове число пакета (k₀ = n·π/L)", 0, 20, 8, key="box_wp_n")
+    with col_bx2:
+        n_frames_box = st.slider("Кількість кадрів", 20, 200, 100, 10, key="box_wp_frames")
+
+    @st.cache_data(ttl=3600, max_entries=10)
+    def simulate_box_packet(L_nm, n_center, n_frames):
+        # Ящик [0, L] з ψ = 0 на стінках еквівалентний періодичній області [-L, L)
+        # з непарним початковим станом ψ(-x) = -ψ(x) - тоді FFT-еволюція точна.
+        x_ext = np.linspace(-L_nm, L_nm, 2048, endpoint=False)
+        sigma = L_nm / 12
+        k0 = n_center * np.pi / L_nm
+        psi0 = gaussian_packet(x_ext, L_nm / 3, sigma, k0) - gaussian_packet(x_ext, -L_nm / 3, sigma, -k0)
+        t_rev = 2 * HBAR_EV_FS * L_nm**2 / (np.pi * HBAR2_2M_EV_NM2)
+        times, frames = density_frames(x_ext, np.zeros_like(x_ext), psi0, t_rev / (n_frames - 1), n_frames, stride=1)
+        inside = x_ext >= 0
+        return x_ext[inside], times, frames[:, inside], t_rev
+
+    L_nm = L_pm * 1e-3
+    x_box, t_box, frames_box, t_rev = simulate_box_packet(L_nm, n_center, n_frames_box)
+    st.metric("Час відродження (T_rev)", f"{t_rev:.4f} фс")
+
+    labels_box = [f"{t:.4f} фс" for t in t_box]
+    fig_box = go.Figure()
+    fig_box.add_trace(go.Scatter(x=x_box * 1e3, y=frames_box[0], mode='lines', name='|Ψ(x,t)|²',
+                                 line=dict(color='red', width=2), fill='tozeroy'))
+    add_animation_controls(fig_box, make_frames(frames_box, labels_box), labels_box)
+    fig_box.update_layout(
+        title="Еволюція пакета в ящику (один період відродження)",
+        xaxis_title="Позиція (x), пм",
+        yaxis_title="Густина ймовірності, 1/нм",
+        xaxis_range=[0, L_pm],
+        yaxis_range=[0, float(frames_box.max()) * 1.1],
+        height=550
+    )
+    st.plotly_chart(fig_box, use_container_width=True)
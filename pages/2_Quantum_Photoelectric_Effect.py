@@ -3,6 +3,8 @@ import numpy as np
 import plotly.graph_objects as go
 import scipy.constants as const
 
+from engines.batch_calc import read_csv_columns, photoelectric_batch, to_csv_bytes, PHOTO_COLUMNS
+
 # --- Фізичні константи ---
 h_eVs = const.physical_constants['Planck constant in eV s'][0] # h в еВ·с
 c = const.c # швидкість світла
@@ -150,4 +152,40 @@ with st.container(border=True):
         xaxis_range=[0, 10],
         yaxis_range=[-0.5, 10 - Phi_eV + 0.5]
     )
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.divider()
+
+    # --- ПАКЕТНИЙ РОЗРАХУНОК ---
+    st.header("📄 Пакетний розрахунок (CSV)")
+    st.write("Завантажте таблицю зі стовпцем `wavelength_nm` і, за потреби, `work_function_eV`. "
+             f"Якщо роботи виходу у файлі немає або клітинка порожня, використовується поточний матеріал (Φ = {Phi_eV:.2f} еВ).")
+    st.download_button("⬇️ Шаблон CSV", data="wavelength_nm,work_function_eV\n300,2.30\n450,2.14\n250,4.31\n",
+                       file_name="photoelectric_template.csv", mime="text/csv", key="photo_batch_template")
+    uploaded = st.file_uploader("CSV-файл", type=["csv"], key="photo_batch_file")
+
+    if uploaded is not None:
+        try:
+            columns = read_csv_columns(uploaded, PHOTO_COLUMNS)
+            if "wavelength_nm" not in columns:
+                raise ValueError("Потрібен стовпець wavelength_nm.")
+        except ValueError as err:
+            st.error(f"Помилка у файлі: {err}")
+        else:
+            # Порожні клітинки роботи виходу - поточний матеріал
+            phi_batch = columns.get("work_function_eV", np.full(columns["wavelength_nm"].shape, np.nan))
+            phi_batch = np.where(np.isnan(phi_batch), Phi_eV, phi_batch)
+            E_batch, K_batch, V_batch = photoelectric_batch(columns["wavelength_nm"], phi_batch)
+            result = {
+                "wavelength_nm": columns["wavelength_nm"],
+                "work_function_eV": phi_batch,
+                "photon_energy_eV": E_batch,
+                "K_max_eV": K_batch,
+                "stopping_voltage_V": V_batch,
+            }
+            col_b1, col_b2 = st.columns(2)
+            col_b1.metric("Оброблено рядків", f"{E_batch.size}")
+            col_b2.metric("Рядків з фотоефектом", f"{int(np.count_nonzero(K_batch > 0))}")
+            st.dataframe({name: values[:1000] for name, values in result.items()}, use_container_width=True, height=300)
+            st.download_button("⬇️ Завантажити результат", data=to_csv_bytes(result),
+                               file_name="photoelectric_results.csv", mime="text/csv", key="photo_batch_download")
@@ -2,7 +2,9 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 import scipy.constants as const
-from scipy.special import hermite, factorial
+
+from engines.qho import qho_eigenfunctions, coherent_coefficients, project_onto_basis, evolve_density
+from engines.animation import add_animation_controls
 
 # --- Фізичні константи ---
 hbar = const.hbar
@@ -55,6 +57,8 @@ with st.container(border=True):
         st.subheader("Хвильові функції $\Psi_n(x)$")
         st.write("Розв'язки мають вигляд Гауссової функції, помноженої на поліноми Ерміта $H_n(y)$:")
         st.latex(r"\Psi_n(x) = C_n \cdot H_n(y) \cdot e^{-y^2 / 2} \quad \text{де} \quad y = x \sqrt{\frac{m\omega}{\hbar}}")
+        st.write("Для великих $n$ множники $H_n(y)$ та $2^n n!$ переповнюються, тому функції рахуються стійкою рекурсією:")
+        st.latex(r"\Psi_{n+1} = \sqrt{\frac{2}{n+1}}\, y\, \Psi_n - \sqrt{\frac{n}{n+1}}\, \Psi_{n-1}")
 
     # --- Розрахункова частина ---
     
@@ -82,15 +86,12 @@ with st.container(border=True):
     
     y = x * np.sqrt(alpha)
     
-    # Поліном Ерміта H_n(y)
-    Hn = hermite(n)
-    Hn_values = Hn(y)
-    
-    # Нормувальна константа C_n
-    Cn = 1.0 / np.sqrt( (2**n) * factorial(n) * np.sqrt(np.pi / alpha) )
+    # Усі Psi_0..Psi_10 одним проходом стійкої рекурсії (нормовані по y),
+    # множник alpha^(1/4) переводить нормування до ∫|Psi|² dx = 1
+    psi_all = qho_eigenfunctions(len(n_levels) - 1, y) * alpha**0.25
     
     # Хвильова функція Psi_n(x)
-    psi_values = Cn * Hn_values * np.exp(-y**2 / 2)
+    psi_values = psi_all[n]
     
     # Густина ймовірності |Psi_n(x)|^2
     prob_density = psi_values**2
@@ -167,4 +168,154 @@ with st.container(border=True):
         height=600,
         yaxis_range=[0, np.max(E_levels_eV)*1.1] # Обмежуємо висоту
     )
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.divider()
+
+    # --- УСІ РІВНІ ТА КОГЕРЕНТНІ СТАНИ ---
+    st.header("📚 Багато рівнів одночасно та когерентні стани")
+    tab_levels, tab_coherent = st.tabs(["Усі рівні 0...N", "Когерентний стан |α⟩"])
+
+    E_unit_eV = hbar * omega / e # ħω в еВ
+
+    with tab_levels:
+        n_all = st.slider("Кількість рівнів (N)", 1, 200, 30, key="qho_n_all")
+
+        @st.cache_data(ttl=3600, max_entries=20)
+        def all_levels_trace(n_all, n_points=1500):
+            # Одна лінія з розділювачами NaN замість N окремих трейсів
+            y_lim = 1.15 * np.sqrt(2 * n_all + 1)
+            y_all = np.linspace(-y_lim, y_lim, n_points)
+            psi_grid = qho_eigenfunctions(n_all, y_all)
+            offsets = np.arange(n_all + 1) + 0.5 # Eₙ в одиницях ħω
+            curves = offsets[:, None] + 0.45 * psi_grid / np.abs(psi_grid).max(axis=1, keepdims=True)
+            y_line = np.concatenate((np.tile(y_all, (n_all + 1, 1)), np.full((n_all + 1, 1), np.nan)), axis=1)
+            E_line = np.concatenate((curves, np.full((n_all + 1, 1), np.nan)), axis=1)
+            return y_all, y_line.ravel(), E_line.ravel()
+
+        y_all, y_line, E_line = all_levels_trace(n_all)
+        x_scale_nm = 1e9 / np.sqrt(alpha) # y -> x, нм
+
+        fig_all = go.Figure()
+        fig_all.add_trace(go.Scatter(x=y_all * x_scale_nm, y=0.5 * y_all**2 * E_unit_eV, mode='lines',
+                                     name='Потенціал V(x)', line=dict(color='gray', width=3)))
+        fig_all.add_trace(go.Scatter(x=y_line * x_scale_nm, y=E_line * E_unit_eV, mode='lines',
+                                     name=f"Ψ₀...Ψ{n_all}", line=dict(color='blue', width=1)))
+        fig_all.update_layout(title=f"Хвильові функції рівнів n = 0...{n_all}",
+                              xaxis_title="Позиція (x), нм", yaxis_title="Енергія (E), еВ",
+                              yaxis_range=[0, (n_all + 1.5) * E_unit_eV], height=700)
+        st.plotly_chart(fig_all, use_container_width=True)
+        st.info("При великих n густина ймовірності наближається до класичної: частинка найчастіше перебуває біля точок розвороту.")
+
+    with tab_coherent:
+        st.write("Когерентний стан - суперпозиція рівнів з пуассонівськими вагами; це гауссів пакет, зміщений на $x_0 = \\sqrt{2}\\,\\alpha$ (в одиницях $\\sqrt{\\hbar/m\\omega}$).")
+        st.latex(r"|\alpha\rangle = e^{-|\alpha|^2/2} \sum_n \frac{\alpha^n}{\sqrt{n!}} |n\rangle")
+        alpha_coh = st.slider("Амплітуда (α)", 0.0, 8.0, 3.0, 0.1, key="qho_alpha")
+
+        n_coh = int(min(200, alpha_coh**2 + 8 * alpha_coh + 10))
+        y_lim_coh = np.sqrt(2) * alpha_coh + 6
+        y_coh = np.linspace(-y_lim_coh, y_lim_coh, 1500)
+        c_n = coherent_coefficients(alpha_coh, n_coh)
+        psi_coh = c_n @ qho_eigenfunctions(n_coh, y_coh)
+        prob_coh = np.abs(psi_coh)**2
+        prob_exact = np.exp(-(y_coh - np.sqrt(2) * alpha_coh)**2) / np.sqrt(np.pi)
+
+        col_c1, col_c2 = st.columns(2)
+        with col_c1:
+            fig_coh = go.Figure()
+            fig_coh.add_trace(go.Scatter(x=y_coh * x_scale_nm, y=prob_coh, mode='lines', fill='tozeroy',
+                                         name=f"Сума {n_coh + 1} рівнів", line=dict(color='red', width=3)))
+            fig_coh.add_trace(go.Scatter(x=y_coh * x_scale_nm, y=prob_exact, mode='lines',
+                                         name='Аналітичний гаусс', line=dict(color='black', dash='dash')))
+            fig_coh.update_layout(title="|Ψ_α(x)|²", xaxis_title="Позиція (x), нм",
+                                  yaxis_title="Густина ймовірності (по y)",
+                                  legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+            st.plotly_chart(fig_coh, use_container_width=True)
+        with col_c2:
+            fig_pn = go.Figure(go.Bar(x=np.arange(n_coh + 1), y=np.abs(c_n)**2, marker_color='blue'))
+            fig_pn.update_layout(title="Розподіл за рівнями |cₙ|² (Пуассон)", xaxis_title="n",
+                                 yaxis_title="Ймовірність")
+            st.plotly_chart(fig_pn, use_container_width=True)
+        st.metric("Середня енергія ⟨E⟩", f"{(alpha_coh**2 + 0.5) * E_unit_eV:.3f} еВ",
+                  help="⟨E⟩ = ħω(|α|² + 1/2)")
+
+    st.divider()
+
+    # --- ДИНАМІКА КОГЕРЕНТНИХ ТА СТИСНУТИХ СТАНІВ ---
+    st.header("🎞️ Динаміка когерентних та стиснутих станів")
+    st.write("Початковий гауссів пакет розкладається за власними функціями, а кожен рівень просто набуває фази "
+             "$e^{-i(n + 1/2)\\omega t}$. Когерентний стан ($r = 0$) коливається як класична частинка, не змінюючи форми; "
+             "стиснутий ($r \\neq 0$) ще й \"дихає\" з частотою $2\\omega$.")
+
+    col_dyn1, col_dyn2, col_dyn3 = st.columns(3)
+    with col_dyn1:
+        alpha_dyn = st.slider("Зміщення (α)", 0.0, 6.0, 3.0, 0.1, key="qho_dyn_alpha")
+    with col_dyn2:
+        r_squeeze = st.slider("Стиснення (r)", -1.0, 1.0, 0.0, 0.05, key="qho_dyn_r",
+                              help="r > 0 - вужчий у координаті, r < 0 - ширший; r = 0 - когерентний стан.")
+    with col_dyn3:
+        n_frames_dyn = st.slider("Кадрів за період", 20, 200, 80, 10, key="qho_dyn_frames")
+
+    @st.cache_data(ttl=3600)
+    def qho_basis_matrix(n_basis=200, n_points=1000):
+        # Базис рахується один раз і зберігається як float32: кожен кадр - одне множення
+        y_lim = np.sqrt(2 * n_basis + 1)
+        y_b = np.linspace(-y_lim, y_lim, n_points)
+        return y_b, qho_eigenfunctions(n_basis, y_b, dtype=np.float32)
+
+    y_b, basis = qho_basis_matrix()
+    dy_b = y_b[1] - y_b[0]
+
+    # Зміщений стиснутий гаусс у момент t = 0 (α дійсне: пакет стартує з точки розвороту)
+    y0_dyn = np.sqrt(2) * alpha_dyn
+    squeeze = np.exp(2 * r_squeeze)
+    psi0_dyn = (squeeze / np.pi)**0.25 * np.exp(-squeeze * (y_b - y0_dyn)**2 / 2)
+    c_dyn = project_onto_basis(psi0_dyn, basis, dy_b)
+
+    omega_t = np.linspace(0.0, 2 * np.pi, n_frames_dyn)
+    dens_dyn = evolve_density(c_dyn, basis, omega_t)
+
+    x_b_nm = y_b * x_scale_nm
+    x_classical_nm = y0_dyn * np.cos(omega_t) * x_scale_nm
+    t_fs = omega_t / omega * 1e15
+    labels_dyn = [f"{t:.3f} фс" for t in t_fs]
+    y_top_dyn = float(dens_dyn.max()) * 1.1
+
+    fig_dyn = go.Figure()
+    fig_dyn.add_trace(go.Scatter(x=x_b_nm, y=dens_dyn[0], mode='lines', fill='tozeroy',
+                                 name='|Ψ(x,t)|²', line=dict(color='red', width=3)))
+    fig_dyn.add_trace(go.Scatter(x=[x_classical_nm[0]] * 2, y=[0, y_top_dyn], mode='lines+markers',
+                                 name='Класична частинка', line=dict(color='black', width=2, dash='dash')))
+    fig_dyn.add_trace(go.Scatter(x=x_b_nm, y=0.5 * y_b**2 * y_top_dyn / (y0_dyn**2 + 4), mode='lines',
+                                 name='V(x) (умовний масштаб)', line=dict(color='gray', width=2)))
+    frames_dyn = [go.Frame(data=[go.Scatter(y=d), go.Scatter(x=[xc] * 2)], traces=[0, 1], name=str(i))
+                  for i, (d, xc) in enumerate(zip(dens_dyn, x_classical_nm))]
+    add_animation_controls(fig_dyn, frames_dyn, labels_dyn)
+    x_lim_dyn = (y0_dyn + 4 * max(1.0, np.exp(abs(r_squeeze)))) * x_scale_nm
+    fig_dyn.update_layout(
+        title="Еволюція стану за один період 2π/ω",
+        xaxis_title="Позиція (x), нм", yaxis_title="Густина ймовірності (по y)",
+        xaxis_range=[-x_lim_dyn, x_lim_dyn], yaxis_range=[0, y_top_dyn],
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        height=600
+    )
+    st.plotly_chart(fig_dyn, use_container_width=True)
+
+    # Ширина пакета з кадрів та аналітична Δy(t)
+    norm_dyn = dens_dyn.sum(axis=1)
+    mean_dyn = (dens_dyn * y_b).sum(axis=1) / norm_dyn
+    width_dyn = np.sqrt((dens_dyn * (y_b - mean_dyn[:, None])**2).sum(axis=1) / norm_dyn)
+    width_exact = np.sqrt(np.cos(omega_t)**2 / squeeze + squeeze * np.sin(omega_t)**2) / np.sqrt(2)
+
+    col_w1, col_w2 = st.columns([2, 1])
+    with col_w1:
+        fig_w = go.Figure()
+        fig_w.add_trace(go.Scatter(x=t_fs, y=width_exact * x_scale_nm, mode='lines', name='Аналітично',
+                                   line=dict(color='gray', width=3)))
+        fig_w.add_trace(go.Scatter(x=t_fs, y=width_dyn * x_scale_nm, mode='markers', name='З кадрів',
+                                   marker=dict(color='red')))
+        fig_w.update_layout(title="Ширина пакета Δx(t)", xaxis_title="Час (t), фс", yaxis_title="Δx, нм", height=350)
+        st.plotly_chart(fig_w, use_container_width=True)
+    with col_w2:
+        st.metric("Захоплена норма базисом", f"{np.sum(np.abs(c_dyn)**2):.6f}",
+                  help="Σ|cₙ|² по 200 рівнях; близько до 1 - розклад точний.")
@@ -3,6 +3,34 @@ import numpy as np
 import plotly.graph_objects as go
 import scipy.constants as const
 
+from engines.tdse import gaussian_packet, density_frames, HBAR_EV_FS
+from engines.schrodinger import HBAR2_2M_EV_NM2
+from engines.animation import add_animation_controls, make_frames
+from engines.transfer_matrix import transmission, wavefunction, barrier_stack, discretize_potential
+from engines.expressions import evaluate_expression
+
+# --- Коефіцієнт проходження прямокутного бар'єру ---
+def barrier_transmission(E, V0, L, m=const.electron_mass):
+    """
+    Точний T для прямокутного бар'єру (SI: E, V0 в Дж, L в м). Векторизована версія:
+    E, V0, L можуть бути масивами сумісних форм (broadcast), напр. E[None, :] та L[:, None].
+    Для E > V0 κ стає уявним, і sinh²(κL)/(V0 - E) переходить у sin²(kL)/(E - V0).
+    """
+    E, V0, L = np.broadcast_arrays(np.asarray(E, dtype=float), np.asarray(V0, dtype=float),
+                                   np.asarray(L, dtype=float))
+    hbar = const.hbar
+    dV = V0 - E
+    kappa = np.sqrt(2 * m * np.abs(dV)) / hbar
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        shape = np.where(dV > 0, np.sinh(kappa * L)**2, np.sin(kappa * L)**2) / np.abs(dV)
+        # E = V0: границя sinh²(κL)/(V0 - E) -> 2mL²/ħ²
+        shape = np.where(np.abs(dV) <= 1e-12 * np.abs(V0), 2 * m * L**2 / hbar**2, shape)
+        T = 1.0 / (1.0 + V0**2 / (4 * E) * shape)
+
+    T = np.where(E > 0, np.nan_to_num(T, nan=0.0), 0.0)
+    return float(T) if T.ndim == 0 else T
+
 with st.container(border=True):
     st.title("👻 Квантове тунелювання через бар'єр")
     st.write("Візуалізація хвильової функції частинки, що налітає на потенційний бар'єр.")
@@ -35,6 +63,8 @@ with st.container(border=True):
         st.latex(r"T = \left[ 1 + \frac{V_0^2}{4 E (V_0 - E)} \sinh^2(\kappa L) \right]^{-1}")
         st.write("де $\kappa$ (коефіцієнт затухання) залежить від різниці енергій:")
         st.latex(r"\kappa = \frac{\sqrt{2m(V_0 - E)}}{\hbar}")
+        st.write("Для $E > V_0$ частинка проходить над бар'єром, але все одно частково відбивається:")
+        st.latex(r"T = \left[ 1 + \frac{V_0^2}{4 E (E - V_0)} \sin^2(k L) \right]^{-1}, \quad k = \frac{\sqrt{2m(E - V_0)}}{\hbar}")
 
     # --- Розрахункова частина ---
     m = const.electron_mass
@@ -43,15 +73,8 @@ with st.container(border=True):
     L = L_pm * 1e-12
     hbar = const.hbar
 
-    kappa = np.sqrt(2 * m * (V0 - E)) / hbar
-
     # Точна формула для коефіцієнта проходження (T)
-    numerator = V0**2
-    denominator_part = 4 * E * (V0 - E)
-    
-    # Використовуємо np.sinh для гіперболічного синуса
-    T_inv = 1 + (numerator / denominator_part) * (np.sinh(kappa * L)**2)
-    T = 1.0 / T_inv
+    T = barrier_transmission(E, V0, L)
 
     st.header("Ймовірність тунелювання")
     st.metric("Коефіцієнт проходження (T)", f"{T:.3e}",
@@ -60,24 +83,11 @@ with st.container(border=True):
     # --- Графік ---
     st.header("Візуалізація хвильової функції (Re[Ψ])")
     
-    k1 = np.sqrt(2 * m * E) / hbar
-
-    x_left = np.linspace(-L*2, 0, 100)
-    x_barrier = np.linspace(0, L, 50)
-    x_right = np.linspace(L, L*3, 100)
-
-    # Приблизні амплітуди для візуалізації
-    A_in = 1.0 # Вхідна хвиля
-    A_trans = np.sqrt(T) # Хвиля, що пройшла
-    A_refl = np.sqrt(1 - T) # Відбита хвиля
-
-    # Спрощена форма хвильової функції для візуалізації
-    psi_left = A_in * np.cos(k1 * x_left) - A_refl * np.cos(k1 * x_left) # Спрощена стояча хвиля
-    psi_barrier = A_in * np.exp(-kappa * x_barrier) * (0.5 * (1+np.sqrt(T)))
-    psi_right = A_trans * np.cos(k1 * (x_right - L))
-
-    x_plot = np.concatenate((x_left, x_barrier, x_right)) * 1e12
-    psi_plot = np.concatenate((psi_left, psi_barrier, psi_right))
+    # Точна Ψ(x) з амплітуд методу трансфер-матриць (хвиля одиничної амплітуди налітає зліва)
+    L_nm = L_pm * 1e-3
+    x_plot = np.linspace(-2 * L_pm, 3 * L_pm, 1000)
+    psi_complex = wavefunction(E_eV, [0.0, L_nm], [0.0, V0_eV, 0.0], x_plot * 1e-3)
+    psi_plot = psi_complex.real
 
     fig = go.Figure()
     
@@ -85,14 +95,14 @@ with st.container(border=True):
     fig.add_trace(go.Scatter(x=x_plot, y=psi_plot, mode='lines', name='Re[Ψ(x)]',
                               line=dict(color='blue', width=3)))
     
-    # Бар'єр (Potencial V(x))
-    # Малюємо бар'єр на рівні V0_eV, а хвильову функцію на умовному рівні 0.
-    # Для візуалізації хвилі над бар'єром ми просто масштабуємо її.
-    V_scale = np.max(np.abs(psi_plot)) / V0_eV
+    # Обвідна |Ψ(x)|: стала праворуч, експоненційне затухання в бар'єрі
+    fig.add_trace(go.Scatter(x=x_plot, y=np.abs(psi_complex), mode='lines', name='|Ψ(x)|',
+                              line=dict(color='black', width=1, dash='dot')))
     
     # Фон бар'єра
+    psi_lim = np.max(np.abs(psi_complex)) * 1.1
     fig.add_shape(type="rect",
-        x0=0, y0=V0_eV * 0.0, x1=L_pm, y1=V0_eV * 1.5,
+        x0=0, y0=-psi_lim, x1=L_pm, y1=psi_lim,
         line=dict(color="red", width=2, dash='dot'),
         fillcolor="rgba(255, 0, 0, 0.1)",
         layer="below"
@@ -104,9 +114,219 @@ with st.container(border=True):
                               name='Рівень енергії E'))
     
     fig.update_layout(
-        title="Реальна частина хвильової функції (спрощена візуалізація)",
+        title="Реальна частина хвильової функції (метод трансфер-матриць)",
         xaxis_title="Позиція (x), пм",
         yaxis_title="Амплітуда (умовні одиниці)",
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
     )
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.divider()
+
+    # --- СПЕКТРАЛЬНИЙ РЕЖИМ: T(E) ТА T(E, L) ---
+    st.header("📈 Спектр проходження T(E) та карта T(E, L)")
+    st.write("Та сама формула, але обчислена одразу для масивів енергій і ширин (включно з гілкою $E > V_0$).")
+
+    col_sp1, col_sp2 = st.columns(2)
+    with col_sp1:
+        E_factor = st.slider("Діапазон енергій: E ∈ [0, k·V₀], k =", 1.0, 5.0, 3.0, 0.5, key="tun_sp_k")
+    with col_sp2:
+        L_range_pm = st.slider("Діапазон ширин бар'єру (L), пм", 10, 1000, (10, 300), 10, key="tun_sp_L")
+
+    @st.cache_data(ttl=3600, max_entries=20)
+    def transmission_maps(V0_eV, E_factor, L_min_pm, L_max_pm, L_pm):
+        V0_J = V0_eV * const.electron_volt
+        E_curve = np.linspace(0.0, E_factor * V0_eV, 10000)[1:]
+        L_curves_pm = np.unique(np.concatenate((np.linspace(L_min_pm, L_max_pm, 4), [L_pm])))
+        # (ширини × енергії) одним broadcast-виразом
+        T_curves = barrier_transmission(E_curve[None, :] * const.electron_volt, V0_J,
+                                        L_curves_pm[:, None] * 1e-12)
+
+        E_map = np.linspace(0.0, E_factor * V0_eV, 500)[1:]
+        L_map_pm = np.linspace(L_min_pm, L_max_pm, 300)
+        T_map = barrier_transmission(E_map[None, :] * const.electron_volt, V0_J, L_map_pm[:, None] * 1e-12)
+        return E_curve, L_curves_pm, T_curves, E_map, L_map_pm, T_map
+
+    E_curve, L_curves_pm, T_curves, E_map, L_map_pm, T_map = transmission_maps(
+        V0_eV, E_factor, L_range_pm[0], L_range_pm[1], L_pm)
+
+    tab_curve, tab_map = st.tabs(["Криві T(E)", "Карта T(E, L)"])
+    with tab_curve:
+        fig_TE = go.Figure()
+        for L_c, T_c in zip(L_curves_pm, T_curves):
+            is_current = np.isclose(L_c, L_pm)
+            fig_TE.add_trace(go.Scatter(x=E_curve, y=T_c, mode='lines', name=f"L = {L_c:.0f} пм",
+                                        line=dict(width=4 if is_current else 2)))
+        fig_TE.add_vline(x=V0_eV, line_width=1, line_dash="dash", line_color="red",
+                         annotation_text="V₀", annotation_position="top")
+        fig_TE.add_vline(x=E_eV, line_width=1, line_dash="dot", line_color="green",
+                         annotation_text="E", annotation_position="bottom")
+        fig_TE.update_layout(xaxis_title="Енергія (E), еВ", yaxis_title="T", yaxis_type="log",
+                             title=f"T(E) для V₀ = {V0_eV} еВ")
+        st.plotly_chart(fig_TE, use_container_width=True)
+    with tab_map:
+        fig_map = go.Figure(data=go.Heatmap(
+            x=E_map, y=L_map_pm, z=np.log10(np.maximum(T_map, 1e-30)),
+            colorscale='viridis', colorbar=dict(title="log₁₀ T")))
+        fig_map.add_vline(x=V0_eV, line_width=1, line_dash="dash", line_color="red")
+        fig_map.update_layout(xaxis_title="Енергія (E), еВ", yaxis_title="Ширина бар'єру (L), пм",
+                              title="log₁₀ T(E, L)")
+        st.plotly_chart(fig_map, use_container_width=True)
+    st.info("Над бар'єром ($E > V_0$) T осцилює і досягає 1 при $kL = n\\pi$ - резонанси проходження.")
+
+    st.divider()
+
+    # --- АНІМАЦІЯ ХВИЛЬОВОГО ПАКЕТА ---
+    st.header("🎞️ Гауссів пакет налітає на бар'єр")
+    st.write("Нестаціонарне рівняння Шредінгера розв'язується методом розщеплення (split-step Fourier): "
+             "пакет частково відбивається, а частково просочується крізь бар'єр.")
+
+    col_wp1, col_wp2 = st.columns(2)
+    with col_wp1:
+        sigma_nm = st.slider("Ширина пакета (σ), нм", 0.2, 2.0, 1.0, 0.1, key="tun_wp_sigma",
+                             help="Ширший пакет має вужчий розкид енергій і ближчий до T(E).")
+    with col_wp2:
+        n_frames_wp = st.slider("Кількість кадрів", 20, 150, 60, 10, key="tun_wp_frames")
+
+    @st.cache_data(ttl=3600, max_entries=10)
+    def simulate_barrier_packet(E_eV, V0_eV, L_nm, sigma, n_frames):
+        k0 = np.sqrt(E_eV / HBAR2_2M_EV_NM2)
+        k_max = k0 + 5 / sigma
+        # Крок сітки має розділяти і бар'єр, і найкоротшу довжину хвилі пакета
+        dx = min(L_nm / 5, np.pi / (4 * k_max))
+        half = 25 * sigma
+        N = int(min(2**17, 2**np.ceil(np.log2(2 * half / dx))))
+        x = np.linspace(-half, half, N, endpoint=False)
+        V = np.where((x >= 0) & (x <= L_nm), V0_eV, 0.0)
+
+        x0 = -10 * sigma
+        v_group = 2 * HBAR2_2M_EV_NM2 * k0 / HBAR_EV_FS # нм/фс
+        t_total = 1.6 * abs(x0) / v_group
+        dt = 0.2 * HBAR_EV_FS / max(HBAR2_2M_EV_NM2 * k_max**2, V0_eV)
+        stride = max(1, int(t_total / dt) // (n_frames - 1))
+
+        plot_stride = max(1, N // 2000)
+        times, frames = density_frames(x, V, gaussian_packet(x, x0, sigma, k0), dt, n_frames, stride,
+                                       absorb=0.05, plot_stride=plot_stride)
+        x_plot = x[::plot_stride]
+        T_packet = frames[-1][x_plot > L_nm].sum() * (x[1] - x[0]) * plot_stride
+        return x_plot, times, frames, T_packet
+
+    with st.spinner("Розрахунок еволюції пакета..."):
+        x_wp, t_wp, frames_wp, T_packet = simulate_barrier_packet(E_eV, V0_eV, L_pm * 1e-3, sigma_nm, n_frames_wp)
+
+    col_t1, col_t2 = st.columns(2)
+    col_t1.metric("T для пакета (частка за бар'єром)", f"{T_packet:.3e}")
+    col_t2.metric("T(E) для плоскої хвилі", f"{T:.3e}",
+                  help="Пакет має розкид енергій, тому його T лише наближено дорівнює T(E).")
+
+    labels_wp = [f"{t:.2f} фс" for t in t_wp]
+    y_max_wp = float(frames_wp.max()) * 1.1
+    fig_wp = go.Figure()
+    fig_wp.add_trace(go.Scatter(x=x_wp, y=frames_wp[0], mode='lines', name='|Ψ(x,t)|²',
+                                line=dict(color='blue', width=2), fill='tozeroy'))
+    fig_wp.add_shape(type="rect", x0=0, y0=0, x1=L_pm * 1e-3, y1=y_max_wp,
+                     line=dict(color="red", width=2, dash='dot'),
+                     fillcolor="rgba(255, 0, 0, 0.2)", layer="below")
+    add_animation_controls(fig_wp, make_frames(frames_wp, labels_wp), labels_wp)
+    fig_wp.update_layout(
+        title=f"Еволюція пакета (E = {E_eV} еВ, V₀ = {V0_eV} еВ)",
+        xaxis_title="Позиція (x), нм",
+        yaxis_title="Густина ймовірності, 1/нм",
+        yaxis_range=[0, y_max_wp],
+        height=550
+    )
+    st.plotly_chart(fig_wp, use_container_width=True)
+
+    st.divider()
+
+    # --- БАГАТОБАР'ЄРНІ СТРУКТУРИ ---
+    st.header("🧱 Багатобар'єрні структури (метод трансфер-матриць)")
+    st.write("Потенціал розбивається на шари зі сталим V. У кожному шарі $\\Psi = A e^{ikx} + B e^{-ikx}$, "
+             "а умови неперервності Ψ та Ψ' на межах дають матрицю 2×2. Добуток матриць усіх шарів дає T(E) "
+             "одразу для всього спектра енергій.")
+
+    structure = st.radio("Структура",
+                         ["Подвійний бар'єр (резонансне тунелювання)", "Надґратка (N бар'єрів)",
+                          "Гладкий бар'єр (дискретизований)"],
+                         horizontal=True, key="tun_tm_kind")
+
+    col_tm1, col_tm2, col_tm3 = st.columns(3)
+    if structure == "Гладкий бар'єр (дискретизований)":
+        with col_tm1:
+            smooth_expr = st.text_input("V(x) в еВ, x в нм", "10*exp(-x**2/(2*0.1**2))", key="tun_tm_expr")
+        with col_tm2:
+            half_width_tm = st.slider("Область [-a, a], нм", 0.1, 5.0, 0.5, 0.1, key="tun_tm_a")
+        with col_tm3:
+            n_slices_tm = st.slider("Кількість шарів", 10, 1000, 200, 10, key="tun_tm_slices")
+        structure_params = (smooth_expr, half_width_tm, n_slices_tm)
+    else:
+        with col_tm1:
+            n_barriers_tm = 2 if structure.startswith("Подвійний") else st.slider(
+                "Кількість бар'єрів (N)", 2, 50, 10, key="tun_tm_N")
+            V0_tm = st.slider("Висота бар'єрів (V₀), еВ", 0.1, 20.0, 1.0, 0.1, key="tun_tm_V0")
+        with col_tm2:
+            width_tm = st.slider("Ширина бар'єру, нм", 0.05, 2.0, 0.3, 0.05, key="tun_tm_w")
+        with col_tm3:
+            gap_tm = st.slider("Ширина ями між бар'єрами, нм", 0.1, 5.0, 1.0, 0.1, key="tun_tm_gap")
+        structure_params = (n_barriers_tm, width_tm, gap_tm, V0_tm)
+
+    E_max_tm = st.slider("Максимальна енергія спектра, еВ", 0.1, 30.0, 3.0, 0.1, key="tun_tm_Emax")
+
+    @st.cache_data(ttl=3600, max_entries=20)
+    def build_structure(kind, params):
+        if kind == "Гладкий бар'єр (дискретизований)":
+            expr, a, n_slices = params
+            return discretize_potential(lambda xs: np.real(evaluate_expression(expr, x=xs)).astype(float),
+                                        -a, a, n_slices)
+        return barrier_stack(*params)
+
+    @st.cache_data(ttl=3600, max_entries=20)
+    def transmission_spectrum(kind, params, E_max, n_E=10000):
+        edges, V = build_structure(kind, params)
+        E_grid = np.linspace(E_max / n_E, E_max, n_E)
+        T_grid, R_grid = transmission(E_grid, edges, V)
+        return E_grid, T_grid, R_grid
+
+    try:
+        edges_tm, V_tm = build_structure(structure, structure_params)
+        E_tm, T_tm, R_tm = transmission_spectrum(structure, structure_params, E_max_tm)
+    except ValueError as err:
+        st.error(str(err))
+        st.stop()
+
+    fig_T = go.Figure()
+    fig_T.add_trace(go.Scatter(x=E_tm, y=T_tm, mode='lines', name='T(E)', line=dict(color='blue', width=2)))
+    fig_T.update_layout(
+        title="Спектр проходження T(E) (10⁴ енергій за один прохід)",
+        xaxis_title="Енергія (E), еВ",
+        yaxis_title="T",
+        yaxis_type="log" if st.checkbox("Логарифмічна шкала T", value=True, key="tun_tm_log") else "linear"
+    )
+    st.plotly_chart(fig_T, use_container_width=True)
+
+    # Ψ(x) для вибраної енергії: за замовчуванням - найвищий резонанс T
+    E_peak = float(E_tm[np.argmax(T_tm)])
+    E_psi = st.slider("Енергія для Ψ(x), еВ", float(E_tm[0]), float(E_max_tm), E_peak,
+                      float(E_max_tm) / 1000, key="tun_tm_Epsi", help="За замовчуванням - максимум T(E).")
+
+    span = edges_tm[-1] - edges_tm[0]
+    x_tm = np.linspace(edges_tm[0] - 0.3 * span, edges_tm[-1] + 0.3 * span, 3000)
+    psi_tm = wavefunction(E_psi, edges_tm, V_tm, x_tm)
+    region_tm = np.searchsorted(edges_tm, x_tm, side="right")
+
+    fig_psi_tm = go.Figure()
+    fig_psi_tm.add_trace(go.Scatter(x=x_tm, y=V_tm[region_tm], mode='lines', name='V(x), еВ',
+                                    line=dict(color='red', width=2), yaxis='y2'))
+    fig_psi_tm.add_trace(go.Scatter(x=x_tm, y=np.abs(psi_tm)**2, mode='lines', name='|Ψ(x)|²',
+                                    line=dict(color='blue', width=2), fill='tozeroy'))
+    fig_psi_tm.update_layout(
+        title=f"|Ψ(x)|² при E = {E_psi:.3f} еВ (T = {transmission(E_psi, edges_tm, V_tm)[0][0]:.3e})",
+        xaxis_title="Позиція (x), нм",
+        yaxis=dict(title="|Ψ|² (падаюча хвиля має амплітуду 1)"),
+        yaxis2=dict(title="V, еВ", overlaying='y', side='right', showgrid=False),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    st.plotly_chart(fig_psi_tm, use_container_width=True)
+    st.info("У подвійному бар'єрі при резонансних енергіях T досягає 1, хоча кожен бар'єр окремо майже непрозорий. "
+            "У надґратці резонанси зливаються в дозволені зони.")
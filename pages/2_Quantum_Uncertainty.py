@@ -4,6 +4,12 @@ import plotly.graph_objects as go
 from scipy.fft import fft, fftfreq, fftshift
 import scipy.constants as const
 
+from engines.tdse import gaussian_packet, density_frames, HBAR_EV_FS
+from engines.schrodinger import HBAR2_2M_EV_NM2
+from engines.animation import add_animation_controls, make_frames
+from engines.wavepackets import square_packet, double_gaussian, chirped_gaussian, uncertainty_moments
+from engines.expressions import evaluate_expression
+
 with st.container(border=True):
     st.title("🌊 Візуалізатор принципу невизначеності")
     st.write("Показує зв'язок між положенням (Δx) та імпульсом (Δp) частинки.")
@@ -113,4 +119,149 @@ with st.container(border=True):
         fig2.update_layout(xaxis_title="Імпульс (p), кг·м/с", yaxis_title="Ймовірність (умовні одиниці)")
         p_plot_range = delta_p_calc * 10
         fig2.update_xaxes(range=[-p_plot_range, p_plot_range])
-        st.plotly_chart(fig2, use_container_width=True)
\ No newline at end of file
+        st.plotly_chart(fig2, use_container_width=True)
+
+    st.divider()
+
+    # --- ДОВІЛЬНИЙ ХВИЛЬОВИЙ ПАКЕТ ---
+    st.header("🧪 Пакети довільної форми: чисельні Δx та Δp")
+    st.write("Невизначеності обчислюються з моментів розподілів: "
+             "$\\Delta x^2 = \\langle x^2 \\rangle - \\langle x \\rangle^2$ з $|\\Psi(x)|^2$ та "
+             "$\\Delta p^2 = \\hbar^2 (\\langle k^2 \\rangle - \\langle k \\rangle^2)$ з $|\\Phi(k)|^2$. "
+             "Лише гауссів пакет без чирпу досягає мінімуму ħ/2.")
+
+    packet_kind = st.radio("Форма пакета",
+                           ["Прямокутний", "Подвійний гаусс", "Гаусс з чирпом", "Власний вираз"],
+                           horizontal=True, key="unc_shape")
+
+    col_sh1, col_sh2, col_sh3 = st.columns(3)
+    with col_sh1:
+        if packet_kind == "Подвійний гаусс":
+            shape_param = st.slider("Відстань між центрами (в одиницях Δx)", 0.0, 20.0, 6.0, 0.5, key="unc_sep")
+        elif packet_kind == "Гаусс з чирпом":
+            shape_param = st.slider("Чирп (b)", 0.0, 10.0, 2.0, 0.1, key="unc_chirp",
+                                    help="Δx·Δp = (ħ/2)·√(1 + b²)")
+        elif packet_kind == "Власний вираз":
+            shape_param = st.text_input("Ψ(x), x в пм (можна комплексні: 1j)",
+                                        "exp(-abs(x)/20)", key="unc_expr")
+        else:
+            shape_param = None
+            st.write("Ширина прямокутника $a = 2\\sqrt{3}\\,\\Delta x$ - має ту саму Δx, що й гаусс вище.")
+    with col_sh2:
+        N_exp = st.select_slider("Точок сітки (N)", options=[2**p for p in range(11, 21)], value=2**14,
+                                 format_func=lambda v: f"2^{int(np.log2(v))} = {v}", key="unc_N")
+    with col_sh3:
+        use_float32 = st.checkbox("Одинарна точність (float32)", value=False, key="unc_f32",
+                                  help="Вдвічі менше пам'яті та швидші FFT на великих сітках.")
+
+    @st.cache_data(ttl=3600, max_entries=10)
+    def analyze_packet(kind, param, delta_x_pm, N, single):
+        dtype = np.float32 if single else np.float64
+        complex_dtype = np.complex64 if single else np.complex128
+        x_pm = np.linspace(-50 * delta_x_pm, 50 * delta_x_pm, N).astype(dtype)
+        if kind == "Прямокутний":
+            psi = square_packet(x_pm, 2 * np.sqrt(3) * delta_x_pm)
+        elif kind == "Подвійний гаусс":
+            psi = double_gaussian(x_pm, delta_x_pm, param * delta_x_pm)
+        elif kind == "Гаусс з чирпом":
+            psi = chirped_gaussian(x_pm, delta_x_pm, param)
+        else:
+            psi = evaluate_expression(param, x=x_pm)
+        # Вираз може дати bool, int чи float64 - явно приводимо до обраної точності
+        psi = np.asarray(psi).astype(complex_dtype if np.iscomplexobj(psi) else dtype)
+        if not np.all(np.isfinite(psi)) or not np.any(psi):
+            raise ValueError("Ψ(x) має бути скінченною та ненульовою на сітці.")
+
+        dx_pm, dk_pm, k_pm, prob_k = uncertainty_moments(x_pm, psi)
+        # Для графіків досить ~4000 точок
+        step_x = max(1, N // 4000)
+        step_k = max(1, k_pm.size // 4000)
+        prob_x = np.abs(psi[::step_x])**2
+        return (dx_pm, dk_pm, x_pm[::step_x], prob_x / prob_x.max(),
+                k_pm[::step_k], prob_k[::step_k] / prob_k.max(), np.isrealobj(psi))
+
+    try:
+        dx_num, dk_num, x_an, px_an, k_an, pk_an, used_rfft = analyze_packet(
+            packet_kind, shape_param, delta_x_pm, N_exp, use_float32)
+    except ValueError as err:
+        st.error(str(err))
+        st.stop()
+
+    # k в 1/пм -> p = ħk в кг·м/с
+    delta_x_num = dx_num * 1e-12
+    delta_p_num = const.hbar * dk_num * 1e12
+    ratio = delta_x_num * delta_p_num / hbar_2
+
+    col_r1, col_r2, col_r3 = st.columns(3)
+    col_r1.metric("Δx (чисельно)", f"{dx_num:.2f} пм")
+    col_r2.metric("Δp (чисельно)", f"{delta_p_num:.2e} кг·м/с")
+    col_r3.metric("Δx·Δp / (ħ/2)", f"{ratio:.3f}", help="1 - мінімальна невизначеність (лише гаусс).")
+    st.caption(f"Спектр обчислено через {'rfft (дійсна Ψ, лише k ≥ 0)' if used_rfft else 'повне fft (комплексна Ψ)'}, "
+               f"N = {N_exp}, {'float32' if use_float32 else 'float64'}.")
+    if packet_kind == "Прямокутний":
+        st.warning("У прямокутного пакета різкі краї, тому ⟨k²⟩ формально розбіжне: чисельна Δp зростає зі збільшенням N.")
+
+    col_g1, col_g2 = st.columns(2)
+    with col_g1:
+        fig_ax = go.Figure(go.Scatter(x=x_an, y=px_an, mode='lines', fill='tozeroy', line=dict(color='blue')))
+        fig_ax.update_layout(title="|Ψ(x)|² (нормовано на максимум)", xaxis_title="Положення (x), пм",
+                             xaxis_range=[-15 * delta_x_pm, 15 * delta_x_pm])
+        st.plotly_chart(fig_ax, use_container_width=True)
+    with col_g2:
+        p_an = const.hbar * k_an * 1e12
+        if used_rfft: # |Φ(-p)| = |Φ(p)|: дзеркалимо для відображення
+            p_an = np.concatenate((-p_an[:0:-1], p_an))
+            pk_an = np.concatenate((pk_an[:0:-1], pk_an))
+        fig_ap = go.Figure(go.Scatter(x=p_an, y=pk_an, mode='lines', fill='tozeroy', line=dict(color='red')))
+        fig_ap.update_layout(title="|Φ(p)|² (нормовано на максимум)", xaxis_title="Імпульс (p), кг·м/с",
+                             xaxis_range=[-8 * delta_p_num, 8 * delta_p_num])
+        st.plotly_chart(fig_ap, use_container_width=True)
+
+    st.divider()
+
+    # --- РОЗПЛИВАННЯ ПАКЕТА В ЧАСІ ---
+    st.header("🎞️ Розпливання вільного пакета")
+    st.write("Вузький у просторі пакет має широкий розподіл імпульсів, тому з часом швидко розпливається:")
+    st.latex(r"\Delta x(t) = \Delta x_0 \sqrt{1 + \left(\frac{\hbar t}{2 m \Delta x_0^2}\right)^2}")
+
+    n_frames_spread = st.slider("Кількість кадрів", 20, 150, 60, 10, key="unc_spread_frames")
+
+    @st.cache_data(ttl=3600, max_entries=10)
+    def simulate_free_spreading(sigma_nm, n_frames):
+        # Характерний час розпливання: Δx(τ) = √2·Δx₀
+        tau = HBAR_EV_FS * sigma_nm**2 / HBAR2_2M_EV_NM2
+        x_sp = np.linspace(-50 * sigma_nm, 50 * sigma_nm, 4096, endpoint=False)
+        # Для V = 0 метод розщеплення точний, тож достатньо одного кроку на кадр
+        times, frames = density_frames(x_sp, np.zeros_like(x_sp), gaussian_packet(x_sp, 0.0, sigma_nm, 0.0),
+                                       5 * tau / (n_frames - 1), n_frames, stride=1, plot_stride=2)
+        x_plot = x_sp[::2]
+        dx_plot = x_plot[1] - x_plot[0]
+        norm = frames.sum(axis=1) * dx_plot
+        spread = np.sqrt((frames * x_plot**2).sum(axis=1) * dx_plot / norm)
+        return x_plot, times, frames, spread, tau
+
+    sigma_nm = delta_x_pm * 1e-3
+    x_sp, t_sp, frames_sp, spread_sp = simulate_free_spreading(sigma_nm, n_frames_spread)[:4]
+    spread_theory = sigma_nm * np.sqrt(1 + (HBAR2_2M_EV_NM2 * t_sp / (HBAR_EV_FS * sigma_nm**2))**2)
+
+    col_sp1, col_sp2 = st.columns(2)
+    with col_sp1:
+        labels_sp = [f"{t * 1e3:.2f} ас" for t in t_sp]
+        fig_sp = go.Figure()
+        fig_sp.add_trace(go.Scatter(x=x_sp * 1e3, y=frames_sp[0], mode='lines', name='|Ψ(x,t)|²',
+                                    fill='tozeroy', line=dict(color='blue')))
+        add_animation_controls(fig_sp, make_frames(frames_sp, labels_sp), labels_sp)
+        fig_sp.update_layout(title="|Ψ(x,t)|²", xaxis_title="Положення (x), пм",
+                             yaxis_title="Густина ймовірності, 1/нм",
+                             xaxis_range=[-delta_x_pm * 15, delta_x_pm * 15],
+                             yaxis_range=[0, float(frames_sp[0].max()) * 1.1])
+        st.plotly_chart(fig_sp, use_container_width=True)
+    with col_sp2:
+        fig_dx = go.Figure()
+        fig_dx.add_trace(go.Scatter(x=t_sp * 1e3, y=spread_theory * 1e3, mode='lines', name='Аналітично',
+                                    line=dict(color='gray', width=3)))
+        fig_dx.add_trace(go.Scatter(x=t_sp * 1e3, y=spread_sp * 1e3, mode='markers', name='Чисельно',
+                                    marker=dict(color='red')))
+        fig_dx.update_layout(title="Ширина пакета Δx(t)", xaxis_title="Час (t), ас",
+                             yaxis_title="Δx, пм")
+        st.plotly_chart(fig_dx, use_container_width=True)
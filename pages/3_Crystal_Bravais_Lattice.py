@@ -2,6 +2,27 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 
+from engines.lattice import (CELLS, supercell, neighbour_shells, bond_pairs, bond_segments, perturb,
+                             radial_distribution, packing_fraction_mc)
+
+MAX_PLOT_ATOMS = 20000 # стільки атомів браузер ще обертає плавно
+
+
+@st.cache_data(ttl=3600, max_entries=10)
+def analyse_supercell(kind, n):
+    positions, box = supercell(kind, n)
+    radii, counts, _ = neighbour_shells(positions, box, n_shells=4, seed=0)
+    return positions, box, radii, counts
+
+
+@st.cache_data(ttl=3600, max_entries=10)
+def analyse_structure(kind, n, sigma, vacancy_fraction, r_max, radius, n_points, seed):
+    positions, box = supercell(kind, n)
+    positions = perturb(positions, box, sigma, vacancy_fraction, seed=seed)
+    r, g = radial_distribution(positions, box, r_max, seed=seed)
+    fraction, error = packing_fraction_mc(positions, box, radius, n_points=n_points, seed=seed)
+    return r, g, fraction, error
+
 with st.container(border=True):
     st.title("🧊 3D-Візуалізатор кубічних ґраток Браве")
     st.write("Показує розташування атомів та розраховує коефіцієнт пакування.")
@@ -75,15 +96,14 @@ with st.container(border=True):
         mode='markers', marker=dict(color='red', size=10, symbol='circle'), name='Атоми'
     ))
     
-    # Додаємо ребра куба
-    edges = [(0,1), (1,3), (3,2), (2,0), (4,5), (5,7), (7,6), (6,4), (0,4), (1,5), (2,6), (3,7)]
-    vertices = np.array([[0,0,0], [1,0,0], [0,1,0], [1,1,0], [0,0,1], [1,0,1], [0,1,1], [1,1,1]])
-    for edge in edges:
-        p1, p2 = vertices[edge[0]], vertices[edge[1]]
-        fig.add_trace(go.Scatter3d(
-            x=[p1[0], p2[0]], y=[p1[1], p2[1]], z=[p1[2], p2[2]],
-            mode='lines', line=dict(color='black', width=3), showlegend=False
-        ))
+    # Додаємо ребра куба (одна траса, відрізки розділені NaN)
+    edges = np.array([(0,1), (1,3), (3,2), (2,0), (4,5), (5,7), (7,6), (6,4), (0,4), (1,5), (2,6), (3,7)])
+    vertices = np.array([[0,0,0], [1,0,0], [0,1,0], [1,1,0], [0,0,1], [1,0,1], [0,1,1], [1,1,1]], dtype=float)
+    ex, ey, ez = bond_segments(vertices, edges)
+    fig.add_trace(go.Scatter3d(
+        x=ex, y=ey, z=ez,
+        mode='lines', line=dict(color='black', width=3), showlegend=False
+    ))
     
     fig.update_layout(
         title="Елементарна комірка",
@@ -97,4 +117,94 @@ with st.container(border=True):
     )
     st.plotly_chart(fig, use_container_width=True)
 
+    st.divider()
+
+    # --- ГЕНЕРАТОР СУПЕРКОМІРОК ---
+    st.header("🧱 Генератор суперкомірок")
+    st.write("Суперкомірка n×n×n будується векторно з базису комірки. Координаційні сфери знаходяться "
+             "чисельно за періодичним KD-деревом (`scipy.spatial.cKDTree`), а не беруться з таблиці.")
+
+    col_sc1, col_sc2 = st.columns(2)
+    sc_kind = col_sc1.selectbox("Структура", list(CELLS), format_func=lambda k: CELLS[k]["name"], key="bravais_sc_kind")
+    # Сфери рахуються лише до половини ящика (періодичні образи), n ≥ 5 вміщує перші 4 сфери для всіх ґраток
+    sc_n = col_sc2.slider("Розмір суперкомірки n (комірок по кожній осі)", 5, 60, 5, key="bravais_sc_n")
+
+    positions, box, radii, counts = analyse_supercell(sc_kind, sc_n)
+    if len(radii) == 0:
+        st.error("Суперкомірка замала: жодна координаційна сфера не вміщується в половину ящика.")
+        st.stop()
+    if len(radii) < 4:
+        st.caption(f"Показано лише сфери з r < {0.5 * box.min():.2f} a (половина найменшого розміру ящика).")
+
+    col_r1, col_r2, col_r3 = st.columns(3)
+    col_r1.metric("Атомів у суперкомірці", f"{len(positions):,}".replace(",", " "))
+    col_r2.metric("Координаційне число", f"{counts[0]:.0f}")
+    col_r3.metric("Відстань до найближчого сусіда", f"{radii[0]:.4f} a")
+
+    st.subheader("Координаційні сфери")
+    st.dataframe({
+        "Сфера": np.arange(1, len(radii) + 1),
+        "Радіус, a": np.round(radii, 4),
+        "Кількість сусідів": counts.astype(int),
+    }, use_container_width=True)
+
+    # Для великих суперкомірок малюємо лише кутовий блок, що вміщує MAX_PLOT_ATOMS атомів
+    atoms_per_cell = len(CELLS[sc_kind]["basis"])
+    n_view = max(1, min(sc_n, int((MAX_PLOT_ATOMS / atoms_per_cell) ** (1 / 3))))
+    view = np.all(positions < box / sc_n * n_view, axis=1)
+    view_positions = positions[view]
+    bx, by, bz = bond_segments(view_positions, bond_pairs(view_positions, radii[0]))
+    if n_view < sc_n:
+        st.caption(f"На графіку - блок {n_view}×{n_view}×{n_view} комірок ({len(view_positions)} атомів).")
+
+    fig_sc = go.Figure()
+    fig_sc.add_trace(go.Scatter3d(x=bx, y=by, z=bz, mode='lines', line=dict(color='gray', width=2), name='Зв\'язки'))
+    fig_sc.add_trace(go.Scatter3d(
+        x=view_positions[:, 0], y=view_positions[:, 1], z=view_positions[:, 2],
+        mode='markers', marker=dict(color='red', size=4 if len(view_positions) < 2000 else 2), name='Атоми'
+    ))
+    fig_sc.update_layout(scene=dict(aspectmode='data', xaxis_title='x, a', yaxis_title='y, a', zaxis_title='z, a'),
+                         margin=dict(l=0, r=0, b=0, t=40), height=600)
+    st.plotly_chart(fig_sc, use_container_width=True)
+
+    st.divider()
+
+    # --- РАДІАЛЬНА ФУНКЦІЯ РОЗПОДІЛУ ТА ПАКУВАННЯ ---
+    st.header("📈 Радіальна функція розподілу g(r) та коефіцієнт пакування")
+    st.write("g(r) - відносна густина атомів на відстані r від довільного атома. Для ідеальної ґратки це набір "
+             "піків на радіусах координаційних сфер; теплові зміщення їх розмивають, а при великих r g(r) → 1. "
+             "Коефіцієнт пакування оцінюється методом Монте-Карло: частка випадкових точок ящика, що потрапили "
+             "всередину хоча б однієї кулі радіуса R = r₁/2.")
+
+    col_g1, col_g2, col_g3 = st.columns(3)
+    sigma_rdf = col_g1.slider("Теплові зміщення σ, a", 0.0, 0.1, 0.0, 0.005, key="bravais_rdf_sigma")
+    vacancy_rdf = col_g2.slider("Частка вакансій, %", 0, 50, 0, key="bravais_rdf_vac") / 100
+    r_max_rdf = col_g3.slider("r макс, a", 0.5, 4.0, 2.5, 0.1, key="bravais_rdf_rmax")
+    n_points_mc = st.select_slider("Точок Монте-Карло", options=[10**4, 10**5, 10**6], value=10**5,
+                                   format_func=lambda v: f"{v:.0e}", key="bravais_rdf_points")
+
+    r_rdf, g_rdf, apf_mc, apf_err = analyse_structure(sc_kind, sc_n, sigma_rdf, vacancy_rdf, r_max_rdf,
+                                                      radii[0] / 2, n_points_mc, 0)
+    if r_rdf[-1] < r_max_rdf * 0.99:
+        st.caption(f"r обмежено половиною розміру суперкомірки ({r_rdf[-1]:.2f} a) - збільште n.")
+
+    fig_rdf = go.Figure()
+    fig_rdf.add_trace(go.Scatter(x=r_rdf, y=g_rdf, mode='lines', name='g(r)', line=dict(color='royalblue')))
+    for r_shell in radii:
+        if r_shell <= r_rdf[-1]:
+            fig_rdf.add_vline(x=r_shell, line_dash="dot", line_color="gray")
+    fig_rdf.add_hline(y=1, line_dash="dash", line_color="red")
+    fig_rdf.update_layout(xaxis_title="r, a", yaxis_title="g(r)", height=400)
+    st.plotly_chart(fig_rdf, use_container_width=True)
+
+    # Табличні значення APF для кубічних ґраток - з params вище, для ГЩУ та алмазу - аналітичні
+    table_key = {"SC": 'ПК', "BCC": 'ОЦК', "FCC": 'ГЦК'}.get(sc_kind)
+    apf_ref = params[table_key]['apf'] if table_key else CELLS[sc_kind]["apf"]
+    apf_expected = apf_ref * (1 - vacancy_rdf)
 
+    col_p1, col_p2, col_p3 = st.columns(3)
+    col_p1.metric("APF (Монте-Карло)", f"{apf_mc * 100:.2f} ± {apf_err * 100:.2f} %")
+    col_p2.metric("APF (теорія)", f"{apf_ref * 100:.2f} %")
+    col_p3.metric("Теорія × (1 - вакансії)", f"{apf_expected * 100:.2f} %",
+                  delta=f"{(apf_mc - apf_expected) * 100:+.2f} %", delta_color="off",
+                  help="Теплові зміщення дають перекриття куль, тож APF стає трохи меншим.")
@@ -1,12 +1,29 @@
+import io
+
 import streamlit as st
 import numpy as np
+import plotly.graph_objects as go
+
+from engines.batch_calc import to_csv_bytes
+from engines.lattice import CELLS
+from engines.miller import parse_intercept, miller_from_intercepts, miller_indices
+from engines.xrd import CUBIC_KINDS, powder_peaks, broadened_pattern
+
+# Типові рентгенівські трубки: лінія Kα1, Å
+XRAY_SOURCES = {"Cu Kα (1.5406 Å)": 1.5406, "Mo Kα (0.7093 Å)": 0.7093, "Co Kα (1.7890 Å)": 1.7890,
+                "Власна довжина хвилі": None}
+
+
+@st.cache_data(ttl=3600, max_entries=50)
+def get_powder_peaks(kind, a, wavelength, h_max, b_factor):
+    return powder_peaks(kind, a, wavelength, h_max, b_factor)
 
 with st.container(border=True):
     st.title("🔬 Калькулятори рентгенівської дифракції")
     st.write("Розрахунок параметрів дифракції та кристалічної ґратки.")
     
     # --- Створюємо дві вкладки ---
-    tab1, tab2 = st.tabs(["Закон Брегга", "Індекси Міллера (для куб. ґраток)"])
+    tab1, tab2, tab3 = st.tabs(["Закон Брегга", "Індекси Міллера (для куб. ґраток)", "Порошкова дифрактограма"])
 
     # --- Вкладка 1: Закон Брегга ---
     with tab1:
@@ -115,7 +132,7 @@ with st.container(border=True):
         st.divider()
         
         st.subheader("Калькулятор індексів Міллера")
-        st.write("Знаходить (hkl) за перетинами з осями. Введіть 'inf' для нескінченності.")
+        st.write("Знаходить (hkl) за перетинами з осями. Введіть 'inf' для нескінченності; можна вводити дроби, напр. '2/3'.")
         col1, col2, col3 = st.columns(3)
         int_a_str = col1.text_input("Перетин по 'a'", value="1.0", key="miller_inta")
         int_b_str = col2.text_input("Перетин по 'b'", value="inf", key="miller_intb")
@@ -123,65 +140,99 @@ with st.container(border=True):
         
         if st.button("Розрахувати (hkl)", key="miller_button"):
             try:
-                def parse_intercept(s):
-                    s_low = s.strip().lower()
-                    if s_low == 'inf' or s_low == 'infinity':
-                        return np.inf
-                    val = float(s)
-                    if val == 0: raise ValueError("Перетин 0")
-                    return val
-                
-                int_a = parse_intercept(int_a_str)
-                int_b = parse_intercept(int_b_str)
-                int_c = parse_intercept(int_c_str)
-
-                # 1. Знаходимо обернені величини, обробляючи нескінченність
-                inv_a = 0.0 if np.isinf(int_a) else 1.0 / int_a
-                inv_b = 0.0 if np.isinf(int_b) else 1.0 / int_b
-                inv_c = 0.0 if np.isinf(int_c) else 1.0 / int_c
-                
-                norm_float = np.array([inv_a, inv_b, inv_c])
-                
-                # Перевірка на (0, 0, 0)
-                if np.all(norm_float == 0):
-                    st.error("Неможливо розрахувати: усі перетини нескінченні (не визначають площину).")
-                else:
-                    # 2. Знаходимо найменше спільне кратне для нормалізації
-                    # Використовуємо функцію для знаходження множника, щоб звести до цілих
-                    
-                    # Видаляємо нульові елементи для знаходження GCD
-                    non_zero_norm = norm_float[norm_float != 0]
-
-                    if len(non_zero_norm) > 0:
-                        # Знаходимо множник для переведення в цілі (простий метод)
-                        # Ми шукаємо найменше число, яке робить усі дроби цілими
-                        
-                        # 3. Використовуємо простий множник (1/мінімальний ненульовий дріб) для зведення до найменших цілих
-                        
-                        # Використовуємо максимальний елемент для нормалізації до 1
-                        max_abs_norm = np.max(np.abs(non_zero_norm))
-                        temp_norm = norm_float / max_abs_norm
-
-                        # Знаходимо GCD для обернених чисел, щоб знайти загальний множник
-                        multiplier = 1
-                        for i in range(1, 100): # Шукаємо до 100
-                            # Перевіряємо, чи є числа цілими
-                            if np.all(np.isclose(temp_norm * i, np.round(temp_norm * i))):
-                                multiplier = i
-                                break
-                        
-                        h, k, l = np.round(temp_norm * multiplier).astype(int)
-                        
-                        # Перевірка, чи не отримали ми (0, 0, 0) після округлення (мало ймовірно, але можливо)
-                        if h == 0 and k == 0 and l == 0:
-                            st.error("Помилка нормалізації. Спробуйте інший ввід.")
-                        else:
-                            st.success(f"### Індекси Міллера: $({h}, {k}, {l})$")
+                intercepts = [parse_intercept(text) for text in (int_a_str, int_b_str, int_c_str)]
+                h, k, l = miller_from_intercepts(intercepts)
+                st.success(f"### Індекси Міллера: $({h}, {k}, {l})$")
 
             except ValueError as e:
                 if "Перетин 0" in str(e):
                     st.error("Перетин не може бути 0. Площина не може проходити через початок координат.")
+                elif "нескінченні" in str(e):
+                    st.error("Неможливо розрахувати: усі перетини нескінченні (не визначають площину).")
                 else:
-                    st.error(f"Неправильний ввід. Введіть число (напр., '1.5') або 'inf'.")
+                    st.error(f"Неправильний ввід. Введіть число (напр., '1.5'), дріб ('2/3') або 'inf'.")
             except Exception as e:
                 st.error(f"Виникла невідома помилка: {e}")
+
+        st.divider()
+
+        st.subheader("Пакетний розрахунок індексів")
+        st.write("Кожен рядок - три перетини через кому ('inf' для нескінченності). Усі площини обробляються "
+                 "одним викликом: перетини зводяться до дробів з точністю введення, а далі НСК/НСД рахуються для всіх рядків одразу.")
+        batch_text = st.text_area("Перетини (a, b, c)", value="1, 2, inf\n0.5, 0.5, 1\n1, -1, inf\n3, 4, 5\n0.333, inf, inf",
+                                  height=150, key="miller_batch_text")
+        try:
+            intercepts_batch = np.genfromtxt(io.StringIO(batch_text), delimiter=",", dtype=float, ndmin=2)
+            if intercepts_batch.shape[1] != 3:
+                raise ValueError("Потрібно рівно три стовпці")
+        except ValueError:
+            st.error("Кожен рядок має містити рівно три числа через кому.")
+        else:
+            hkl_batch = miller_indices(intercepts_batch)
+            invalid = np.all(hkl_batch == 0, axis=1)
+            result = {"a": intercepts_batch[:, 0], "b": intercepts_batch[:, 1], "c": intercepts_batch[:, 2],
+                      "h": hkl_batch[:, 0], "k": hkl_batch[:, 1], "l": hkl_batch[:, 2]}
+            if invalid.any():
+                st.warning(f"{int(invalid.sum())} рядків з нульовим, нечисловим або лише нескінченними перетинами - індекси (0, 0, 0).")
+            st.dataframe({name: values[:1000] for name, values in result.items()}, use_container_width=True, height=250)
+            st.download_button("⬇️ Завантажити результат", data=to_csv_bytes(result), file_name="miller_indices.csv",
+                               mime="text/csv", key="miller_batch_download")
+
+    # --- Вкладка 3: Порошкова дифрактограма ---
+    with tab3:
+        st.header("Порошкова рентгенограма")
+
+        # --- БЛОК ТЕОРІЇ ---
+        with st.expander("📖 Відкрити теорію та формули", expanded=False):
+            st.write("У порошку присутні всі орієнтації кристалітів, тому кожна система площин $(hkl)$ дає кільце "
+                     "під кутом $2\\theta$ з закону Брегга. Інтенсивність лінії:")
+            st.latex(r"I \propto p_{hkl}\,|F_{hkl}|^2 \cdot \frac{1 + \cos^2 2\theta}{\sin^2\theta \cos\theta} \cdot e^{-2B (\sin\theta / \lambda)^2}")
+            st.latex(r"F_{hkl} = \sum_j f_j\, e^{2\pi i (h x_j + k y_j + l z_j)}")
+            st.markdown("""
+            * $p_{hkl}$ — кратність (кількість еквівалентних площин з однаковим $d$)
+            * $F_{hkl}$ — структурний фактор; $F = 0$ дає систематичні згасання (напр., в ОЦК лише $h + k + l$ парне)
+            * Другий множник — фактор Лоренца-поляризації, третій — ефективний B-фактор
+            """)
+
+        col_x1, col_x2, col_x3 = st.columns(3)
+        xrd_kind = col_x1.selectbox("Ґратка", CUBIC_KINDS, index=2, format_func=lambda k: CELLS[k]["name"], key="xrd_kind")
+        xrd_a = col_x2.number_input("Параметр ґратки (a), Å", min_value=0.5, value=3.615, format="%.4f", key="xrd_a")
+        xrd_source = col_x3.selectbox("Джерело", list(XRAY_SOURCES), key="xrd_source")
+        if XRAY_SOURCES[xrd_source] is None:
+            xrd_lam = st.number_input("Довжина хвилі (λ), Å", min_value=0.1, value=1.54, key="xrd_lam")
+        else:
+            xrd_lam = XRAY_SOURCES[xrd_source]
+
+        col_x4, col_x5, col_x6 = st.columns(3)
+        xrd_hmax = col_x4.slider("Максимальний індекс |h|, |k|, |l|", 2, 20, 10, key="xrd_hmax")
+        xrd_B = col_x5.slider("Ефективний B-фактор, Å²", 0.0, 8.0, 4.0, 0.5, key="xrd_B")
+        xrd_fwhm = col_x6.slider("Ширина піків (FWHM), °", 0.02, 2.0, 0.2, 0.02, key="xrd_fwhm")
+
+        peaks = get_powder_peaks(xrd_kind, xrd_a, xrd_lam, xrd_hmax, xrd_B)
+        if peaks["two_theta"].size == 0:
+            st.error("Жодне відбиття не задовольняє умову Брегга (λ > 2d). Зменшіть λ або збільшіть a.")
+        else:
+            grid = np.linspace(5, 175, 8000)
+            profile = broadened_pattern(peaks["two_theta"], peaks["intensity"], grid, xrd_fwhm, normalize=True)
+            labels = ["(" + " ".join(map(str, hkl)) + ")" for hkl in peaks["hkl"]]
+
+            fig_xrd = go.Figure()
+            fig_xrd.add_trace(go.Scatter(x=grid, y=profile, mode='lines', name='Профіль',
+                                         line=dict(color='royalblue')))
+            fig_xrd.add_trace(go.Bar(x=peaks["two_theta"], y=peaks["intensity"], width=0.15, name='Лінії',
+                                     marker_color='red', opacity=0.5, hovertext=labels))
+            strongest = np.argsort(peaks["intensity"])[-12:] # підписуємо найсильніші лінії
+            for i in strongest:
+                fig_xrd.add_annotation(x=peaks["two_theta"][i], y=peaks["intensity"][i], text=labels[i],
+                                       showarrow=False, yshift=10, font=dict(size=10))
+            fig_xrd.update_layout(xaxis_title="2θ, градуси", yaxis_title="Відносна інтенсивність", height=450,
+                                  bargap=0)
+            st.plotly_chart(fig_xrd, use_container_width=True)
+
+            st.dataframe({
+                "(hkl)": labels,
+                "2θ, °": np.round(peaks["two_theta"], 3),
+                "d, Å": np.round(peaks["d"], 4),
+                "Кратність": peaks["multiplicity"],
+                "I, %": np.round(peaks["intensity"], 1),
+            }, use_container_width=True, height=300)
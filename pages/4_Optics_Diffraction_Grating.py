@@ -2,36 +2,32 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 
-# --- Функція для кольору ---
-def wavelength_to_hex(nm):
-    gamma = 0.8
-    intensity_max = 255
-    factor = 0.0
-    R, G, B = 0, 0, 0
-    if 380 <= nm <= 439:
-        R = -(nm - 440) / (440 - 380); G = 0.0; B = 1.0
-    elif 440 <= nm <= 489:
-        R = 0.0; G = (nm - 440) / (490 - 440); B = 1.0
-    elif 490 <= nm <= 509:
-        R = 0.0; G = 1.0; B = -(nm - 510) / (510 - 490)
-    elif 510 <= nm <= 579:
-        R = (nm - 510) / (580 - 510); G = 1.0; B = 0.0
-    elif 580 <= nm <= 644:
-        R = 1.0; G = -(nm - 645) / (645 - 580); B = 0.0
-    elif 645 <= nm <= 780:
-        R = 1.0; G = 0.0; B = 0.0
-    if 380 <= nm <= 419:
-        factor = 0.3 + 0.7 * (nm - 380) / (420 - 380)
-    elif 420 <= nm <= 644:
-        factor = 1.0
-    elif 645 <= nm <= 780:
-        factor = 0.3 + 0.7 * (780 - nm) / (780 - 645)
-    else:
-        factor = 0.0
-    R = int(intensity_max * (R * factor)**gamma)
-    G = int(intensity_max * (G * factor)**gamma)
-    B = int(intensity_max * (B * factor)**gamma)
-    return f'#{R:02x}{G:02x}{B:02x}'
+from engines.blackbody import WHITE_SOURCES, source_spectrum
+from engines.colour import VISIBLE_NM, white_light_screen, wavelength_to_hex
+from engines.fraunhofer import slits_far_field
+
+
+@st.cache_data(ttl=3600)
+def compute_grating_fft(N, a_m, d_m, h_m, lambda_m, L_m, y_max_m, size):
+    """Ґратка з N щілин скінченної ширини: 1D профіль і 2D картина через FFT апертури."""
+    return slits_far_field(N, a_m, d_m, h_m, lambda_m, L_m, y_max_m, size)
+
+
+@st.cache_data(ttl=3600)
+def compute_white_grating(N, d_m, L_m, y_max_m, source, T_K, n_lambda, n_points=1500):
+    """
+    Картина ґратки в білому світлі: інтенсивність для всіх λ одразу - масив (λ × y) -
+    зважується спектром джерела і перетворюється на колір через функції CIE.
+    """
+    wavelength_nm = np.linspace(*VISIBLE_NM, n_lambda)
+    y = np.linspace(-y_max_m, y_max_m, n_points)
+    alpha = np.pi * d_m * y[None, :] / (wavelength_nm[:, None] * 1e-9 * L_m)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        intensity = (np.sin(N * alpha) / np.sin(alpha))**2
+    intensity = np.nan_to_num(intensity, nan=N**2, posinf=N**2, neginf=N**2) / N**2
+    rgb, total = white_light_screen(intensity, wavelength_nm, source_spectrum(source, wavelength_nm, T_K))
+    return y, rgb, total
+
 
 # --- Основна частина програми ---
 with st.container(border=True):
@@ -127,4 +123,79 @@ with st.container(border=True):
         yaxis_title="Інтенсивність (I / I_max)",
         height=500
     )
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig, use_container_width=True)
+
+    # --- FFT: ҐРАТКА ЗІ ЩІЛИНАМИ СКІНЧЕННОЇ ШИРИНИ ---
+    st.divider()
+    st.header("Щілини скінченної ширини (FFT апертури)")
+    st.write(
+        "Вище дифракцією на окремій щілині знехтувано. Якщо щілини мають ширину a, головні максимуми "
+        "модулюються обвідною sinc², а порядки, що потрапляють на її нулі (d/a - ціле), зникають. "
+        "Тут інтенсивність рахується як |FFT|² растеризованої ґратки - 1D профіль і 2D картина на екрані."
+    )
+    fcol1, fcol2 = st.columns(2)
+    with fcol1:
+        fill = st.slider("Частка прозорої щілини (a/d)", min_value=0.05, max_value=0.95, value=0.3, step=0.05,
+                         key="grating_fft_fill", help="При a/d = 1/m зникає m-й порядок")
+    with fcol2:
+        fft_size = st.select_slider("Розмір 2D FFT", options=[1024, 2048, 4096], value=2048,
+                                    key="grating_fft_size")
+
+    a_m = fill * d_m
+    y_fft, I_fft, coords, image = compute_grating_fft(N, a_m, d_m, 20 * d_m, lambda_m, L_m, y_max_m, fft_size)
+
+    fig_fft = go.Figure()
+    fig_fft.add_trace(go.Scatter(x=y_fft * 1000, y=I_fft, mode='lines', name='FFT апертури',
+                                 line=dict(color=color_hex, width=3), fill='tozeroy'))
+    fig_fft.add_trace(go.Scatter(x=y_fft * 1000, y=np.sinc(a_m * y_fft / (lambda_m * L_m))**2, mode='lines',
+                                 name='Обвідна sinc²', line=dict(color="white", width=1, dash="dot")))
+    fig_fft.update_layout(
+        title=f"N = {N}, a = {a_m * 1e6:.2f} мкм, d = {d_um} мкм",
+        xaxis_title="Позиція на екрані (y), мм", yaxis_title="Інтенсивність (I / I_max)", height=450
+    )
+    st.plotly_chart(fig_fft, use_container_width=True)
+
+    fig_2d = go.Figure(go.Heatmap(x=coords * 1000, y=coords * 1000, z=np.sqrt(image),
+                                  colorscale=[[0, "black"], [1, color_hex]], showscale=False))
+    fig_2d.update_layout(
+        title=f"Картина на екрані (2D FFT {fft_size}², яскравість ∝ √I)",
+        xaxis_title="y, мм", yaxis_title="z (уздовж щілин), мм", yaxis=dict(scaleanchor="x"), height=550
+    )
+    st.plotly_chart(fig_2d, use_container_width=True)
+
+    # --- БІЛЕ СВІТЛО ---
+    st.divider()
+    st.header("Біле світло: спектри різних порядків")
+    st.write(
+        "Ґратка розкладає біле світло: положення максимуму m-го порядку y = mλL/d залежить від λ, тому кожен "
+        "порядок, крім нульового, - це веселка. Інтенсивність рахується одразу для сотень довжин хвиль "
+        "як масив (λ × y), зважується спектром джерела, а колір точки екрана визначають функції узгодження кольорів CIE 1931."
+    )
+    wcol1, wcol2, wcol3 = st.columns(3)
+    with wcol1:
+        source = st.selectbox("Джерело", WHITE_SOURCES, key="grating_white_source")
+    with wcol2:
+        T_K = st.slider("Температура джерела (T), К", min_value=1500, max_value=12000, value=5778, step=100,
+                        key="grating_white_T", disabled=source != WHITE_SOURCES[0])
+    with wcol3:
+        n_lambda = st.slider("Кількість довжин хвиль", min_value=50, max_value=800, value=300, step=50,
+                             key="grating_white_n")
+
+    y_white_m = 3 * VISIBLE_NM[1] * 1e-9 * L_m / d_m # до 3-го порядку червоного краю
+    y_w, rgb, total = compute_white_grating(N, d_m, L_m, y_white_m, source, T_K, n_lambda)
+
+    fig_white = go.Figure(go.Image(z=np.repeat(rgb[None, :, :], 80, axis=0),
+                                   x0=y_w[0] * 1000, dx=(y_w[1] - y_w[0]) * 1000))
+    fig_white.update_layout(
+        title="Вигляд екрана (колір sRGB)", xaxis_title="Позиція на екрані (y), мм",
+        yaxis=dict(visible=False), height=250
+    )
+    st.plotly_chart(fig_white, use_container_width=True)
+
+    fig_total = go.Figure(go.Scatter(x=y_w * 1000, y=total, mode='lines', name='Сумарна інтенсивність',
+                                     line=dict(color="white", width=2), fill='tozeroy'))
+    fig_total.update_layout(
+        title="Сумарна інтенсивність, зважена спектром джерела",
+        xaxis_title="Позиція на екрані (y), мм", yaxis_title="Інтенсивність (відн. од.)", height=350
+    )
+    st.plotly_chart(fig_total, use_container_width=True)
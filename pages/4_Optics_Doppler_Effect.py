@@ -3,40 +3,11 @@ import numpy as np
 import plotly.graph_objects as go
 import scipy.constants as const
 
+from engines.colour import wavelength_to_hex
+
 # --- Фізичні константи ---
 c = const.c # Швидкість світла (м/с)
 
-# --- Функція для кольору (та сама, що й раніше) ---
-def wavelength_to_hex(nm):
-    gamma = 0.8
-    intensity_max = 255
-    factor = 0.0
-    R, G, B = 0, 0, 0
-    if 380 <= nm <= 439:
-        R = -(nm - 440) / (440 - 380); G = 0.0; B = 1.0
-    elif 440 <= nm <= 489:
-        R = 0.0; G = (nm - 440) / (490 - 440); B = 1.0
-    elif 490 <= nm <= 509:
-        R = 0.0; G = 1.0; B = -(nm - 510) / (510 - 490)
-    elif 510 <= nm <= 579:
-        R = (nm - 510) / (580 - 510); G = 1.0; B = 0.0
-    elif 580 <= nm <= 644:
-        R = 1.0; G = -(nm - 645) / (645 - 580); B = 0.0
-    elif 645 <= nm <= 780:
-        R = 1.0; G = 0.0; B = 0.0
-    if 380 <= nm <= 419:
-        factor = 0.3 + 0.7 * (nm - 380) / (420 - 380)
-    elif 420 <= nm <= 644:
-        factor = 1.0
-    elif 645 <= nm <= 780:
-        factor = 0.3 + 0.7 * (780 - nm) / (780 - 645)
-    else:
-        factor = 0.0
-    R = int(intensity_max * (R * factor)**gamma)
-    G = int(intensity_max * (G * factor)**gamma)
-    B = int(intensity_max * (B * factor)**gamma)
-    return f'#{R:02x}{G:02x}{B:02x}'
-
 # --- Основна частина програми ---
 with st.container(border=True):
     st.title("🚑 Ефект Доплера (для світла)")
@@ -2,52 +2,30 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 
-# --- Функція для перетворення довжини хвилі (нм) у колір (HEX) для візуалізації ---
-def wavelength_to_hex(nm):
-    gamma = 0.8
-    intensity_max = 255
-    factor = 0.0
-    R, G, B = 0, 0, 0
-
-    if 380 <= nm <= 439:
-        R = -(nm - 440) / (440 - 380)
-        G = 0.0
-        B = 1.0
-    elif 440 <= nm <= 489:
-        R = 0.0
-        G = (nm - 440) / (490 - 440)
-        B = 1.0
-    elif 490 <= nm <= 509:
-        R = 0.0
-        G = 1.0
-        B = -(nm - 510) / (510 - 490)
-    elif 510 <= nm <= 579:
-        R = (nm - 510) / (580 - 510)
-        G = 1.0
-        B = 0.0
-    elif 580 <= nm <= 644:
-        R = 1.0
-        G = -(nm - 645) / (645 - 580)
-        B = 0.0
-    elif 645 <= nm <= 780:
-        R = 1.0
-        G = 0.0
-        B = 0.0
-
-    if 380 <= nm <= 419:
-        factor = 0.3 + 0.7 * (nm - 380) / (420 - 380)
-    elif 420 <= nm <= 644:
-        factor = 1.0
-    elif 645 <= nm <= 780:
-        factor = 0.3 + 0.7 * (780 - nm) / (780 - 645)
-    else:
-        factor = 0.0
-
-    R = int(intensity_max * (R * factor)**gamma)
-    G = int(intensity_max * (G * factor)**gamma)
-    B = int(intensity_max * (B * factor)**gamma)
-    
-    return f'#{R:02x}{G:02x}{B:02x}'
+from engines.blackbody import WHITE_SOURCES, source_spectrum
+from engines.colour import VISIBLE_NM, white_light_screen, wavelength_to_hex
+from engines.fraunhofer import slits_far_field
+
+
+@st.cache_data(ttl=3600)
+def compute_young_fft(a_m, d_m, h_m, lambda_m, L_m, y_max_m, size):
+    """Дві щілини скінченної ширини та висоти: 1D профіль і 2D картина через FFT апертури."""
+    return slits_far_field(2, a_m, d_m, h_m, lambda_m, L_m, y_max_m, size)
+
+
+@st.cache_data(ttl=3600)
+def compute_white_young(a_m, d_m, L_m, y_max_m, source, T_K, n_lambda, n_points=1500):
+    """
+    Дослід Юнга в білому світлі: cos²·sinc² для всіх λ одразу - масив (λ × y) -
+    зважується спектром джерела і перетворюється на колір через функції CIE.
+    """
+    wavelength_nm = np.linspace(*VISIBLE_NM, n_lambda)
+    y = np.linspace(-y_max_m, y_max_m, n_points)
+    u = y[None, :] / (wavelength_nm[:, None] * 1e-9 * L_m)
+    intensity = np.cos(np.pi * d_m * u)**2 * np.sinc(a_m * u)**2
+    rgb, total = white_light_screen(intensity, wavelength_nm, source_spectrum(source, wavelength_nm, T_K))
+    return y, rgb, total
+
 
 # --- Основна частина програми ---
 with st.container(border=True):
@@ -143,4 +121,85 @@ with st.container(border=True):
         yaxis_title="Інтенсивність (I/I_max)",
         height=400
     )
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig, use_container_width=True)
+
+    # --- FFT: ЩІЛИНИ СКІНЧЕННОЇ ШИРИНИ ---
+    st.divider()
+    st.header("Щілини скінченного розміру (FFT апертури)")
+    st.write(
+        "Формула cos² вважає щілини нескінченно вузькими. Реальні щілини ширини a додають дифракційну "
+        "обвідну sinc², а скінченна висота h розмиває смуги по вертикалі. Обидва ефекти дає 2D перетворення "
+        "Фур'є функції пропускання двох щілин, без окремих формул."
+    )
+    fcol1, fcol2, fcol3 = st.columns(3)
+    with fcol1:
+        a_um = st.slider("Ширина щілини (a), мкм", min_value=0.5, max_value=float(max(d_um - 0.5, 1.0)),
+                         value=float(min(20.0, max(d_um - 0.5, 1.0))), step=0.5, key="young_fft_a")
+    with fcol2:
+        h_um = st.slider("Висота щілини (h), мкм", min_value=10, max_value=1000, value=200, step=10,
+                         key="young_fft_h")
+    with fcol3:
+        fft_size = st.select_slider("Розмір 2D FFT", options=[1024, 2048, 4096], value=2048,
+                                    key="young_fft_size")
+
+    a_m = a_um * 1e-6
+    y_fft, I_fft, coords, image = compute_young_fft(a_m, d_m, h_um * 1e-6, lambda_m, L_m, y_max_m, fft_size)
+    envelope = np.sinc(a_m * y_fft / (lambda_m * L_m))**2
+
+    fig_fft = go.Figure()
+    fig_fft.add_trace(go.Scatter(x=y_fft * 1000, y=I_fft, mode='lines', name='FFT апертури',
+                                 line=dict(color=color_hex, width=3)))
+    fig_fft.add_trace(go.Scatter(x=y_fft * 1000, y=np.cos(np.pi * d_m * y_fft / (lambda_m * L_m))**2 * envelope,
+                                 mode='lines', name='cos² · sinc²', line=dict(color="white", width=1, dash="dot")))
+    fig_fft.add_trace(go.Scatter(x=y_fft * 1000, y=envelope, mode='lines', name='Обвідна sinc²',
+                                 line=dict(color="gray", width=1, dash="dash")))
+    fig_fft.update_layout(
+        title=f"Профіль картини для щілин шириною a = {a_um:g} мкм",
+        xaxis_title="Позиція на екрані (y), мм", yaxis_title="Інтенсивність (I/I_max)", height=400
+    )
+    st.plotly_chart(fig_fft, use_container_width=True)
+
+    fig_2d = go.Figure(go.Heatmap(x=coords * 1000, y=coords * 1000, z=image,
+                                  colorscale=[[0, "black"], [1, color_hex]], showscale=False))
+    fig_2d.update_layout(
+        title=f"Картина на екрані (2D FFT {fft_size}²)",
+        xaxis_title="y, мм", yaxis_title="z (уздовж щілин), мм", yaxis=dict(scaleanchor="x"), height=550
+    )
+    st.plotly_chart(fig_2d, use_container_width=True)
+
+    # --- БІЛЕ СВІТЛО ---
+    st.divider()
+    st.header("Біле світло: кольорові смуги")
+    st.write(
+        "Відстань між смугами λL/d своя для кожної довжини хвилі, тож у білому світлі збігаються лише "
+        "центральні максимуми: центральна смуга біла, сусідні - кольорові, а далі смуги змішуються в рівномірне освітлення. "
+        "Інтенсивність рахується одразу для сотень довжин хвиль як масив (λ × y) і перетворюється на колір через функції CIE 1931."
+    )
+    wcol1, wcol2, wcol3 = st.columns(3)
+    with wcol1:
+        source = st.selectbox("Джерело", WHITE_SOURCES, key="young_white_source")
+    with wcol2:
+        T_K = st.slider("Температура джерела (T), К", min_value=1500, max_value=12000, value=5778, step=100,
+                        key="young_white_T", disabled=source != WHITE_SOURCES[0])
+    with wcol3:
+        n_lambda = st.slider("Кількість довжин хвиль", min_value=50, max_value=800, value=300, step=50,
+                             key="young_white_n")
+
+    y_white_m = 8 * 550e-9 * L_m / d_m # ~8 смуг у кожен бік
+    y_w, rgb, total = compute_white_young(a_m, d_m, L_m, y_white_m, source, T_K, n_lambda)
+
+    fig_white = go.Figure(go.Image(z=np.repeat(rgb[None, :, :], 80, axis=0),
+                                   x0=y_w[0] * 1000, dx=(y_w[1] - y_w[0]) * 1000))
+    fig_white.update_layout(
+        title="Вигляд екрана (колір sRGB)", xaxis_title="Позиція на екрані (y), мм",
+        yaxis=dict(visible=False), height=250
+    )
+    st.plotly_chart(fig_white, use_container_width=True)
+
+    fig_total = go.Figure(go.Scatter(x=y_w * 1000, y=total, mode='lines', name='Сумарна інтенсивність',
+                                     line=dict(color="white", width=2)))
+    fig_total.update_layout(
+        title="Сумарна інтенсивність: контраст смуг спадає від центру",
+        xaxis_title="Позиція на екрані (y), мм", yaxis_title="Інтенсивність (відн. од.)", height=350
+    )
+    st.plotly_chart(fig_total, use_container_width=True)
@@ -1,37 +1,78 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
+from scipy.special import j1
 
-# --- Функція для кольору ---
-def wavelength_to_hex(nm):
-    gamma = 0.8
-    intensity_max = 255
-    factor = 0.0
-    R, G, B = 0, 0, 0
-    if 380 <= nm <= 439:
-        R = -(nm - 440) / (440 - 380); G = 0.0; B = 1.0
-    elif 440 <= nm <= 489:
-        R = 0.0; G = (nm - 440) / (490 - 440); B = 1.0
-    elif 490 <= nm <= 509:
-        R = 0.0; G = 1.0; B = -(nm - 510) / (510 - 490)
-    elif 510 <= nm <= 579:
-        R = (nm - 510) / (580 - 510); G = 1.0; B = 0.0
-    elif 580 <= nm <= 644:
-        R = 1.0; G = -(nm - 645) / (645 - 580); B = 0.0
-    elif 645 <= nm <= 780:
-        R = 1.0; G = 0.0; B = 0.0
-    if 380 <= nm <= 419:
-        factor = 0.3 + 0.7 * (nm - 380) / (420 - 380)
-    elif 420 <= nm <= 644:
-        factor = 1.0
-    elif 645 <= nm <= 780:
-        factor = 0.3 + 0.7 * (780 - nm) / (780 - 645)
+from engines.colour import wavelength_to_hex
+from engines.fraunhofer import (aperture_coords, aperture_grid, slits_mask, rect_mask, circle_mask,
+                                expression_mask, far_field_2d, crop_and_bin)
+from engines.fresnel import (aperture_spectrum, propagate, propagation_map, max_distance,
+                             slit_fresnel_intensity)
+
+
+# Форми апертур для FFT-розрахунку
+APERTURES = {
+    "Щілина скінченної висоти": "slit",
+    "Круглий отвір": "circle",
+    "Квадратний отвір": "square",
+    "Власна форма (вираз)": "expression",
+}
+
+
+@st.cache_data(ttl=3600)
+def compute_aperture_pattern(kind, a_m, h_m, expr, lambda_m, L_m, size, half_width, out_size=400):
+    """
+    Картина Фраунгофера апертури через 2D FFT (size × size) з доповненням нулями.
+    Повертає лише зменшену центральну область і центральний рядок повної роздільності.
+    """
+    if kind == "slit":
+        span, feature = max(a_m, h_m), min(a_m, h_m)
+    elif kind == "expression":
+        span, feature = 4 * a_m, a_m / 4
     else:
-        factor = 0.0
-    R = int(intensity_max * (R * factor)**gamma)
-    G = int(intensity_max * (G * factor)**gamma)
-    B = int(intensity_max * (B * factor)**gamma)
-    return f'#{R:02x}{G:02x}{B:02x}'
+        span, feature = a_m, a_m
+    x, dx = aperture_grid(span, feature, size)
+    X, Y = x[None, :], x[:, None]
+    if kind == "slit":
+        mask = rect_mask(X, Y, a_m, h_m, dx)
+    elif kind == "circle":
+        mask = circle_mask(X, Y, a_m / 2, dx)
+    elif kind == "square":
+        mask = rect_mask(X, Y, a_m, a_m, dx)
+    else:
+        mask = expression_mask(expr, X, Y, a=a_m)
+    if not mask.any():
+        raise ValueError("Апертура не пропускає світла: вираз ніде не відмінний від нуля")
+    coords, image = far_field_2d(mask, dx, lambda_m, L_m, size)
+    row = np.abs(coords) <= half_width
+    profile = image[size // 2, row]
+    coords_small, image_small = crop_and_bin(coords, image, half_width, out_size)
+    return coords_small, image_small, coords[row], profile, x.size
+
+
+# Сітка для ближньої зони: крок a/32, 2¹⁵ вузлів -> коректно до z = 32·a²/λ (N_F ≥ 1/32)
+FRESNEL_OVERSAMPLE = 32
+FRESNEL_POINTS = 2**15
+FRESNEL_NUMBERS = [50, 20, 10, 5, 3, 2, 1.5, 1, 0.7, 0.5, 0.3, 0.2, 0.1, 0.05]
+
+
+@st.cache_data(ttl=3600)
+def get_slit_spectrum(a_m):
+    """Сітка і кутовий спектр щілини - не залежать від λ та z, тож рахуються один раз на ширину a."""
+    dx = a_m / FRESNEL_OVERSAMPLE
+    x = aperture_coords(FRESNEL_POINTS, FRESNEL_POINTS * dx)
+    return x, dx, aperture_spectrum(slits_mask(x, 1, a_m, 1.0, dx))
+
+
+@st.cache_data(ttl=3600)
+def compute_fresnel_map(a_m, lambda_m, n_z=100):
+    """I(x, z) від N_F = 50 до N_F = 0.1 (z у геометричній прогресії), кожен рядок нормовано на його максимум."""
+    x, dx, spectrum = get_slit_spectrum(a_m)
+    z = a_m**2 / (lambda_m * np.geomspace(50, 0.1, n_z))
+    keep = np.abs(x) <= 12 * a_m
+    intensity = propagation_map(spectrum, dx, lambda_m, z, keep)
+    return x[keep], z, intensity / intensity.max(axis=1, keepdims=True)
+
 
 # --- Основна частина програми ---
 with st.container(border=True):
@@ -143,4 +184,135 @@ with st.container(border=True):
         yaxis_title="Інтенсивність (I / I_max)",
         height=500
     )
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig, use_container_width=True)
+
+    # --- FFT: ДОВІЛЬНА АПЕРТУРА ---
+    st.divider()
+    st.header("FFT-дифракція на довільній апертурі")
+    st.write(
+        "Формула sinc² описує лише нескінченно довгу щілину. Для будь-якої апертури картина Фраунгофера - "
+        "це квадрат модуля 2D перетворення Фур'є функції пропускання. Апертура растеризується, доповнюється "
+        "нулями до розміру FFT і обробляється одним `fft2` - так видно і двовимірну картину, і кільця Ейрі для круглого отвору."
+    )
+
+    fcol1, fcol2, fcol3 = st.columns(3)
+    with fcol1:
+        aperture_name = st.selectbox("Форма апертури", list(APERTURES), key="slit_fft_kind")
+        aperture = APERTURES[aperture_name]
+    with fcol2:
+        fft_size = st.select_slider("Розмір FFT", options=[1024, 2048, 4096], value=2048, key="slit_fft_size",
+                                    help="Більший розмір - дрібніший крок по екрану (картина 4096² рахується ~1 с)")
+    with fcol3:
+        log_scale = st.checkbox("Логарифмічна шкала", value=True, key="slit_fft_log",
+                                help="Бічні максимуми слабші за центральний у десятки-сотні разів")
+
+    h_um = a_um
+    expr = ""
+    if aperture == "slit":
+        h_um = st.slider("Висота щілини (h), мкм", min_value=a_um, max_value=max(a_um, 1000.0),
+                         value=min(max(a_um, 1000.0), 4 * a_um), step=1.0, key="slit_fft_h")
+    elif aperture == "circle":
+        st.caption(f"Діаметр отвору D = a = {a_um:g} мкм. Перший темний круг: sinθ = 1.22 λ/D.")
+    elif aperture == "square":
+        st.caption(f"Сторона квадрата = a = {a_um:g} мкм.")
+    else:
+        expr = st.text_input(
+            "Функція пропускання t(x, y) (x, y у метрах; a - ширина щілини, м)",
+            value="(abs(x) < a/2) * (abs(y) < a/2) + ((x - a)**2 + y**2 < (a/2)**2)",
+            key="slit_fft_expr",
+            help="Ненульові значення пропускають світло. Апертура має вміщуватися в квадрат 4a × 4a.")
+
+    half_width = 4 * lambda_m * L_m / a_m
+    try:
+        coords, image, profile_y, profile, n_raster = compute_aperture_pattern(
+            aperture, a_m, h_um * 1e-6, expr, lambda_m, L_m, fft_size, half_width)
+    except ValueError as e:
+        st.error(f"Помилка у виразі апертури: {e}")
+    else:
+        shown = np.log10(np.maximum(image, 1e-6)) if log_scale else image
+        fig_2d = go.Figure(go.Heatmap(
+            x=coords * 1000, y=coords * 1000, z=shown,
+            colorscale=[[0, "black"], [1, color_hex]],
+            colorbar=dict(title="lg I" if log_scale else "I / I_max"),
+        ))
+        fig_2d.update_layout(
+            title=f"{aperture_name}: картина на екрані (FFT {fft_size}², апертура {n_raster}² вузлів)",
+            xaxis_title="x на екрані, мм", yaxis_title="y на екрані, мм",
+            yaxis=dict(scaleanchor="x"), height=550
+        )
+        st.plotly_chart(fig_2d, use_container_width=True)
+
+        # Центральний рядок порівнюємо з аналітичною формулою
+        u = np.pi * a_m * profile_y / (lambda_m * L_m)
+        if aperture == "circle":
+            with np.errstate(divide='ignore', invalid='ignore'):
+                theory = np.nan_to_num((2 * j1(u) / u)**2, nan=1.0)
+            theory_name = "Ейрі: (2J₁(u)/u)²"
+        elif aperture in ("slit", "square"):
+            theory = np.sinc(u / np.pi)**2
+            theory_name = "sinc²(πay/λL)"
+        else:
+            theory = None
+
+        fig_row = go.Figure()
+        fig_row.add_trace(go.Scatter(x=profile_y * 1000, y=profile, mode='lines', name='FFT',
+                                     line=dict(color=color_hex, width=3)))
+        if theory is not None:
+            fig_row.add_trace(go.Scatter(x=profile_y * 1000, y=theory, mode='lines', name=theory_name,
+                                         line=dict(color="white", width=1, dash="dot")))
+            st.metric("Макс. відхилення FFT від формули", f"{np.max(np.abs(profile - theory)):.2e}")
+        fig_row.update_layout(
+            title="Переріз картини через центр (y = 0)",
+            xaxis_title="Позиція на екрані (x), мм", yaxis_title="Інтенсивність (I / I_max)",
+            yaxis_type="log" if log_scale else "linear", height=400
+        )
+        st.plotly_chart(fig_row, use_container_width=True)
+
+    # --- БЛИЖНЯ ЗОНА: ВІД ФРЕНЕЛЯ ДО ФРАУНГОФЕРА ---
+    st.divider()
+    st.header("Ближня зона: від Френеля до Фраунгофера")
+    st.write(
+        "Формула sinc² справедлива лише далеко від щілини, коли число Френеля N_F = a²/(λz) ≪ 1. "
+        "Ближче картина інша: спершу це тінь щілини з дрібними смугами біля країв, потім смуги зливаються "
+        "і лише при N_F ≲ 0.1 виходить картина Фраунгофера. Поле на відстані z рахується методом кутового спектра: "
+        "спектр щілини (одне FFT) множиться на ядро поширення H(λ, z) і повертається оберненим FFT. "
+        "Спектр і ядра кешуються, тому зміна відстані - це одне обернене FFT."
+    )
+    st.metric("Число Френеля для екрана на відстані L", f"{a_m**2 / (lambda_m * L_m):.3g}",
+              help="N_F ≪ 1 - дальня зона (Фраунгофер), N_F ≳ 1 - ближня (Френель)")
+
+    N_F = st.select_slider("Число Френеля N_F = a²/(λz) (менше - далі від щілини)", options=FRESNEL_NUMBERS,
+                           value=1, key="slit_fresnel_nf")
+    z_m = a_m**2 / (lambda_m * N_F)
+    x_grid, dx_grid, slit_spectrum = get_slit_spectrum(a_m)
+    if z_m > max_distance(x_grid.size, dx_grid, lambda_m):
+        st.warning("Відстань перевищує межу коректної дискретизації сітки - результат наближений.")
+
+    field_z = propagate(slit_spectrum, dx_grid, lambda_m, z_m)
+    window = np.abs(x_grid) <= 0.75 * a_m + 3 * lambda_m * z_m / a_m
+    x_win = x_grid[window]
+    I_near = np.abs(field_z[window])**2
+
+    fig_near = go.Figure()
+    fig_near.add_trace(go.Scatter(x=x_win * 1e6, y=I_near, mode='lines', name='Кутовий спектр (FFT)',
+                                  line=dict(color=color_hex, width=3), fill='tozeroy'))
+    fig_near.add_trace(go.Scatter(x=x_win * 1e6, y=slit_fresnel_intensity(x_win, a_m, lambda_m, z_m),
+                                  mode='lines', name='Інтеграли Френеля', line=dict(color="white", width=1, dash="dot")))
+    fig_near.add_trace(go.Scatter(x=x_win * 1e6, y=(np.abs(x_win) <= a_m / 2).astype(float), mode='lines',
+                                  name='Геометрична тінь', line=dict(color="gray", width=1, dash="dash")))
+    fig_near.update_layout(
+        title=f"Картина на відстані z = {z_m * 1000:.3g} мм (N_F = {N_F})",
+        xaxis_title="Позиція на екрані (x), мкм",
+        yaxis_title="Інтенсивність (I / I₀ падаючої хвилі)", height=450
+    )
+    st.plotly_chart(fig_near, use_container_width=True)
+
+    x_map, z_map, I_map = compute_fresnel_map(a_m, lambda_m)
+    fig_map = go.Figure(go.Heatmap(x=x_map * 1e6, y=z_map * 1000, z=I_map,
+                                   colorscale=[[0, "black"], [1, color_hex]], showscale=False))
+    fig_map.add_hline(y=z_m * 1000, line=dict(color="white", dash="dot"))
+    fig_map.update_layout(
+        title="Перехід від ближньої до дальньої зони (кожен рядок нормовано на свій максимум)",
+        xaxis_title="x, мкм", yaxis_title="z, мм", yaxis_type="log", height=550
+    )
+    st.plotly_chart(fig_map, use_container_width=True)
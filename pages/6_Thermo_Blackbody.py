@@ -1,38 +1,8 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
-import scipy.constants as const
 
-# --- Фізичні константи ---
-h = const.h       # Стала Планка
-c = const.c       # Швидкість світла
-k_B = const.k   # <--- ВИПРАВЛЕНО (було const.k_B)
-
-# --- Функція Планка ---
-def planck_radiation(wavelength_nm, T_K):
-    """
-    Розраховує спектральну інтенсивність (випромінювальну здатність)
-    за законом Планка.
-    """
-    lambda_m = wavelength_nm * 1e-9 # нм -> м
-    
-    if T_K == 0:
-        return np.zeros_like(lambda_m)
-        
-    numerator = 2.0 * h * c**2
-    exponent = (h * c) / (lambda_m * k_B * T_K) # <--- ВИПРАВЛЕНО (використовуємо k_B)
-    
-    # Запобігаємо 'overflow'
-    exponent[exponent > 700] = 700 
-    
-    denominator = (lambda_m**5) * (np.exp(exponent) - 1.0)
-    
-    intensity = numerator / denominator
-    
-    if np.max(intensity) > 0:
-        return intensity / np.max(intensity)
-    else:
-        return intensity
+from engines.blackbody import planck_radiation
 
 # --- Основна частина програми ---
 with st.container(border=True):